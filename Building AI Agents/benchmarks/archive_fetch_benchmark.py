@@ -0,0 +1,66 @@
+"""
+Compare fetching a repository archive with cloning it, against local fixtures.
+
+The fixture repository is cloned over file:// and its `git archive` tarball is
+served by a local HTTP server, so neither side depends on the network.
+
+Usage:
+    python benchmarks/archive_fetch_benchmark.py [commits] [files_per_commit]
+"""
+import functools
+import http.server
+import os
+import threading
+
+from bench_utils import create_git_fixture, git, int_arg, temporary_workdir
+from ArchiveFetch import fetch_archive
+from CloneRepo import _run_clone, default_checkout_workers
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    commits = int_arg(1, 30)
+    files_per_commit = int_arg(2, 50)
+    with temporary_workdir("archive_bench_") as workdir:
+        server = None
+        try:
+            fixture = os.path.join(workdir, "fixture")
+            print(f"Creating fixture: {commits} commits x {files_per_commit} files ...")
+            create_git_fixture(fixture, commits, files_per_commit)
+
+            served = os.path.join(workdir, "served")
+            os.makedirs(served)
+            git("archive", "--format=tar.gz", "--prefix=fixture-main/", "-o",
+                os.path.join(served, "main.tar.gz"), "HEAD", cwd=fixture)
+            handler = functools.partial(QuietHandler, directory=served)
+            server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            archive_url = f"http://127.0.0.1:{server.server_address[1]}/main.tar.gz"
+
+            print(f"{'method':<10} {'duration':>10} {'bytes':>14} {'files':>7}")
+            print("-" * 44)
+            for strategy in ("full", "shallow"):
+                target = os.path.join(workdir, strategy)
+                result = _run_clone(f"file://{fixture}", target, strategy, depth=1,
+                                    checkout_workers=default_checkout_workers())
+                files = sum(len(names) for root, _, names in os.walk(target) if ".git" not in root)
+                print(f"{strategy:<10} {result['duration']:>9.2f}s {result['bytes_transferred']:>14,} {files:>7}")
+
+            result = fetch_archive("https://example.com/bench/fixture", os.path.join(workdir, "archive"),
+                                   archive_url=archive_url)
+            if not result["success"]:
+                print(f"archive    failed: {result['error']}")
+            else:
+                print(f"{'archive':<10} {result['duration']:>9.2f}s {result['bytes_transferred']:>14,} "
+                      f"{result['file_count']:>7}")
+        finally:
+            if server is not None:
+                server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Helpers shared by the benchmarks.
+
+Importing this module puts multi_tool_agent on sys.path, so the benchmarks can
+import its modules directly (e.g. ``from CloneRepo import _run_clone``).
+"""
+import contextlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AGENT_DIR = os.path.join(PACKAGE_PARENT, "multi_tool_agent")
+
+if AGENT_DIR not in sys.path:
+    sys.path.insert(0, AGENT_DIR)
+
+
+def int_arg(index, default):
+    """Get a positional command line argument as an integer, or the default if it is missing."""
+    return int(sys.argv[index]) if len(sys.argv) > index else default
+
+
+def git(*args, cwd=None):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def create_git_fixture(path, commits, files_per_commit, allow_filter=False):
+    """
+    Create a repository whose history is much larger than its current tree.
+
+    Every commit rewrites the same files with random content.
+
+    Args:
+        path: Directory to create the repository in
+        commits: Number of commits
+        files_per_commit: Number of files (16 KiB each) rewritten by every commit
+        allow_filter: Allow partial clone filters over the file:// transport
+    """
+    git("init", "-q", "-b", "main", path)
+    git("config", "user.email", "bench@example.com", cwd=path)
+    git("config", "user.name", "Benchmark", cwd=path)
+    if allow_filter:
+        git("config", "uploadpack.allowFilter", "true", cwd=path)
+        git("config", "uploadpack.allowAnySHA1InWant", "true", cwd=path)
+
+    for commit in range(commits):
+        for index in range(files_per_commit):
+            directory = os.path.join(path, f"pkg{index % 10}")
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"module{index}.py"), "wb") as f:
+                f.write(os.urandom(16 * 1024))
+        git("add", "-A", cwd=path)
+        git("commit", "-q", "-m", f"commit {commit}", cwd=path)
+
+
+@contextlib.contextmanager
+def temporary_workdir(prefix):
+    """Create a scratch directory for a benchmark run and remove it afterwards."""
+    workdir = tempfile.mkdtemp(prefix=prefix)
+    try:
+        yield workdir
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,38 @@
+"""
+Compare the clone strategies of CloneRepo against a local fixture repository.
+
+The fixture has a long history with large files that are later rewritten, which
+is where shallow and partial clones save the most.
+
+Usage:
+    python benchmarks/clone_strategy_benchmark.py [commits] [files_per_commit]
+"""
+import os
+
+from bench_utils import create_git_fixture, int_arg, temporary_workdir
+from CloneRepo import _run_clone, default_checkout_workers
+
+
+def main():
+    commits = int_arg(1, 30)
+    files_per_commit = int_arg(2, 50)
+    with temporary_workdir("clone_bench_") as workdir:
+        fixture = os.path.join(workdir, "fixture")
+        print(f"Creating fixture: {commits} commits x {files_per_commit} files ...")
+        create_git_fixture(fixture, commits, files_per_commit, allow_filter=True)
+        source = f"file://{fixture}"
+
+        print(f"{'strategy':<10} {'duration':>10} {'bytes':>14}")
+        print("-" * 36)
+        for strategy in ("full", "shallow", "blobless", "treeless", "sparse"):
+            target = os.path.join(workdir, strategy)
+            result = _run_clone(source, target, strategy, depth=1, sparse_paths=["/pkg0/"],
+                                checkout_workers=default_checkout_workers())
+            if not result["success"]:
+                print(f"{strategy:<10} failed: {result['error'].strip()}")
+                continue
+            print(f"{strategy:<10} {result['duration']:>9.2f}s {result['bytes_transferred']:>14,}")
+
+
+if __name__ == "__main__":
+    main()
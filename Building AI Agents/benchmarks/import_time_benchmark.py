@@ -0,0 +1,56 @@
+"""
+Measure the import time of the multi_tool_agent package and its modules.
+
+Each import runs in a fresh interpreter so nothing is already cached in
+sys.modules. Importing the package itself should be close to free; the ADK
+pipeline is only loaded (and built) when OrchestratorAgent is used.
+
+Usage:
+    python benchmarks/import_time_benchmark.py [repeats]
+"""
+import statistics
+import subprocess
+import sys
+
+from bench_utils import PACKAGE_PARENT, int_arg
+
+CASES = [
+    ("import multi_tool_agent", "import multi_tool_agent"),
+    ("RepositoryValidator", "from multi_tool_agent.RepositoryValidator import RepositoryValidator"),
+    ("CloneRepo", "from multi_tool_agent import CloneRepo"),
+    ("OrchestratorAgent", "from multi_tool_agent import OrchestratorAgent"),
+    ("pipeline build", "from multi_tool_agent import OrchestratorAgent; OrchestratorAgent.get_runner()"),
+]
+
+SNIPPET = """
+import sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(elapsed, int("google.adk" in sys.modules))
+"""
+
+
+def measure(statement):
+    result = subprocess.run([sys.executable, "-c", SNIPPET.format(statement=statement)],
+                            cwd=PACKAGE_PARENT, capture_output=True, text=True, check=True)
+    elapsed, adk_loaded = result.stdout.split()
+    return float(elapsed), bool(int(adk_loaded))
+
+
+def main():
+    repeats = int_arg(1, 5)
+    print(f"{'case':<22} {'median':>10} {'min':>10} {'adk loaded':>11}")
+    print("-" * 56)
+    for name, statement in CASES:
+        timings = []
+        adk_loaded = False
+        for _ in range(repeats):
+            elapsed, adk_loaded = measure(statement)
+            timings.append(elapsed)
+        print(f"{name:<22} {statistics.median(timings) * 1000:>8.1f}ms {min(timings) * 1000:>8.1f}ms "
+              f"{str(adk_loaded):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare the double Path.glob('**/*') count previously used by clone_repository
+with the single-pass RepoWalker on a synthetic repository.
+
+Usage:
+    python benchmarks/repo_walk_benchmark.py [number_of_files]
+"""
+import os
+import time
+from pathlib import Path
+
+from bench_utils import int_arg, temporary_workdir
+from RepoWalker import collect_repository_stats, iter_repository_entries
+
+
+def create_fixture(root, file_count):
+    """Create a working tree plus a .git directory holding many loose objects."""
+    for index in range(file_count):
+        directory = os.path.join(root, f"pkg{index % 100}", f"sub{index % 7}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file{index}.py"), "w") as f:
+            f.write("x = 1\n")
+    for index in range(file_count // 2):
+        directory = os.path.join(root, ".git", "objects", f"{index % 256:02x}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{index:038x}"), "w") as f:
+            f.write("blob")
+
+
+def glob_twice(root):
+    file_count = sum(1 for _ in Path(root).glob('**/*') if _.is_file())
+    dir_count = sum(1 for _ in Path(root).glob('**/*') if _.is_dir())
+    return file_count, dir_count
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:>8.3f}s  {result}")
+    return elapsed
+
+
+def main():
+    file_count = int_arg(1, 50_000)
+    with temporary_workdir("walk_bench_") as root:
+        print(f"Creating fixture with {file_count:,} files ...")
+        create_fixture(root, file_count)
+
+        old = timed("Path.glob x2 (includes .git)", lambda: glob_twice(root))
+        new = timed("RepoWalker single pass", lambda: (lambda s: (s["file_count"], s["directory_count"]))(
+            collect_repository_stats(root)))
+
+        def first_python_file():
+            return next(e.path for e in iter_repository_entries(root) if e.extension == ".py")
+        timed("RepoWalker early stop (first .py)", first_python_file)
+        print(f"Speed-up: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Microbenchmark for RepositoryValidator.validate_repo_url (structure and parsing only).
+
+Usage:
+    python benchmarks/validator_benchmark.py [number_of_urls]
+"""
+import logging
+import time
+
+from bench_utils import int_arg
+from RepositoryValidator import RepositoryValidator
+from ProviderRegistry import GitProvider
+
+URL_SHAPES = [
+    "https://github.com/org{i}/repo{i}",
+    "https://gitlab.com/group{i}/project{i}.git",
+    "git@github.com:user{i}/tool{i}.git",
+    "git://github.com/user{i}/lib{i}.git",
+    "https://bitbucket.org/team{i}/service{i}",
+    "https://git{n}.corp.example/team{i}/service{i}",
+    "https://unknown.example.org/owner{i}/repo{i}",
+    "http://invalid-url-{i}",
+]
+
+
+def main():
+    count = int_arg(1, 1_000_000)
+    # Memoization disabled so every URL is parsed and matched
+    validator = RepositoryValidator(log_level=logging.WARNING, cache_size=0)
+    # A few dozen self-hosted instances, as in a typical enterprise setup
+    for n in range(50):
+        validator.registry.register(GitProvider(name=f"Corp GitLab {n}", hostname=f"git{n}.corp.example", kind="gitlab"))
+
+    urls = [URL_SHAPES[i % len(URL_SHAPES)].format(i=i, n=i % 50) for i in range(count)]
+
+    start = time.perf_counter()
+    valid = 0
+    for url in urls:
+        is_valid, _ = validator.validate_repo_url(url)
+        valid += is_valid
+    elapsed = time.perf_counter() - start
+
+    print(f"Validated {count:,} URLs ({valid:,} valid) in {elapsed:.2f}s")
+    print(f"{count / elapsed:,.0f} URLs/s, {elapsed / count * 1e6:.2f} µs per URL")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import logging
+import os
+import shutil
+import stat
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+
+try:
+    from .RepoWalker import collect_repository_stats
+    from .RepositoryValidator import RepositoryValidator
+except ImportError:
+    from RepoWalker import collect_repository_stats
+    from RepositoryValidator import RepositoryValidator
+
+logger = logging.getLogger("REPO ARCHIVE FETCH")
+
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+class _CountingReader:
+    """File-like wrapper counting the bytes read from a stream, with read-ahead."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+        self._buffer = b""
+
+    def peek(self, size: int) -> bytes:
+        """Return up to size bytes from the stream without consuming them."""
+        while len(self._buffer) < size:
+            data = self.raw.read(size - len(self._buffer))
+            if not data:
+                break
+            self.bytes_read += len(data)
+            self._buffer += data
+        return self._buffer[:size]
+
+    def read(self, size: int = -1) -> bytes:
+        if self._buffer:
+            data = self._buffer if size < 0 else self._buffer[:size]
+            self._buffer = self._buffer[len(data):]
+            return data
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _strip_name(name: str, root: str) -> Optional[str]:
+    """
+    Drop the top-level directory from an archive path.
+
+    Returns:
+        The path relative to root, or None for the top-level directory itself,
+        absolute paths and paths escaping root
+    """
+    name = name.replace("\\", "/")
+    if name.startswith("/") or os.path.splitdrive(name)[0]:
+        return None
+    parts = name.split("/", 1)
+    if len(parts) < 2 or not parts[1].strip("/"):
+        return None
+    name = parts[1].rstrip("/")
+    destination = os.path.realpath(os.path.join(root, name))
+    if name.startswith("/") or os.path.commonpath([root, destination]) != root:
+        return None
+    return name
+
+
+def _strip_member(member: tarfile.TarInfo, target_dir: str) -> Optional[tarfile.TarInfo]:
+    """
+    Drop the top-level directory from a tar member and reject unsafe members.
+
+    Returns:
+        The member renamed relative to target_dir, or None if it must be skipped
+        (the top-level directory itself, devices, absolute paths, or paths and
+        links escaping target_dir)
+    """
+    if not (member.isfile() or member.isdir() or member.issym() or member.islnk()):
+        return None
+    root = os.path.realpath(target_dir)
+    name = _strip_name(member.name, root)
+    if name is None:
+        return None
+    destination = os.path.realpath(os.path.join(root, name))
+    if member.issym() or member.islnk():
+        link = member.linkname.replace("\\", "/")
+        if os.path.isabs(link) or os.path.splitdrive(link)[0]:
+            return None
+        if member.islnk():
+            # Hard links name another member, which is stripped the same way
+            link_parts = link.split("/", 1)
+            if len(link_parts) < 2:
+                return None
+            link = link_parts[1]
+            member.linkname = link
+            link_target = os.path.join(root, link)
+        else:
+            link_target = os.path.join(os.path.dirname(destination), link)
+        if os.path.isabs(link) or os.path.commonpath([root, os.path.realpath(link_target)]) != root:
+            return None
+
+    member.name = name
+    # Never restore ownership or special permission bits from the archive
+    member.mode &= 0o755
+    member.uid = member.gid = 0
+    member.uname = member.gname = ""
+    return member
+
+
+def _extract_tar(reader: _CountingReader, target_dir: str):
+    """Unpack a (compressed) tar stream sequentially, without buffering it."""
+    # Python versions with extraction filters double-check the members
+    extract_options = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+    # "r|*" reads the stream sequentially and detects the compression itself
+    with tarfile.open(fileobj=reader, mode="r|*") as archive:
+        for member in archive:
+            member = _strip_member(member, target_dir)
+            if member is None:
+                continue
+            archive.extract(member, target_dir, **extract_options)
+
+
+def _extract_zip(reader: _CountingReader, target_dir: str):
+    """
+    Unpack a zip stream.
+
+    The zip directory sits at the end of the file, so the download is spooled
+    to a temporary file first. Symlinks and unsafe paths are skipped.
+    """
+    root = os.path.realpath(target_dir)
+    with tempfile.TemporaryFile() as spool:
+        shutil.copyfileobj(reader, spool)
+        spool.seek(0)
+        with zipfile.ZipFile(spool) as archive:
+            for info in archive.infolist():
+                name = _strip_name(info.filename, root)
+                if name is None or stat.S_ISLNK(info.external_attr >> 16):
+                    continue
+                destination = os.path.join(root, name)
+                if info.is_dir():
+                    os.makedirs(destination, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                with archive.open(info) as source, open(destination, "wb") as target:
+                    shutil.copyfileobj(source, target)
+
+
+def fetch_archive(repo_url: str, target_dir: Optional[str] = None, ref: Optional[str] = None,
+                  archive_url: Optional[str] = None, validator: Optional[RepositoryValidator] = None,
+                  session: Optional[requests.Session] = None,
+                  timeout: Optional[float] = 60) -> Dict[str, Any]:
+    """
+    Download a repository archive and extract it while it streams in.
+
+    For read-only analysis this skips the git object store entirely: the
+    provider's .tar.gz archive for the ref is decompressed and unpacked
+    directly from the HTTP response, without writing the compressed file to
+    disk. Zip archives (e.g. from a custom archive_url) are spooled to a
+    temporary file first. The top-level directory of the archive is stripped
+    so the files land directly in target_dir. Members with absolute paths,
+    paths or links escaping target_dir, and device files are skipped.
+
+    The archive is extracted into a temporary directory next to target_dir,
+    which is renamed into place once extraction has finished, so a failed
+    download leaves nothing behind. target_dir must not exist or be empty.
+
+    Args:
+        repo_url: URL of the Git repository
+        target_dir: Directory to extract into. A temporary directory is created if omitted
+        ref: Branch, tag or commit to download. Defaults to the remote HEAD
+        archive_url: Archive URL to download instead of the provider's
+        validator: Validator used to look up the provider's archive URL
+        session: HTTP session to download with
+        timeout: Timeout in seconds for connecting and for each read
+
+    Returns:
+        Dictionary in the shape returned by clone_repository, with strategy "archive"
+    """
+    logger.info(f"Attempting to fetch archive of repository: {repo_url}")
+    started = time.perf_counter()
+
+    if archive_url is None:
+        owned_validator = validator is None
+        validator = validator or RepositoryValidator()
+        try:
+            archive_url = validator.get_archive_url(repo_url, ref)
+        finally:
+            if owned_validator:
+                validator.close()
+        if archive_url is None:
+            return {
+                "success": False,
+                "error": f"No archive download is available for '{repo_url}'."
+            }
+
+    if not target_dir:
+        target_dir = tempfile.mkdtemp(prefix="repo_archive_")
+    if os.path.isdir(target_dir) and os.listdir(target_dir):
+        return {
+            "success": False,
+            "error": f"Target directory '{target_dir}' already exists and is not empty."
+        }
+    parent_dir = os.path.dirname(os.path.abspath(target_dir))
+    Path(parent_dir).mkdir(parents=True, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(os.path.abspath(target_dir))}.",
+                                   suffix=".partial", dir=parent_dir)
+
+    http = session or requests.Session()
+    try:
+        with http.get(archive_url, stream=True, timeout=timeout) as response:
+            if response.status_code != 200:
+                return {
+                    "success": False,
+                    "error": f"Archive download failed with status code: {response.status_code}"
+                }
+            reader = _CountingReader(response.raw)
+            if reader.peek(len(ZIP_MAGIC)) == ZIP_MAGIC:
+                _extract_zip(reader, staging_dir)
+            else:
+                _extract_tar(reader, staging_dir)
+
+        # Move the finished tree into place (an empty target directory is replaced)
+        os.chmod(staging_dir, 0o755)
+        if os.path.isdir(target_dir):
+            os.rmdir(target_dir)
+        os.rename(staging_dir, target_dir)
+
+        duration = time.perf_counter() - started
+        logger.info(f"Fetched archive of {repo_url} in {duration:.2f}s ({reader.bytes_read} bytes)")
+
+        stats = collect_repository_stats(target_dir)
+        return {
+            "success": True,
+            "repo_url": repo_url,
+            "repo_name": repo_url.rstrip('/').split('/')[-1].replace('.git', ''),
+            "clone_path": target_dir,
+            "file_count": stats["file_count"],
+            "directory_count": stats["directory_count"],
+            "total_bytes": stats["total_bytes"],
+            "extensions": stats["extensions"],
+            "strategy": "archive",
+            "checkout_workers": None,
+            "duration": duration,
+            "bytes_transferred": reader.bytes_read,
+            "mirror": None,
+            "progress": {},
+            "archive_url": archive_url,
+            "ref": ref,
+            "command_output": ""
+        }
+
+    except (requests.RequestException, tarfile.TarError, zipfile.BadZipFile, OSError) as e:
+        logger.error(f"Failed to fetch repository archive: {str(e)}")
+        return {
+            "success": False,
+            "error": f"Failed to fetch repository archive: {str(e)}"
+        }
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        if session is None:
+            http.close()
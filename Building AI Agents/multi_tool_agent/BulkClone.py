@@ -0,0 +1,249 @@
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .CloneRepo import clone_repository
+    from .FileSystem import directory_size
+    from .HostScheduler import HostScheduler
+except ImportError:
+    from CloneRepo import clone_repository
+    from FileSystem import directory_size
+    from HostScheduler import HostScheduler
+
+logger = logging.getLogger("BULK REPO CLONE")
+
+
+def read_urls(path: str) -> List[str]:
+    """
+    Read repository URLs from a file (or stdin for "-"), one per line.
+
+    Blank lines and lines starting with "#" are skipped, as are duplicate URLs.
+    """
+    f = sys.stdin if path == "-" else open(path, "r")
+    try:
+        urls = [line.strip() for line in f]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    return list(OrderedDict.fromkeys(url for url in urls if url and not url.startswith("#")))
+
+
+class BulkCloner:
+    """
+    Clone many repositories in parallel with a bounded worker pool.
+
+    At most ``concurrency`` clones run at once, and at most ``per_host_limit``
+    against any single host, with work handed out round-robin across hosts.
+    Each clone has its own timeout and retries; a failed clone is reported and
+    never holds up the rest of the batch. Once the cloned repositories use more
+    than ``max_bytes`` on disk, the remaining repositories are skipped.
+
+    The disk quota is a soft limit: it is checked before each clone starts, so
+    the clones already running when it is reached still finish and can exceed
+    it by up to ``concurrency`` repositories.
+    """
+
+    def __init__(self, output_dir: str, concurrency: int = 4, per_host_limit: int = 2,
+                 max_bytes: Optional[int] = None, timeout: Optional[float] = 600,
+                 retries: int = 1, retry_delay: float = 2.0, **clone_options):
+        """
+        Initialize the bulk cloner.
+
+        Args:
+            output_dir: Directory receiving one subdirectory per repository
+            concurrency: Maximum number of clones running at once
+            per_host_limit: Maximum number of clones running against one host
+            max_bytes: Soft disk quota for all clones together (None: unlimited)
+            timeout: Seconds after which a single clone attempt is aborted
+            retries: Number of additional attempts for a failed clone
+            retry_delay: Seconds to wait before the first retry, doubled for each further retry
+            **clone_options: Passed on to clone_repository (strategy, depth, mirror_cache, ...)
+        """
+        self.output_dir = output_dir
+        self.concurrency = max(1, concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.retry_delay = retry_delay
+        self.clone_options = clone_options
+        self.used_bytes = 0
+        self._lock = threading.Lock()
+
+    def target_dir(self, repo_url: str, taken: Dict[str, str]) -> str:
+        """Pick a unique directory name for a repository inside output_dir."""
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', repo_url.rstrip('/').split('/')[-1].replace('.git', '')) or "repo"
+        candidate, index = name, 1
+        while candidate in taken:
+            index += 1
+            candidate = f"{name}-{index}"
+        taken[candidate] = repo_url
+        return os.path.join(self.output_dir, candidate)
+
+    def quota_exceeded(self) -> bool:
+        """Check whether the clones so far have used up the disk quota."""
+        with self._lock:
+            return self.max_bytes is not None and self.used_bytes >= self.max_bytes
+
+    def clone_one(self, repo_url: str, target_dir: str) -> Dict[str, Any]:
+        """
+        Clone a single repository with retries, removing partial clones in between.
+
+        A target directory that already existed before this clone is never removed:
+        it is tried once (an existing checkout is updated when ``update`` is set)
+        and a failure is reported without retrying.
+        """
+        started = time.perf_counter()
+        preexisting = os.path.lexists(target_dir)
+        result = {}
+        attempts = 0
+        for attempt in range(1 if preexisting else self.retries + 1):
+            if attempt:
+                if self.quota_exceeded():
+                    break
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+            attempts += 1
+            try:
+                result = clone_repository(repo_url, target_dir, timeout=self.timeout, **self.clone_options)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            if result.get("success"):
+                break
+            logger.warning(f"Attempt {attempts} to clone {repo_url} failed: {result.get('error')}")
+            if preexisting:
+                break
+            # Only remove what this run created
+            shutil.rmtree(target_dir, ignore_errors=True)
+
+        disk_bytes = directory_size(target_dir) if result.get("success") else 0
+        with self._lock:
+            self.used_bytes += disk_bytes
+        return {
+            "repo_url": repo_url,
+            "success": bool(result.get("success")),
+            "clone_path": target_dir if result.get("success") else None,
+            "attempts": attempts,
+            "duration": time.perf_counter() - started,
+            "disk_bytes": disk_bytes,
+            "file_count": result.get("file_count"),
+            "strategy": result.get("strategy"),
+            "error": result.get("error")
+        }
+
+    def run(self, repo_urls: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Clone the repositories, yielding each result as soon as its clone finishes.
+
+        Args:
+            repo_urls: Repository URLs to clone (duplicates are cloned once)
+
+        Yields:
+            Result dictionary per repository with repo_url, success, clone_path,
+            attempts, duration, disk_bytes, file_count, strategy and error
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        taken: Dict[str, str] = {}
+        # Directory names are picked up front, in input order, not by the worker threads
+        targets = OrderedDict(
+            (url, None) for url in (url.strip() for url in repo_urls) if url
+        )
+        for url in targets:
+            targets[url] = self.target_dir(url, taken)
+        scheduler = HostScheduler(targets, self.per_host_limit)
+
+        def start(url: str) -> Dict[str, Any]:
+            return self.clone_one(url, targets[url])
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            completed = scheduler.run(executor, start, self.concurrency)
+            while True:
+                if scheduler.pending and self.quota_exceeded():
+                    # Out of disk budget: report everything not yet started as skipped
+                    for url in scheduler.drain():
+                        yield {
+                            "repo_url": url,
+                            "success": False,
+                            "skipped": True,
+                            "error": f"Disk quota of {self.max_bytes} bytes exceeded"
+                        }
+                try:
+                    url, future = next(completed)
+                except StopIteration:
+                    break
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.error(f"Error cloning {url}: {str(e)}")
+                    yield {"repo_url": url, "success": False, "error": str(e)}
+
+
+def clone_many(repo_urls: Iterable[str], output_dir: str, **options) -> Iterator[Dict[str, Any]]:
+    """
+    Clone many repositories in parallel, yielding results as clones finish.
+
+    Args:
+        repo_urls: Repository URLs to clone
+        output_dir: Directory receiving one subdirectory per repository
+        **options: BulkCloner options (concurrency, per_host_limit, max_bytes,
+            timeout, retries) and clone_repository options
+
+    Yields:
+        Result dictionary per repository (see BulkCloner.run)
+    """
+    return BulkCloner(output_dir, **options).run(repo_urls)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Clone many Git repositories in parallel.")
+    parser.add_argument("urls", nargs="*", help="Repository URLs to clone")
+    parser.add_argument("-f", "--file", help="File with one repository URL per line ('-' for stdin)")
+    parser.add_argument("-d", "--output-dir", default="repos", help="Directory to clone into")
+    parser.add_argument("-o", "--output", help="Write JSONL results to this file instead of stdout")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Maximum concurrent clones")
+    parser.add_argument("--per-host", type=int, default=2, help="Maximum concurrent clones per host")
+    parser.add_argument("--max-bytes", type=int, help="Soft disk quota for all clones together")
+    parser.add_argument("--timeout", type=float, default=600, help="Timeout per clone attempt in seconds")
+    parser.add_argument("--stall-timeout", type=float, help="Abort a clone that prints nothing for this long")
+    parser.add_argument("--retries", type=int, default=1, help="Retries per failed clone")
+    parser.add_argument("--strategy", default="full", help="Clone strategy (full, auto, shallow, blobless, ...)")
+    parser.add_argument("--depth", type=int, default=1, help="Depth for shallow clones")
+    parser.add_argument("--update", action="store_true",
+                        help="Update repositories already cloned into the output directory instead of failing")
+    args = parser.parse_args(argv)
+
+    urls = list(args.urls)
+    if args.file:
+        urls += read_urls(args.file)
+    if not urls:
+        parser.error("no repository URLs given")
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    failures = 0
+    try:
+        results = clone_many(urls, args.output_dir, concurrency=args.concurrency,
+                             per_host_limit=args.per_host, max_bytes=args.max_bytes,
+                             timeout=args.timeout, retries=args.retries,
+                             stall_timeout=args.stall_timeout, strategy=args.strategy, depth=args.depth,
+                             update=args.update)
+        for result in results:
+            failures += not result["success"]
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
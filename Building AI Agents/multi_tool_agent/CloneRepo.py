@@ -1,9 +1,10 @@
 from typing import Dict, List, Any, Optional
 import os
 import subprocess
-import tempfile
+from contextlib import nullcontext
 import logging
 import re
+import time
 from pathlib import Path
 
 # from google.ai.adk.agents import LlmAgent
@@ -13,6 +14,23 @@ from pathlib import Path
 
 from termcolor import colored
 
+try:
+    from .RepoWalker import collect_repository_stats
+    from .FileSystem import directory_size
+    from .MirrorCache import MirrorCache
+    from .GitProgress import ProgressCallback, run_git_with_progress
+    from .RepoIndex import RepositoryIndex
+    from .ArchiveFetch import fetch_archive
+    from .WorkspaceManager import WorkspaceManager, get_default_workspace_manager
+except ImportError:
+    from RepoWalker import collect_repository_stats
+    from FileSystem import directory_size
+    from MirrorCache import MirrorCache
+    from GitProgress import ProgressCallback, run_git_with_progress
+    from RepoIndex import RepositoryIndex
+    from ArchiveFetch import fetch_archive
+    from WorkspaceManager import WorkspaceManager, get_default_workspace_manager
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("REPO CLONE AGENT")
@@ -41,8 +59,284 @@ def validate_repo_url(repo_url: str) -> bool:
 
 # ======================================  CLONE REPOSITORY   =====================================================
 
-def clone_repository(repo_url: str, target_dir: Optional[str] = None) -> Dict[str, Any]:
-    """Clone a Git repository from the provided URL."""
+# Supported clone strategies:
+#   full      - complete history and every blob
+#   shallow   - only the latest commit(s) of a single branch (--depth N --single-branch)
+#   blobless  - full history, file contents fetched on demand (--filter=blob:none)
+#   treeless  - full commit history, trees and blobs fetched on demand (--filter=tree:0)
+#   sparse    - blobless clone that only checks out the given path patterns
+#   archive   - no git at all: the provider's tarball of the ref is streamed and extracted
+#   auto      - sparse when path patterns are given, otherwise shallow
+CLONE_STRATEGIES = ("auto", "full", "shallow", "blobless", "treeless", "sparse", "archive")
+
+
+def resolve_clone_strategy(strategy: str, sparse_paths: Optional[List[str]] = None) -> str:
+    """Resolve the 'auto' strategy and reject unknown ones."""
+    if strategy not in CLONE_STRATEGIES:
+        raise ValueError(f"Unknown clone strategy '{strategy}'. Expected one of: {', '.join(CLONE_STRATEGIES)}")
+    if strategy == "auto":
+        # The agent only inspects the current tree, so history is not needed
+        return "sparse" if sparse_paths else "shallow"
+    return strategy
+
+
+def default_checkout_workers() -> int:
+    """Pick a parallel checkout worker count based on the available CPUs."""
+    return max(1, min(os.cpu_count() or 1, 8))
+
+
+def build_clone_command(source: str, target_dir: str, strategy: str = "full", depth: int = 1,
+                        checkout_workers: int = 1, ref: Optional[str] = None,
+                        progress: bool = False) -> List[str]:
+    """Build the git clone command line for a resolved clone strategy."""
+    command = ["git"]
+    if checkout_workers > 1:
+        # Parallel checkout (git >= 2.32); older versions ignore the setting
+        command += ["-c", f"checkout.workers={checkout_workers}"]
+    command.append("clone")
+    if progress:
+        # Report progress on stderr even though it is not a terminal
+        command.append("--progress")
+    
+    if strategy == "shallow":
+        command += ["--depth", str(depth), "--single-branch"]
+    elif strategy == "blobless":
+        command.append("--filter=blob:none")
+    elif strategy == "treeless":
+        command.append("--filter=tree:0")
+    elif strategy == "sparse":
+        command += ["--filter=blob:none", "--sparse"]
+    
+    if ref:
+        # Branch or tag to check out instead of the remote HEAD
+        command += ["--branch", ref]
+    command += [source, target_dir]
+    return command
+
+
+def _run_clone(source: str, target_dir: str, strategy: str, depth: int = 1,
+               sparse_paths: Optional[List[str]] = None, checkout_workers: int = 1,
+               ref: Optional[str] = None, timeout: Optional[float] = None,
+               progress_callback: Optional[ProgressCallback] = None,
+               stall_timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Run git clone (and sparse-checkout) for an already validated source."""
+    started = time.perf_counter()
+    command = build_clone_command(source, target_dir, strategy, depth, checkout_workers, ref, progress=True)
+    result = run_git_with_progress(command, progress_callback, stall_timeout, timeout)
+    
+    if result["timed_out"]:
+        return {
+            "success": False,
+            "error": f"Git clone timed out after {timeout} seconds",
+            "command_output": result["output"]
+        }
+    if result["stalled"]:
+        return {
+            "success": False,
+            "error": f"Git clone stalled: no output for {stall_timeout} seconds",
+            "command_output": result["output"]
+        }
+    if result["returncode"] != 0:
+        return {
+            "success": False,
+            "error": f"Git clone failed: {result['output']}",
+            "command_output": result["output"]
+        }
+    
+    command_output = result["output"]
+    if strategy == "sparse" and sparse_paths:
+        sparse = subprocess.run(
+            ["git", "-C", target_dir, "sparse-checkout", "set", "--no-cone", *sparse_paths],
+            capture_output=True,
+            text=True,
+            check=False
+        )
+        if sparse.returncode != 0:
+            return {
+                "success": False,
+                "error": f"Git sparse-checkout failed: {sparse.stderr}",
+                "command_output": sparse.stderr
+            }
+        command_output += sparse.stdout
+    
+    received = result["last_events"].get("Receiving objects", {}).get("bytes")
+    if received is None:
+        # No transfer reported (e.g. a local clone): use the size of the object store
+        received = directory_size(os.path.join(target_dir, ".git", "objects"))
+    return {
+        "success": True,
+        "strategy": strategy,
+        "duration": time.perf_counter() - started,
+        "bytes_transferred": received,
+        "progress": result["last_events"],
+        "command_output": command_output
+    }
+
+
+def _git(args: List[str], cwd: str) -> subprocess.CompletedProcess:
+    """Run a git command inside a checkout."""
+    return subprocess.run(["git", "-C", cwd, *args], capture_output=True, text=True, check=False)
+
+
+def _normalize_remote(url: str) -> str:
+    """Normalize a remote URL for comparison (trailing slash and .git suffix removed)."""
+    url = url.strip().rstrip('/')
+    return url[:-4] if url.endswith('.git') else url
+
+
+def is_checkout_of(target_dir: str, repo_url: str) -> bool:
+    """Check whether a directory already holds a checkout whose origin is repo_url."""
+    if not os.path.exists(os.path.join(target_dir, ".git")):
+        return False
+    result = _git(["remote", "get-url", "origin"], target_dir)
+    return result.returncode == 0 and _normalize_remote(result.stdout) == _normalize_remote(repo_url)
+
+
+def _fetched_branch(target_dir: str) -> Optional[str]:
+    """Name of the remote branch recorded in FETCH_HEAD, or None for a tag or commit."""
+    path = _git(["rev-parse", "--git-path", "FETCH_HEAD"], target_dir).stdout.strip()
+    try:
+        with open(os.path.join(target_dir, path), "r") as f:
+            first_line = f.readline()
+    except OSError:
+        return None
+    match = re.search(r"\tbranch '([^']+)' of ", first_line)
+    return match.group(1) if match else None
+
+
+def update_repository(repo_url: str, target_dir: str, ref: Optional[str] = None,
+                      depth: int = 1) -> Dict[str, Any]:
+    """Fetch and fast-forward (or hard-reset) an existing checkout to a ref.
+    
+    When ref is a branch other than the one checked out, the local branch of
+    that name is checked out (or created) first, so only that branch moves.
+    Tags and commits are checked out as a detached HEAD.
+    
+    Args:
+        repo_url: URL of the repository the checkout was cloned from
+        target_dir: Path of the existing checkout
+        ref: Branch, tag or commit to update to. Defaults to the remote HEAD
+        depth: Fetch depth used when the checkout is shallow
+        
+    Returns:
+        Result dictionary with old_commit, new_commit, update_method ("up-to-date",
+        "fast-forward", "reset" or "checkout") and changed_files (a list of
+        {"status", "path"} entries)
+    """
+    started = time.perf_counter()
+    old_commit = _git(["rev-parse", "HEAD"], target_dir).stdout.strip()
+    
+    fetch = ["fetch", "--quiet", "origin", ref or "HEAD"]
+    if os.path.exists(os.path.join(target_dir, ".git", "shallow")):
+        fetch[1:1] = ["--depth", str(depth)]
+    result = _git(fetch, target_dir)
+    if result.returncode != 0:
+        return {
+            "success": False,
+            "error": f"Git fetch failed: {result.stderr}",
+            "command_output": result.stderr
+        }
+    
+    new_commit = _git(["rev-parse", "FETCH_HEAD"], target_dir).stdout.strip()
+    current_branch = _git(["symbolic-ref", "--short", "-q", "HEAD"], target_dir).stdout.strip()
+    switch = None
+    if ref:
+        branch = _fetched_branch(target_dir)
+        if branch is None and new_commit != old_commit:
+            # A tag or commit
+            switch = ["checkout", "--quiet", "--force", "--detach", new_commit]
+        elif branch is not None and branch != current_branch:
+            if _git(["rev-parse", "--verify", "--quiet", f"refs/heads/{branch}"], target_dir).returncode == 0:
+                switch = ["checkout", "--quiet", "--force", branch]
+            else:
+                switch = ["checkout", "--quiet", "--force", "-b", branch, new_commit]
+    if switch is not None:
+        result = _git(switch, target_dir)
+        if result.returncode != 0:
+            return {
+                "success": False,
+                "error": f"Git checkout failed: {result.stderr}",
+                "command_output": result.stderr
+            }
+    
+    head_commit = _git(["rev-parse", "HEAD"], target_dir).stdout.strip()
+    if head_commit == new_commit:
+        update_method = "up-to-date" if switch is None else "checkout"
+    elif _git(["merge", "--ff-only", "--quiet", "FETCH_HEAD"], target_dir).returncode == 0:
+        update_method = "fast-forward"
+    else:
+        result = _git(["reset", "--hard", "--quiet", "FETCH_HEAD"], target_dir)
+        if result.returncode != 0:
+            return {
+                "success": False,
+                "error": f"Git reset failed: {result.stderr}",
+                "command_output": result.stderr
+            }
+        update_method = "reset"
+    
+    changed_files = []
+    if new_commit != old_commit:
+        diff = _git(["diff", "--name-status", "--no-renames", "-z", old_commit, new_commit], target_dir)
+        fields = diff.stdout.split("\0")
+        for status, path in zip(fields[0::2], fields[1::2]):
+            changed_files.append({"status": status, "path": path})
+    
+    stats = collect_repository_stats(target_dir)
+    logger.info(f"Updated {target_dir} from {old_commit[:12]} to {new_commit[:12]} "
+                f"({update_method}, {len(changed_files)} changed files)")
+    return {
+        "success": True,
+        "updated": True,
+        "repo_url": repo_url,
+        "repo_name": repo_url.split('/')[-1].replace('.git', ''),
+        "clone_path": target_dir,
+        "file_count": stats["file_count"],
+        "directory_count": stats["directory_count"],
+        "total_bytes": stats["total_bytes"],
+        "extensions": stats["extensions"],
+        "old_commit": old_commit,
+        "new_commit": new_commit,
+        "update_method": update_method,
+        "changed_files": changed_files,
+        "duration": time.perf_counter() - started,
+        "command_output": result.stdout
+    }
+
+
+def clone_repository(repo_url: str, target_dir: Optional[str] = None, strategy: str = "full",
+                     depth: int = 1, sparse_paths: Optional[List[str]] = None,
+                     checkout_workers: Optional[int] = None,
+                     mirror_cache: Optional[MirrorCache] = None,
+                     ref: Optional[str] = None, update: bool = False,
+                     timeout: Optional[float] = None,
+                     progress_callback: Optional[ProgressCallback] = None,
+                     stall_timeout: Optional[float] = None,
+                     workspace_manager: Optional[WorkspaceManager] = None) -> Dict[str, Any]:
+    """Clone a Git repository from the provided URL.
+    
+    Args:
+        repo_url: URL of the Git repository to clone
+        target_dir: Directory to clone into. If omitted, a workspace is created by the
+            workspace manager, which evicts least recently used workspaces. The new
+            workspace is kept for the manager's grace period; pin the returned
+            clone_path with ``manager.pin`` to keep it for longer
+        strategy: One of CLONE_STRATEGIES. Defaults to a full clone with history;
+            'auto' opts into a shallow clone, or a sparse clone when sparse_paths are given
+        depth: Number of commits to fetch for shallow clones
+        sparse_paths: Path patterns to check out for sparse clones (e.g. ["src/", "*.md"])
+        checkout_workers: Parallel checkout workers. Defaults to the CPU count (max 8)
+        mirror_cache: Local mirror cache. The repository is fetched into (or refreshed in)
+            a bare mirror and cloned locally from there
+        ref: Branch or tag to check out (any ref, including commits, when updating)
+        update: If target_dir already holds a checkout of repo_url, fetch and
+            fast-forward or hard-reset it to ref instead of cloning again
+        timeout: Seconds after which the git clone is aborted
+        progress_callback: Called with each progress event parsed from git
+            (phase, percent, objects, total_objects, bytes, throughput, elapsed)
+        stall_timeout: Abort the clone if git prints nothing for this many seconds
+        workspace_manager: Manager owning the workspace created when target_dir is
+            omitted. Defaults to the process-wide manager
+    """
     logger.info(f"Attempting to clone repository from: {repo_url}")
     
     if not validate_repo_url(repo_url):
@@ -51,45 +345,111 @@ def clone_repository(repo_url: str, target_dir: Optional[str] = None) -> Dict[st
             "error": "Invalid repository URL. Please provide a valid GitHub, GitLab, Bitbucket, or Azure DevOps URL."
         }
     
-    # Use provided target directory or create a temporary one
+    try:
+        strategy = resolve_clone_strategy(strategy, sparse_paths)
+    except ValueError as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+    if checkout_workers is None:
+        checkout_workers = default_checkout_workers()
+    
+    # Refresh an existing checkout of the same remote in place
+    if update and target_dir and is_checkout_of(target_dir, repo_url):
+        try:
+            return update_repository(repo_url, target_dir, ref, depth)
+        except Exception as e:
+            logger.error(f"Failed to update repository: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to update repository: {str(e)}"
+            }
+    
+    # Use provided target directory or create a managed workspace
+    manager = None
     if not target_dir:
-        target_dir = tempfile.mkdtemp(prefix="repo_clone_")
+        manager = workspace_manager or get_default_workspace_manager()
+        target_dir = manager.create()
     
     target_path = Path(target_dir)
     if not target_path.exists():
         target_path.mkdir(parents=True)
     
+    # A managed workspace is pinned so it cannot be evicted while it is filled
+    with manager.pin(target_dir) if manager else nullcontext():
+        if strategy == "archive":
+            # Read-only snapshot of the ref, without a git object store
+            result = fetch_archive(repo_url, target_dir, ref, timeout=timeout or 60)
+        else:
+            result = _clone_into(repo_url, target_dir, strategy, depth, sparse_paths, checkout_workers,
+                                 mirror_cache, ref, timeout, progress_callback, stall_timeout)
+    
+    if manager and not result["success"]:
+        manager.remove(target_dir)
+    return result
+
+
+def _clone_into(repo_url: str, target_dir: str, strategy: str, depth: int,
+                sparse_paths: Optional[List[str]], checkout_workers: int,
+                mirror_cache: Optional[MirrorCache], ref: Optional[str], timeout: Optional[float],
+                progress_callback: Optional[ProgressCallback],
+                stall_timeout: Optional[float]) -> Dict[str, Any]:
+    """Clone into an existing target directory, directly or through the mirror cache."""
     try:
         # Run git clone command
-        result = subprocess.run(
-            ["git", "clone", repo_url, target_dir],
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        mirror = None
+        if mirror_cache is not None:
+            # The mirror stays locked against eviction from the check until the clone is done
+            with mirror_cache.using(repo_url) as mirror:
+                if not mirror["success"]:
+                    return {
+                        "success": False,
+                        "error": mirror["error"]
+                    }
+                # A local clone hard-links the mirror's objects, so history filters
+                # would only slow it down; sparse checkout still applies
+                local_strategy = "sparse" if strategy == "sparse" else "full"
+                result = _run_clone(mirror["mirror_path"], target_dir, local_strategy, depth,
+                                    sparse_paths, checkout_workers, ref, timeout,
+                                    progress_callback, stall_timeout)
+            if result["success"]:
+                subprocess.run(["git", "-C", target_dir, "remote", "set-url", "origin", repo_url],
+                               capture_output=True, text=True, check=False)
+        else:
+            result = _run_clone(repo_url, target_dir, strategy, depth, sparse_paths, checkout_workers,
+                                ref, timeout, progress_callback, stall_timeout)
         
-        if result.returncode != 0:
-            return {
-                "success": False,
-                "error": f"Git clone failed: {result.stderr}",
-                "command_output": result.stderr
-            }
+        if not result["success"]:
+            return result
+        # The strategy actually used (a mirror clone is local and full or sparse)
+        strategy = result["strategy"]
+        
+        logger.info(f"Cloned {repo_url} using the {strategy} strategy in {result['duration']:.2f}s "
+                    f"({result['bytes_transferred']} bytes)")
         
         # Get repository metadata
         repo_name = repo_url.split('/')[-1].replace('.git', '')
         
-        # Count files and directories
-        file_count = sum(1 for _ in Path(target_dir).glob('**/*') if _.is_file())
-        dir_count = sum(1 for _ in Path(target_dir).glob('**/*') if _.is_dir())
+        # Count files, directories and bytes in a single pass, skipping .git
+        stats = collect_repository_stats(target_dir)
         
         return {
             "success": True,
             "repo_url": repo_url,
             "repo_name": repo_name,
             "clone_path": target_dir,
-            "file_count": file_count,
-            "directory_count": dir_count,
-            "command_output": result.stdout
+            "file_count": stats["file_count"],
+            "directory_count": stats["directory_count"],
+            "total_bytes": stats["total_bytes"],
+            "extensions": stats["extensions"],
+            "strategy": strategy,
+            "checkout_workers": checkout_workers,
+            "duration": result["duration"],
+            "bytes_transferred": result["bytes_transferred"],
+            "mirror": mirror,
+            "progress": result["progress"],
+            "command_output": result["command_output"]
         }
         
     except Exception as e:
@@ -102,65 +462,37 @@ def clone_repository(repo_url: str, target_dir: Optional[str] = None) -> Dict[st
 
 # ======================================  LIST REPOSITORY CONTENTS   =====================================================
 
-# def list_repository_contents(repo_path: str, max_files: int = 20) -> Dict[str, Any]:
-#     """List the contents of a cloned repository."""
-#     try:
-#         repo_dir = Path(repo_path)
-#         if not repo_dir.exists() or not repo_dir.is_dir():
-#             return {
-#                 "success": False,
-#                 "error": f"Repository path '{repo_path}' does not exist or is not a directory."
-#             }
-        
-#         # Get all files recursively
-#         all_files = list(repo_dir.glob('**/*'))
-        
-#         # Filter out directories and hidden files
-#         files = [str(f.relative_to(repo_dir)) for f in all_files 
-#                 if f.is_file() and not any(part.startswith('.') for part in f.parts)]
-        
-#         # Get directories (excluding hidden directories)
-#         dirs = [str(d.relative_to(repo_dir)) for d in all_files 
-#                if d.is_dir() and not any(part.startswith('.') for part in d.parts)]
-        
-#         # Find specific file types
-#         file_types = {}
-#         for file in files:
-#             ext = Path(file).suffix.lower()
-#             if ext:
-#                 if ext not in file_types:
-#                     file_types[ext] = 0
-#                 file_types[ext] += 1
-        
-#         # Check for project type indicators
-#         project_indicators = {
-#             "Python": any(f.endswith(('.py', 'requirements.txt', 'setup.py')) for f in files),
-#             "JavaScript/Node.js": any(f.endswith(('package.json', '.js', '.jsx', '.ts', '.tsx')) for f in files),
-#             "Java": any(f.endswith(('.java', 'pom.xml', 'build.gradle')) for f in files),
-#             "Go": any(f.endswith(('.go', 'go.mod')) for f in files),
-#             "Ruby": any(f.endswith(('.rb', 'Gemfile')) for f in files),
-#             "C#/.NET": any(f.endswith(('.cs', '.csproj', '.sln')) for f in files),
-#             "PHP": any(f.endswith('.php') for f in files)
-#         }
-        
-#         detected_project_types = [lang for lang, detected in project_indicators.items() if detected]
+def list_repository_contents(repo_path: str, max_files: int = 20) -> Dict[str, Any]:
+    """List the contents of a cloned repository.
+    
+    Uses the repository index kept in the git directory and keyed by HEAD, so an
+    unchanged repository is listed without walking the tree and a repository
+    whose HEAD moved only has its changed paths re-indexed.
+    
+    Args:
+        repo_path: Path of the cloned repository
+        max_files: Maximum number of file paths to return
+    """
+    try:
+        repo_dir = Path(repo_path)
+        if not repo_dir.exists() or not repo_dir.is_dir():
+            return {
+                "success": False,
+                "error": f"Repository path '{repo_path}' does not exist or is not a directory."
+            }
         
-#         return {
-#             "success": True,
-#             "total_files": len(files),
-#             "total_directories": len(dirs),
-#             "file_types": file_types,
-#             "detected_project_types": detected_project_types,
-#             "files": files[:max_files],  # Limit the number of files to avoid large responses
-#             "truncated_file_list": len(files) > max_files
-#         }
-    
-#     except Exception as e:
-#         logger.error(f"Failed to list repository contents: {str(e)}")
-#         return {
-#             "success": False,
-#             "error": f"Failed to list repository contents: {str(e)}"
-#         }
+        summary = RepositoryIndex(repo_path).load_or_build().summary(max_files)
+        return {
+            "success": True,
+            **summary
+        }
+    
+    except Exception as e:
+        logger.error(f"Failed to list repository contents: {str(e)}")
+        return {
+            "success": False,
+            "error": f"Failed to list repository contents: {str(e)}"
+        }
 
 
 # ===============================================  TOOLS   =====================================================
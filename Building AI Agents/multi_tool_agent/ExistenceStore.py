@@ -0,0 +1,159 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_POSITIVE_TTL = 7 * 24 * 3600
+DEFAULT_NEGATIVE_TTL = 24 * 3600
+
+
+class ExistenceStore:
+    """
+    A persistent SQLite record of repository existence checks.
+
+    Each URL keeps its latest result, status code (HTTP status or ``git ls-remote``
+    exit code) and check time. Positive and negative results expire after separate
+    TTLs. When a check returns a different status than the one on record, the new
+    result is stored but marked stale, so it is confirmed on the next run instead
+    of being trusted for a full TTL.
+    """
+
+    def __init__(self, path: str = "repo_existence.db", positive_ttl: Optional[float] = DEFAULT_POSITIVE_TTL,
+                 negative_ttl: Optional[float] = DEFAULT_NEGATIVE_TTL):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+            positive_ttl: Seconds an "exists" result stays fresh (None: forever)
+            negative_ttl: Seconds a "does not exist" result stays fresh (None: forever)
+        """
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                # WAL lets several processes read while one writes
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS repository_existence (
+                    url TEXT PRIMARY KEY,
+                    exists_flag INTEGER NOT NULL,
+                    status_code INTEGER,
+                    message TEXT,
+                    checked_at REAL NOT NULL,
+                    previous_status_code INTEGER,
+                    stale INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Get the stored result for a URL if it is still fresh.
+
+        Args:
+            url: The normalized repository URL
+
+        Returns:
+            Dictionary with exists, status_code, message and checked_at, or None if
+            the URL is unknown, expired or stale
+        """
+        record = self.get_record(url)
+        if record is None or record["stale"]:
+            return None
+        ttl = self.positive_ttl if record["exists"] else self.negative_ttl
+        if ttl is not None and time.time() - record["checked_at"] > ttl:
+            return None
+        return record
+
+    def get_record(self, url: str) -> Optional[Dict]:
+        """Get the stored result for a URL regardless of its age."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT exists_flag, status_code, message, checked_at, previous_status_code, stale "
+                "FROM repository_existence WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "url": url,
+            "exists": bool(row[0]),
+            "status_code": row[1],
+            "message": row[2],
+            "checked_at": row[3],
+            "previous_status_code": row[4],
+            "stale": bool(row[5])
+        }
+
+    def record(self, url: str, exists: bool, status_code: Optional[int], message: str):
+        """
+        Store the result of an existence check.
+
+        Args:
+            url: The normalized repository URL
+            exists: Whether the repository exists and is accessible
+            status_code: HTTP status code or git exit code
+            message: Human readable result of the check
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT status_code FROM repository_existence WHERE url = ?", (url,)
+            ).fetchone()
+            previous_status = row[0] if row else None
+            stale = 1 if row is not None and previous_status != status_code else 0
+            self._conn.execute(
+                """
+                INSERT INTO repository_existence
+                    (url, exists_flag, status_code, message, checked_at, previous_status_code, stale)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    exists_flag = excluded.exists_flag,
+                    status_code = excluded.status_code,
+                    message = excluded.message,
+                    checked_at = excluded.checked_at,
+                    previous_status_code = excluded.previous_status_code,
+                    stale = excluded.stale
+                """,
+                (url, int(exists), status_code, message, time.time(), previous_status, stale)
+            )
+
+    def mark_stale(self, url: str):
+        """Force a URL to be verified again on its next lookup."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE repository_existence SET stale = 1 WHERE url = ?", (url,))
+
+    def stats(self) -> Dict:
+        """Count stored, positive, negative, stale and expired entries."""
+        now = time.time()
+        positive_cutoff = now - self.positive_ttl if self.positive_ttl is not None else float("-inf")
+        negative_cutoff = now - self.negative_ttl if self.negative_ttl is not None else float("-inf")
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT
+                    COUNT(*),
+                    COALESCE(SUM(exists_flag), 0),
+                    COALESCE(SUM(stale), 0),
+                    COALESCE(SUM(CASE WHEN (exists_flag = 1 AND checked_at < ?)
+                                        OR (exists_flag = 0 AND checked_at < ?) THEN 1 ELSE 0 END), 0)
+                FROM repository_existence
+                """,
+                (positive_cutoff, negative_cutoff)
+            ).fetchone()
+        return {
+            "entries": row[0],
+            "positive": row[1],
+            "negative": row[0] - row[1],
+            "stale": row[2],
+            "expired": row[3]
+        }
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,78 @@
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class FileLock:
+    """An advisory inter-process lock on a file (shared or exclusive).
+
+    Uses fcntl.flock where available. On platforms without fcntl locking is a
+    no-op, so concurrent processes are not protected there. A lock file may be
+    removed with ``unlink`` by its holder; a waiter that then gets the lock on
+    the removed file notices and locks the new file at the path instead.
+    """
+
+    def __init__(self, path: str, shared: bool = False, blocking: bool = True):
+        self.path = path
+        self.shared = shared
+        self.blocking = blocking
+        self._file = None
+
+    def acquire(self) -> bool:
+        while True:
+            self._file = open(self.path, "a+")
+            if fcntl is None:
+                return True
+            flags = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+            if not self.blocking:
+                flags |= fcntl.LOCK_NB
+            try:
+                fcntl.flock(self._file.fileno(), flags)
+            except BlockingIOError:
+                self._file.close()
+                self._file = None
+                return False
+            # The holder may have unlinked the file while we waited (see unlink):
+            # the lock is only valid on the file currently at the path
+            try:
+                if os.path.samestat(os.fstat(self._file.fileno()), os.stat(self.path)):
+                    return True
+            except FileNotFoundError:
+                pass
+            self.release()
+
+    def unlink(self):
+        """Remove the lock file while holding the lock. Waiting processes retry on a new file."""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def release(self):
+        if self._file is not None:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+def directory_size(path: str) -> int:
+    """Total size in bytes of the files under a directory."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
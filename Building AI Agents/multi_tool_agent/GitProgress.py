@@ -0,0 +1,157 @@
+import codecs
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# e.g. "remote: Counting objects: 100% (10/10), done."
+#      "Receiving objects:  45% (450/1000), 1.20 MiB | 2.40 MiB/s"
+PROGRESS_PATTERN = re.compile(
+    r'^(?:remote:\s*)?(?P<phase>[A-Za-z][A-Za-z ]*?):\s+(?P<percent>\d+)%\s+\((?P<objects>\d+)/(?P<total>\d+)\)'
+    r'(?:,\s+(?P<bytes>[\d.]+\s*[KMGT]?i?B))?'
+    r'(?:\s*\|\s*(?P<throughput>[\d.]+\s*[KMGT]?i?B/s))?'
+)
+
+SIZE_PATTERN = re.compile(r'^([\d.]+)\s*([KMGT]?)i?B')
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def _parse_size(text: Optional[str]) -> Optional[int]:
+    """Convert a git size such as "1.20 MiB" (or "2.40 MiB/s") to bytes."""
+    if not text:
+        return None
+    match = SIZE_PATTERN.match(text)
+    if not match:
+        return None
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def parse_progress_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse one git progress line into a structured event.
+
+    Args:
+        line: A single line of git stderr output (without \\r or \\n)
+
+    Returns:
+        Dictionary with phase, percent, objects, total_objects, bytes and
+        throughput (bytes per second), or None if the line is not progress
+    """
+    match = PROGRESS_PATTERN.match(line.strip())
+    if not match:
+        return None
+    return {
+        "phase": match.group("phase").strip(),
+        "remote": line.lstrip().startswith("remote:"),
+        "percent": int(match.group("percent")),
+        "objects": int(match.group("objects")),
+        "total_objects": int(match.group("total")),
+        "bytes": _parse_size(match.group("bytes")),
+        "throughput": _parse_size(match.group("throughput"))
+    }
+
+
+def run_git_with_progress(command: List[str], progress_callback: Optional[ProgressCallback] = None,
+                          stall_timeout: Optional[float] = None,
+                          timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run a git command that reports progress on stderr (e.g. ``git clone --progress``).
+
+    Stderr is read incrementally and split on both \\r and \\n, so progress
+    updates are seen as git prints them instead of after the command exits.
+    Only the final line of each phase and any non-progress output are kept.
+    Any output counts as a sign of life for the stall watchdog, including
+    phases without percentages such as "remote: Enumerating objects".
+
+    Args:
+        command: The git command line
+        progress_callback: Called with each progress event (plus an "elapsed" field)
+        stall_timeout: Kill the command if it writes nothing to stderr for this many seconds
+        timeout: Kill the command if it runs longer than this many seconds
+
+    Returns:
+        Dictionary with returncode, output, stalled, timed_out and last_events
+        (the last progress event of each phase)
+    """
+    started = time.monotonic()
+    # A new session lets the whole process group (git and its transport helpers) be killed
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                               start_new_session=hasattr(os, "killpg"))
+    state = {"last_output": started}
+    output_lines: List[str] = []
+    last_events: Dict[str, Dict[str, Any]] = {}
+
+    def handle_line(line: str):
+        event = parse_progress_line(line)
+        if event is None:
+            if line.strip():
+                output_lines.append(line)
+            return
+        last_events[event["phase"]] = event
+        if event["percent"] == 100 and line.rstrip().endswith("done."):
+            output_lines.append(line)
+        if progress_callback is not None:
+            event["elapsed"] = time.monotonic() - started
+            try:
+                progress_callback(event)
+            except Exception:
+                pass
+
+    def read_stderr():
+        # Multi-byte characters may be split across chunks
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        while True:
+            chunk = process.stderr.read1(4096)
+            if not chunk:
+                break
+            state["last_output"] = time.monotonic()
+            pending += decoder.decode(chunk)
+            *lines, pending = re.split(r'[\r\n]', pending)
+            for line in lines:
+                handle_line(line)
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            handle_line(pending)
+
+    reader = threading.Thread(target=read_stderr, daemon=True)
+    reader.start()
+
+    stalled = timed_out = False
+    while True:
+        try:
+            process.wait(timeout=0.5)
+            break
+        except subprocess.TimeoutExpired:
+            now = time.monotonic()
+            if timeout is not None and now - started > timeout:
+                timed_out = True
+            elif stall_timeout is not None and now - state["last_output"] > stall_timeout:
+                stalled = True
+            else:
+                continue
+            if hasattr(os, "killpg"):
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except OSError:
+                    pass
+            else:
+                process.kill()
+            process.wait()
+            break
+
+    reader.join(timeout=5)
+    if not reader.is_alive():
+        process.stderr.close()
+    return {
+        "returncode": process.returncode,
+        "output": "\n".join(output_lines),
+        "stalled": stalled,
+        "timed_out": timed_out,
+        "last_events": last_events
+    }
@@ -0,0 +1,89 @@
+import urllib.parse
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+
+def get_hostname(url: str) -> str:
+    """Get the lower-cased hostname of an HTTP(S), SSH or Git protocol URL."""
+    url = url.strip()
+    if url.startswith('git@'):
+        return url[4:].split(':', 1)[0].lower()
+    return urllib.parse.urlparse(url).netloc.lower()
+
+
+class HostScheduler:
+    """
+    Hands out URLs to an executor round-robin across hosts.
+
+    At most ``max_in_flight`` calls run at once, and at most ``per_host_limit``
+    against any single host, so one slow or dead host does not hold up the
+    rest. URLs of the same host are started in input order.
+    """
+
+    def __init__(self, urls: Iterable[str], per_host_limit: int):
+        """
+        Initialize the scheduler.
+
+        Args:
+            urls: URLs to schedule
+            per_host_limit: Maximum number of calls running against one host (at least 1)
+        """
+        self.per_host_limit = max(1, per_host_limit)
+        self.in_flight = Counter()
+        self._pending = OrderedDict()
+        for url in urls:
+            self._pending.setdefault(get_hostname(url), deque()).append(url)
+
+    @property
+    def pending(self) -> int:
+        """Number of URLs not started yet."""
+        return sum(len(urls) for urls in self._pending.values())
+
+    def drain(self) -> List[str]:
+        """Remove and return the URLs not started yet, so they are never submitted."""
+        urls = [url for host_urls in self._pending.values() for url in host_urls]
+        self._pending.clear()
+        return urls
+
+    def _fill(self, executor: Executor, func: Callable[[str], Any], futures: dict, max_in_flight: int):
+        """Submit work round-robin across hosts that are below their limit."""
+        submitted = True
+        while submitted and len(futures) < max_in_flight:
+            submitted = False
+            for host in list(self._pending):
+                if len(futures) >= max_in_flight:
+                    break
+                if self.in_flight[host] >= self.per_host_limit:
+                    continue
+                url = self._pending[host].popleft()
+                if not self._pending[host]:
+                    del self._pending[host]
+                futures[executor.submit(func, url)] = (host, url)
+                self.in_flight[host] += 1
+                submitted = True
+
+    def run(self, executor: Executor, func: Callable[[str], Any],
+            max_in_flight: int) -> Iterator[Tuple[str, Future]]:
+        """
+        Call func for every URL on the executor, yielding calls as they complete.
+
+        URLs removed with drain() while iterating are not started.
+
+        Args:
+            executor: Executor running the calls
+            func: Called with each URL
+            max_in_flight: Maximum number of calls running at once
+
+        Yields:
+            (url, completed future) pairs, in completion order
+        """
+        max_in_flight = max(1, max_in_flight)
+        futures = {}
+        while self._pending or futures:
+            self._fill(executor, func, futures, max_in_flight)
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                host, url = futures.pop(future)
+                self.in_flight[host] -= 1
+                yield url, future
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from .FileSystem import FileLock, directory_size
+except ImportError:
+    from FileSystem import FileLock, directory_size
+
+logger = logging.getLogger("REPO MIRROR CACHE")
+
+DEFAULT_MIRROR_ROOT = os.environ.get(
+    "REPO_MIRROR_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "repo_mirrors")
+)
+
+
+class MirrorCache:
+    """
+    A local cache of bare mirrors used as the source for repeated clones.
+
+    Each repository URL is fetched once into a bare mirror. Later clones copy
+    from the mirror locally (objects are hard-linked), and the mirror only runs
+    an incremental ``git fetch`` once it is older than ``refresh_after``.
+    Mirrors are evicted least-recently-used when the cache exceeds its disk
+    budget. File locks make the cache safe to share between processes: mirrors
+    are created and fetched under an exclusive lock and cloned from under a
+    shared one (see ``using``), and eviction skips mirrors that are in use.
+    """
+
+    def __init__(self, root: str = DEFAULT_MIRROR_ROOT, max_bytes: int = 5 * 1024 ** 3,
+                 refresh_after: float = 300, timeout: Optional[float] = None):
+        """
+        Initialize the mirror cache.
+
+        Args:
+            root: Directory holding the mirrors
+            max_bytes: Disk budget for all mirrors together
+            refresh_after: Seconds after which a mirror is fetched again before use
+            timeout: Timeout in seconds for creating or fetching a mirror
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.refresh_after = refresh_after
+        self.timeout = timeout
+        os.makedirs(self.root, exist_ok=True)
+
+    def _key(self, repo_url: str) -> str:
+        """Directory-safe, collision-free name for a repository URL."""
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', repo_url.rstrip('/').split('/')[-1].replace('.git', ''))
+        digest = hashlib.sha256(repo_url.encode("utf-8")).hexdigest()[:16]
+        return f"{name[:40]}-{digest}"
+
+    def mirror_path(self, repo_url: str) -> str:
+        """Path of the bare mirror for a repository URL."""
+        return os.path.join(self.root, f"{self._key(repo_url)}.git")
+
+    def _meta_path(self, mirror_path: str) -> str:
+        return f"{mirror_path}.json"
+
+    def _lock_path(self, mirror_path: str) -> str:
+        return f"{mirror_path}.lock"
+
+    def _read_meta(self, mirror_path: str) -> Dict[str, Any]:
+        try:
+            with open(self._meta_path(mirror_path), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, mirror_path: str, meta: Dict[str, Any]):
+        tmp_path = f"{self._meta_path(mirror_path)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path(mirror_path))
+
+    def ensure_mirror(self, repo_url: str) -> Dict[str, Any]:
+        """
+        Create the mirror for a URL, or fetch it if it is older than refresh_after.
+
+        Args:
+            repo_url: URL of the Git repository
+
+        Returns:
+            Dictionary with success, mirror_path, created and fetched (or error)
+        """
+        mirror_path = self.mirror_path(repo_url)
+        created = fetched = False
+        with FileLock(self._lock_path(mirror_path)):
+            meta = self._read_meta(mirror_path)
+            try:
+                if not os.path.isdir(mirror_path):
+                    tmp_path = f"{mirror_path}.{os.getpid()}.partial"
+                    shutil.rmtree(tmp_path, ignore_errors=True)
+                    try:
+                        self._git(["clone", "--mirror", repo_url, tmp_path])
+                        os.replace(tmp_path, mirror_path)
+                    finally:
+                        # Left behind only if the clone failed
+                        shutil.rmtree(tmp_path, ignore_errors=True)
+                    meta = {"url": repo_url, "last_fetch": time.time()}
+                    created = True
+                elif time.time() - meta.get("last_fetch", 0) > self.refresh_after:
+                    self._git(["--git-dir", mirror_path, "fetch", "--prune", "--quiet"])
+                    meta["last_fetch"] = time.time()
+                    fetched = True
+            except (subprocess.SubprocessError, OSError) as e:
+                return {
+                    "success": False,
+                    "mirror_path": mirror_path,
+                    "error": f"Failed to update mirror: {str(e)}"
+                }
+            meta["url"] = repo_url
+            meta["last_used"] = time.time()
+            self._write_meta(mirror_path, meta)
+
+        if created or fetched:
+            self.evict(keep=[mirror_path])
+        return {
+            "success": True,
+            "mirror_path": mirror_path,
+            "created": created,
+            "fetched": fetched
+        }
+
+    def reading(self, repo_url: str) -> FileLock:
+        """Shared lock to hold while cloning from a mirror so it is not evicted meanwhile."""
+        return FileLock(self._lock_path(self.mirror_path(repo_url)), shared=True)
+
+    @contextmanager
+    def using(self, repo_url: str, attempts: int = 3) -> Iterator[Dict[str, Any]]:
+        """
+        Ensure the mirror for a URL and keep it from being evicted while the block runs.
+
+        Usage::
+
+            with cache.using(repo_url) as mirror:
+                if mirror["success"]:
+                    ...  # clone from mirror["mirror_path"]
+
+        ensure_mirror releases its exclusive lock before returning, so another
+        process could evict the mirror before a shared lock is taken. The mirror
+        is therefore checked again once the shared lock is held, and ensured
+        again if it has gone.
+
+        Args:
+            repo_url: URL of the Git repository
+            attempts: How often to ensure the mirror before giving up
+
+        Yields:
+            The ensure_mirror result (check "success" before using the mirror)
+        """
+        mirror_path = self.mirror_path(repo_url)
+        result = None
+        for _ in range(attempts):
+            result = self.ensure_mirror(repo_url)
+            if not result["success"]:
+                break
+            lock = self.reading(repo_url)
+            lock.acquire()
+            if os.path.isdir(mirror_path):
+                try:
+                    yield result
+                finally:
+                    lock.release()
+                return
+            lock.release()
+            result = {
+                "success": False,
+                "mirror_path": mirror_path,
+                "error": "Mirror was evicted before it could be used"
+            }
+        yield result
+
+    def _git(self, args: List[str]):
+        result = subprocess.run(["git", *args], capture_output=True, text=True, timeout=self.timeout)
+        if result.returncode != 0:
+            raise subprocess.SubprocessError(result.stderr.strip())
+
+    def _mirrors(self) -> List[Dict[str, Any]]:
+        """List the mirrors with their size and last use time."""
+        mirrors = []
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".git") or not entry.is_dir():
+                    continue
+                meta = self._read_meta(entry.path)
+                mirrors.append({
+                    "path": entry.path,
+                    "url": meta.get("url"),
+                    "bytes": directory_size(entry.path),
+                    "last_used": meta.get("last_used", 0),
+                    "last_fetch": meta.get("last_fetch", 0)
+                })
+        return mirrors
+
+    def usage(self) -> Dict[str, Any]:
+        """Report the number of mirrors and the disk space they use."""
+        mirrors = self._mirrors()
+        return {
+            "mirrors": len(mirrors),
+            "bytes": sum(mirror["bytes"] for mirror in mirrors),
+            "max_bytes": self.max_bytes
+        }
+
+    def evict(self, keep: Optional[List[str]] = None) -> List[str]:
+        """
+        Remove least recently used mirrors until the cache fits its disk budget.
+
+        Mirrors in ``keep`` and mirrors currently locked by another process are skipped.
+
+        Returns:
+            Paths of the evicted mirrors
+        """
+        keep = set(keep or [])
+        evicted = []
+        with FileLock(os.path.join(self.root, ".evict.lock")):
+            mirrors = sorted(self._mirrors(), key=lambda mirror: mirror["last_used"])
+            total = sum(mirror["bytes"] for mirror in mirrors)
+            for mirror in mirrors:
+                if total <= self.max_bytes:
+                    break
+                if mirror["path"] in keep:
+                    continue
+                lock = FileLock(self._lock_path(mirror["path"]), blocking=False)
+                if not lock.acquire():
+                    continue
+                try:
+                    shutil.rmtree(mirror["path"], ignore_errors=True)
+                    try:
+                        os.remove(self._meta_path(mirror["path"]))
+                    except OSError:
+                        pass
+                finally:
+                    lock.release()
+                total -= mirror["bytes"]
+                evicted.append(mirror["path"])
+                logger.info(f"Evicted mirror of {mirror['url']} ({mirror['bytes']} bytes)")
+        return evicted
@@ -1,7 +1,18 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Union
+
 from google.adk.agents.sequential_agent import SequentialAgent
 from google.adk.agents.llm_agent import LlmAgent
+from google.adk.models.base_llm import BaseLlm
 from google.genai import types
-from google.adk.sessions import InMemorySessionService
+from google.adk.sessions import BaseSessionService, InMemorySessionService
 from google.adk.runners import Runner
 
 # --- Constants ---
@@ -9,74 +20,184 @@ APP_NAME = "code_pipeline_app"
 USER_ID = "dev_user_01"
 SESSION_ID = "pipeline_session_01"
 GEMINI_MODEL = "gemini-2.0-flash-exp"
+MAX_CONCURRENCY = int(os.environ.get("PIPELINE_CONCURRENCY", "8"))
+# SQLite file for durable sessions; sessions are kept in memory when unset
+SESSION_DB = os.environ.get("PIPELINE_SESSION_DB")
+# Number of memoized stage outputs; 0 disables the stage cache
+STAGE_CACHE_SIZE = int(os.environ.get("PIPELINE_STAGE_CACHE_SIZE", "1024"))
+# Skip the refactor stage when the review has no actionable issues ("0" disables)
+SKIP_CLEAN_REFACTOR = os.environ.get("PIPELINE_SKIP_CLEAN_REFACTOR", "1") != "0"
+STATE_KEYS = ("generated_code", "review_comments", "review_verdict", "refactored_code")
+
+
+def build_pipeline(model: Union[str, BaseLlm] = GEMINI_MODEL,
+                   stage_cache: Optional["StageCache"] = None,
+                   review_gate: Optional["ReviewGate"] = None) -> SequentialAgent:
+    """Build a new Writer -> Reviewer -> Refactorer pipeline agent.
+    
+    Args:
+        model: Model name or instance used by every stage
+        stage_cache: If given, each stage is served from this cache when its
+            inputs (request or state keys it reads) have not changed
+        review_gate: If given, the refactor stage is skipped (and the generated
+            code passed through) when the review verdict is NO_CHANGES
+    """
+    # --- 1. Define Sub-Agents for Each Pipeline Stage ---
+
+    # Code Writer Agent
+    # Takes the initial specification (from user query) and writes code.
+    code_writer_agent = LlmAgent(
+        name="CodeWriterAgent",
+        model=model,
+        instruction="""You are a Code Writer AI.
+        Based on the user's request, write the initial Python code.
+        Output *only* the raw code block.
+        """,
+        description="Writes initial code based on a specification.",
+        # Stores its output (the generated code) into the session state
+        # under the key 'generated_code'.
+        output_key="generated_code"
+    )
+
+    # Code Reviewer Agent
+    # Takes the code generated by the previous agent (read from state) and provides feedback.
+    code_reviewer_agent = LlmAgent(
+        name="CodeReviewerAgent",
+        model=model,
+        instruction="""You are a Code Reviewer AI.
+        Review the Python code provided in the session state under the key 'generated_code'.
+        Provide constructive feedback on potential errors, style issues, or improvements.
+        Focus on clarity and correctness.
+        Output only the review comments, ending with a final line that is exactly one of:
+        VERDICT: NO_CHANGES
+        VERDICT: CHANGES_REQUESTED
+        Use NO_CHANGES only if there are no actionable issues to fix.
+        """,
+        description="Reviews code and provides feedback.",
+        # Stores its output (the review comments) into the session state
+        # under the key 'review_comments'.
+        output_key="review_comments"
+    )
+
+    # Code Refactorer Agent
+    # Takes the original code and the review comments (read from state) and refactors the code.
+    code_refactorer_agent = LlmAgent(
+        name="CodeRefactorerAgent",
+        model=model,
+        instruction="""You are a Code Refactorer AI.
+        Take the original Python code provided in the session state key 'generated_code'
+        and the review comments found in the session state key 'review_comments'.
+        Refactor the original code to address the feedback and improve its quality.
+        Output *only* the final, refactored code block.
+        """,
+        description="Refactors code based on review comments.",
+        # Stores its output (the refactored code) into the session state
+        # under the key 'refactored_code'.
+        output_key="refactored_code"
+    )
+
+    if stage_cache is not None:
+        stage_cache.attach(code_writer_agent, reads_request=True)
+        stage_cache.attach(code_reviewer_agent, reads=["generated_code"])
+        stage_cache.attach(code_refactorer_agent, reads=["generated_code", "review_comments"])
+    # Attached after the cache so the gate wraps it and only times real model calls
+    if review_gate is not None:
+        review_gate.attach(code_refactorer_agent)
+
+    # --- 2. Create the SequentialAgent ---
+    # This agent orchestrates the pipeline by running the sub_agents in order.
+    return SequentialAgent(
+        name="CodePipelineAgent",
+        sub_agents=[code_writer_agent, code_reviewer_agent, code_refactorer_agent]
+        # The agents will run in the order provided: Writer -> Reviewer -> Refactorer
+    )
+
+
+# Built on first use, so importing this module has no side effects
+_pipeline = None
+_runner = None
+_stage_cache = None
+_review_gate = None
+_build_lock = threading.Lock()
+
+
+def get_stage_cache() -> Optional["StageCache"]:
+    """Get the shared stage cache, or None if it is disabled."""
+    global _stage_cache
+    if STAGE_CACHE_SIZE <= 0:
+        return None
+    if _stage_cache is None:
+        try:
+            from .StageCache import StageCache
+        except ImportError:
+            from StageCache import StageCache
+        _stage_cache = StageCache(STAGE_CACHE_SIZE)
+    return _stage_cache
+
+
+def get_review_gate() -> Optional["ReviewGate"]:
+    """Get the shared review gate, or None if refactors always run."""
+    global _review_gate
+    if not SKIP_CLEAN_REFACTOR:
+        return None
+    if _review_gate is None:
+        try:
+            from .ReviewGate import ReviewGate
+        except ImportError:
+            from ReviewGate import ReviewGate
+        _review_gate = ReviewGate()
+    return _review_gate
+
+
+def get_pipeline() -> SequentialAgent:
+    """Get the shared pipeline agent, building it on first use."""
+    global _pipeline
+    with _build_lock:
+        if _pipeline is None:
+            _pipeline = build_pipeline(stage_cache=get_stage_cache(), review_gate=get_review_gate())
+        return _pipeline
+
 
-# --- 1. Define Sub-Agents for Each Pipeline Stage ---
-
-# Code Writer Agent
-# Takes the initial specification (from user query) and writes code.
-code_writer_agent = LlmAgent(
-    name="CodeWriterAgent",
-    model=GEMINI_MODEL,
-    instruction="""You are a Code Writer AI.
-    Based on the user's request, write the initial Python code.
-    Output *only* the raw code block.
-    """,
-    description="Writes initial code based on a specification.",
-    # Stores its output (the generated code) into the session state
-    # under the key 'generated_code'.
-    output_key="generated_code"
-)
-
-# Code Reviewer Agent
-# Takes the code generated by the previous agent (read from state) and provides feedback.
-code_reviewer_agent = LlmAgent(
-    name="CodeReviewerAgent",
-    model=GEMINI_MODEL,
-    instruction="""You are a Code Reviewer AI.
-    Review the Python code provided in the session state under the key 'generated_code'.
-    Provide constructive feedback on potential errors, style issues, or improvements.
-    Focus on clarity and correctness.
-    Output only the review comments.
-    """,
-    description="Reviews code and provides feedback.",
-    # Stores its output (the review comments) into the session state
-    # under the key 'review_comments'.
-    output_key="review_comments"
-)
-
-# Code Refactorer Agent
-# Takes the original code and the review comments (read from state) and refactors the code.
-code_refactorer_agent = LlmAgent(
-    name="CodeRefactorerAgent",
-    model=GEMINI_MODEL,
-    instruction="""You are a Code Refactorer AI.
-    Take the original Python code provided in the session state key 'generated_code'
-    and the review comments found in the session state key 'review_comments'.
-    Refactor the original code to address the feedback and improve its quality.
-    Output *only* the final, refactored code block.
-    """,
-    description="Refactors code based on review comments.",
-    # Stores its output (the refactored code) into the session state
-    # under the key 'refactored_code'.
-    output_key="refactored_code"
-)
-
-# --- 2. Create the SequentialAgent ---
-# This agent orchestrates the pipeline by running the sub_agents in order.
-code_pipeline_agent = SequentialAgent(
-    name="CodePipelineAgent",
-    sub_agents=[code_writer_agent, code_reviewer_agent, code_refactorer_agent]
-    # The agents will run in the order provided: Writer -> Reviewer -> Refactorer
-)
-
-# Session and Runner
-session_service = InMemorySessionService()
-session = session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
-runner = Runner(agent=code_pipeline_agent, app_name=APP_NAME, session_service=session_service)
+def build_session_service(session_db: Optional[str] = SESSION_DB, **options) -> BaseSessionService:
+    """
+    Create the session service for the pipeline.
+    
+    Args:
+        session_db: SQLite file for a durable, bounded session store. Sessions
+            are kept in memory when not set
+        **options: SqliteSessionService options (ttl, max_sessions, ...)
+    """
+    if not session_db:
+        return InMemorySessionService()
+    try:
+        from .SqliteSessionService import SqliteSessionService
+    except ImportError:
+        from SqliteSessionService import SqliteSessionService
+    return SqliteSessionService(session_db, **options)
+
+
+def get_runner() -> Runner:
+    """Get the shared runner (and its session service), building them on first use."""
+    global _runner
+    pipeline = get_pipeline()
+    with _build_lock:
+        if _runner is None:
+            _runner = Runner(agent=pipeline, app_name=APP_NAME, session_service=build_session_service())
+        return _runner
+
+
+def __getattr__(name):
+    # Keep code_pipeline_agent / root_agent available as module attributes (e.g. for adk web)
+    if name in ("code_pipeline_agent", "root_agent"):
+        return get_pipeline()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Agent Interaction
 def call_agent(query):
+    runner = get_runner()
+    if runner.session_service.get_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID) is None:
+        runner.session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
     content = types.Content(role='user', parts=[types.Part(text=query)])
     events = runner.run(user_id=USER_ID, session_id=SESSION_ID, new_message=content)
 
@@ -85,4 +206,169 @@ def call_agent(query):
             final_response = event.content.parts[0].text
             print("Agent Response: ", final_response)
 
-call_agent("perform math addition")
\ No newline at end of file
+
+async def _session_call(session_service: BaseSessionService, method: str, **kwargs) -> Any:
+    """Call a session service method, in a worker thread if the service is thread safe."""
+    call = getattr(session_service, method)
+    if getattr(session_service, "thread_safe", False):
+        # e.g. SqliteSessionService, whose database I/O would otherwise block the event loop
+        return await asyncio.to_thread(call, **kwargs)
+    return call(**kwargs)
+
+
+async def acall_agent(query: str, runner: Optional[Runner] = None, user_id: str = USER_ID,
+                      semaphore: Optional[asyncio.Semaphore] = None,
+                      keep_session: bool = False) -> Dict[str, Any]:
+    """
+    Run the pipeline for one request asynchronously, in a session of its own.
+    
+    Each request gets a fresh session, so concurrent requests never share state.
+    The session is deleted afterwards unless keep_session is set.
+    
+    Args:
+        query: The code specification
+        runner: Runner to use. Defaults to the shared runner
+        user_id: User the session belongs to
+        semaphore: Limits how many requests run at once
+        keep_session: Keep the session after the request finishes
+        
+    Returns:
+        Dictionary with success, session_id, response, the pipeline state
+        (generated_code, review_comments, refactored_code) and duration, or error
+    """
+    runner = runner or get_runner()
+    session_id = uuid.uuid4().hex
+    started = time.perf_counter()
+    async with semaphore or asyncio.Semaphore(1):
+        session_service = runner.session_service
+        await _session_call(session_service, "create_session", app_name=runner.app_name, user_id=user_id,
+                            session_id=session_id)
+        try:
+            content = types.Content(role='user', parts=[types.Part(text=query)])
+            final_response = None
+            async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
+                if event.is_final_response() and event.content and event.content.parts:
+                    final_response = event.content.parts[0].text
+            
+            session = await _session_call(session_service, "get_session", app_name=runner.app_name,
+                                          user_id=user_id, session_id=session_id)
+            state = session.state if session else {}
+            return {
+                "success": True,
+                "session_id": session_id,
+                "query": query,
+                "response": final_response,
+                **{key: state.get(key) for key in STATE_KEYS},
+                "duration": time.perf_counter() - started
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "session_id": session_id,
+                "query": query,
+                "error": str(e),
+                "duration": time.perf_counter() - started
+            }
+        finally:
+            if not keep_session:
+                await _session_call(session_service, "delete_session", app_name=runner.app_name,
+                                    user_id=user_id, session_id=session_id)
+
+
+async def abatch_call_agent(queries: Iterable[str], concurrency: int = MAX_CONCURRENCY,
+                            runner: Optional[Runner] = None) -> List[Dict[str, Any]]:
+    """
+    Run the pipeline for many requests concurrently.
+    
+    Args:
+        queries: The code specifications
+        concurrency: Maximum number of requests running at once
+        runner: Runner to use. Defaults to the shared runner
+        
+    Returns:
+        One result per query (see acall_agent), in input order
+    """
+    runner = runner or get_runner()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    return await asyncio.gather(*(acall_agent(query, runner, semaphore=semaphore) for query in queries))
+
+
+def read_specs(path: str) -> List[str]:
+    """
+    Read code specifications from a file (or stdin for "-").
+    
+    A JSONL file holds one object with a "spec" (or "query") field per line;
+    any other file holds one specification per non-empty line.
+
+    Raises:
+        ValueError: A JSON line is malformed or has no "spec"/"query" string
+            (the message gives its line number)
+    """
+    f = sys.stdin if path == "-" else open(path, "r")
+    try:
+        lines = [(number, line.strip()) for number, line in enumerate(f, 1) if line.strip()]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    specs = []
+    for number, line in lines:
+        if line.startswith("{"):
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON: {e}") from e
+            spec = record.get("spec") or record.get("query") if isinstance(record, dict) else None
+            if not isinstance(spec, str) or not spec.strip():
+                raise ValueError(f'{path}:{number}: no "spec" or "query" field')
+            specs.append(spec)
+        else:
+            specs.append(line)
+    return specs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the Writer -> Reviewer -> Refactorer code pipeline.")
+    parser.add_argument("query", nargs="?", default="perform math addition", help="Code specification")
+    parser.add_argument("-b", "--batch", help="File with one specification per line, or JSONL ('-' for stdin)")
+    parser.add_argument("-c", "--concurrency", type=int, default=MAX_CONCURRENCY,
+                        help="Maximum number of pipeline runs at once")
+    parser.add_argument("-o", "--output", help="Write JSONL results to this file instead of stdout")
+    args = parser.parse_args(argv)
+    
+    if not args.batch:
+        call_agent(args.query)
+        return 0
+    
+    try:
+        specs = read_specs(args.batch)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    results = asyncio.run(abatch_call_agent(specs, args.concurrency))
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    failures = sum(not result["success"] for result in results)
+    print(f"Ran {len(results)} specs ({failures} failed) in {time.perf_counter() - started:.2f}s",
+          file=sys.stderr)
+    stage_cache = get_stage_cache()
+    if stage_cache is not None:
+        for stage, counts in stage_cache.stats().items():
+            print(f"  {stage}: {counts['hits']} cached, {counts['misses']} run "
+                  f"({counts['hit_ratio']:.0%} hit ratio)", file=sys.stderr)
+    review_gate = get_review_gate()
+    if review_gate is not None:
+        gate = review_gate.stats()
+        print(f"  Refactor skipped for {gate['refactors_skipped']} of "
+              f"{gate['refactors_skipped'] + gate['refactors_run']} specs ({gate['skip_ratio']:.0%}), "
+              f"saving about {gate['estimated_seconds_saved']:.1f}s", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,218 @@
+import json
+import re
+import urllib.parse
+from typing import Dict, Iterable, List, Optional
+
+# URL templates per provider kind. Placeholders: {host}, {owner}, {repo}, and {ref}
+# for archive downloads
+KIND_TEMPLATES = {
+    "github": {
+        "clone_url": "https://{host}/{owner}/{repo}.git",
+        "ssh_url": "git@{host}:{owner}/{repo}.git",
+        "web_url": "https://{host}/{owner}/{repo}",
+        "api_url": "https://{host}/api/v3/repos/{owner}/{repo}",
+        "archive_url": "https://{host}/{owner}/{repo}/archive/{ref}.tar.gz",
+    },
+    "gitlab": {
+        "clone_url": "https://{host}/{owner}/{repo}.git",
+        "ssh_url": "git@{host}:{owner}/{repo}.git",
+        "web_url": "https://{host}/{owner}/{repo}",
+        "api_url": "https://{host}/api/v4/projects/{owner}%2F{repo}",
+        "archive_url": "https://{host}/api/v4/projects/{owner}%2F{repo}/repository/archive.tar.gz?sha={ref}",
+    },
+    "gitea": {
+        "clone_url": "https://{host}/{owner}/{repo}.git",
+        "ssh_url": "git@{host}:{owner}/{repo}.git",
+        "web_url": "https://{host}/{owner}/{repo}",
+        "api_url": "https://{host}/api/v1/repos/{owner}/{repo}",
+        "archive_url": "https://{host}/{owner}/{repo}/archive/{ref}.tar.gz",
+    },
+    "bitbucket": {
+        "clone_url": "https://{host}/{owner}/{repo}.git",
+        "ssh_url": "git@{host}:{owner}/{repo}.git",
+        "web_url": "https://{host}/{owner}/{repo}",
+        "archive_url": "https://{host}/{owner}/{repo}/get/{ref}.tar.gz",
+    },
+}
+
+# Built-in providers. Entries without a kind have no URL templates and fall back
+# to the generic URL handling of RepositoryValidator.
+DEFAULT_PROVIDERS = [
+    {"name": "GitHub", "hostname": "github.com", "kind": "github",
+     "api_url": "https://api.github.com/repos/{owner}/{repo}"},
+    {"name": "GitLab", "hostname": "gitlab.com", "kind": "gitlab"},
+    {"name": "Bitbucket", "hostname": "bitbucket.org", "kind": "bitbucket",
+     "api_url": "https://api.bitbucket.org/2.0/repositories/{owner}/{repo}"},
+    {"name": "Azure DevOps", "hostname": "dev.azure.com", "repo_index": 2},
+    {"name": "Google Cloud Source", "hostname": "source.developers.google.com",
+     "url_pattern": r'^https?://source\.developers\.google\.com/p/[^/]+/r/[^/]+(/.*)?$',
+     "owner_index": 1, "repo_index": 3},
+    {"name": "Codeberg", "hostname": "codeberg.org"},
+    {"name": "Gitea", "hostname": "gitea.com"},
+    {"name": "SourceForge", "hostname": "sourceforge.net",
+     "url_pattern": r'^https?://git\.sourceforge\.net/gitroot/[^/]+/[^/]+(/.*)?$'},
+]
+
+
+class GitProvider:
+    """
+    A Git hosting provider: how to recognise its repository URLs and how to
+    build clone, web and API URLs for its repositories.
+    """
+
+    def __init__(self, name: str, hostname: str, kind: Optional[str] = None,
+                 url_pattern: Optional[str] = None, owner_index: int = 0, repo_index: int = 1,
+                 clone_url: Optional[str] = None, ssh_url: Optional[str] = None,
+                 web_url: Optional[str] = None, api_url: Optional[str] = None,
+                 archive_url: Optional[str] = None):
+        """
+        Initialize the provider.
+
+        Args:
+            name: Display name of the provider (e.g. "GitHub")
+            hostname: Host serving the repositories (e.g. "gitlab.example.com")
+            kind: Provider software ("github", "gitlab", "gitea" or "bitbucket"),
+                used for default URL templates
+            url_pattern: Regex an HTTP(S) repository URL must match. Defaults to
+                https://<hostname>/<owner>/<repo>[/...]
+            owner_index: Index of the owner in the URL path segments
+            repo_index: Index of the repository name in the URL path segments
+            clone_url, ssh_url, web_url, api_url, archive_url: URL templates
+                overriding the defaults of ``kind``
+        """
+        if kind is not None and kind not in KIND_TEMPLATES:
+            raise ValueError(f"Unknown provider kind '{kind}'. Expected one of: {', '.join(KIND_TEMPLATES)}")
+
+        self.name = name
+        self.hostname = hostname.lower()
+        self.kind = kind
+        self.owner_index = owner_index
+        self.repo_index = repo_index
+
+        if url_pattern is None:
+            url_pattern = r'^https?://' + re.escape(self.hostname) + r'/[^/]+/[^/]+(/.*)?$'
+        self.url_pattern = re.compile(url_pattern)
+
+        templates = dict(KIND_TEMPLATES.get(kind, {}))
+        overrides = {"clone_url": clone_url, "ssh_url": ssh_url, "web_url": web_url, "api_url": api_url,
+                     "archive_url": archive_url}
+        templates.update({key: value for key, value in overrides.items() if value is not None})
+        self.templates = templates
+
+    @classmethod
+    def from_dict(cls, config: Dict) -> "GitProvider":
+        """Create a provider from a configuration dictionary."""
+        return cls(**config)
+
+    def build_url(self, template_name: str, owner: str, repo: str, ref: str = "HEAD") -> Optional[str]:
+        """
+        Build one of the provider URLs for a repository.
+
+        Args:
+            template_name: One of "clone_url", "ssh_url", "web_url", "api_url" or "archive_url"
+            owner: Repository owner (user, group or organisation)
+            repo: Repository name
+            ref: Branch, tag or commit, used by "archive_url"
+
+        Returns:
+            The URL, or None if the provider has no template for it
+        """
+        template = self.templates.get(template_name)
+        if template is None:
+            return None
+        return template.format(host=self.hostname, owner=owner, repo=repo,
+                               ref=urllib.parse.quote(ref, safe="/"))
+
+    def extract(self, path_parts: List[str]) -> Optional[Dict[str, str]]:
+        """Extract owner and repository name from the path segments of an HTTP(S) URL."""
+        if len(path_parts) <= max(self.owner_index, self.repo_index):
+            return None
+        return {
+            "username": path_parts[self.owner_index],
+            "repo_name": path_parts[self.repo_index].replace('.git', '')
+        }
+
+
+class ProviderRegistry:
+    """
+    Hostname-indexed collection of Git hosting providers.
+
+    Lookups are a single dictionary access on the lower-cased hostname, so
+    additional self-hosted instances cost nothing at validation time.
+    """
+
+    def __init__(self, providers: Optional[Iterable[GitProvider]] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            providers: Providers to register. Defaults to the built-in providers
+        """
+        self._by_host: Dict[str, GitProvider] = {}
+        self._by_name: Dict[str, GitProvider] = {}
+        # Bumped on every registration, so users can drop results derived from older contents
+        self.version = 0
+        if providers is None:
+            providers = [GitProvider.from_dict(config) for config in DEFAULT_PROVIDERS]
+        for provider in providers:
+            self.register(provider)
+
+    def register(self, provider: GitProvider):
+        """Add a provider, replacing any existing provider for the same hostname."""
+        self._by_host[provider.hostname] = provider
+        self._by_name.setdefault(provider.name, provider)
+        self.version += 1
+
+    def get(self, hostname: Optional[str]) -> Optional[GitProvider]:
+        """Get the provider serving a hostname, or None if it is unknown."""
+        if not hostname:
+            return None
+        return self._by_host.get(hostname.lower())
+
+    def get_by_name(self, name: Optional[str]) -> Optional[GitProvider]:
+        """Get the first registered provider with the given display name."""
+        return self._by_name.get(name)
+
+    def provider_name(self, hostname: str) -> str:
+        """Convert a hostname to a provider name, falling back to the hostname itself."""
+        provider = self.get(hostname)
+        return provider.name if provider else hostname
+
+    def load(self, path: str):
+        """
+        Register providers from a JSON or YAML file.
+
+        The file holds either a list of provider entries or a mapping with a
+        "providers" list, e.g.::
+
+            {"providers": [{"name": "Corp GitLab", "hostname": "git.corp.example", "kind": "gitlab"}]}
+
+        Args:
+            path: Path to the configuration file
+        """
+        with open(path, "r") as f:
+            if path.endswith((".yaml", ".yml")):
+                import yaml
+                config = yaml.safe_load(f)
+            else:
+                config = json.load(f)
+
+        entries = config.get("providers", []) if isinstance(config, dict) else config
+        for entry in entries:
+            self.register(GitProvider.from_dict(entry))
+
+    @classmethod
+    def from_config(cls, path: str) -> "ProviderRegistry":
+        """Create a registry with the built-in providers plus those from a config file."""
+        registry = cls()
+        registry.load(path)
+        return registry
+
+    def __contains__(self, hostname: str) -> bool:
+        return self.get(hostname) is not None
+
+    def __iter__(self):
+        return iter(self._by_host.values())
+
+    def __len__(self) -> int:
+        return len(self._by_host)
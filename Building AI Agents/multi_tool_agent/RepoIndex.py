@@ -0,0 +1,271 @@
+import hashlib
+import json
+import logging
+import os
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .RepoWalker import iter_repository_entries
+except ImportError:
+    from RepoWalker import iter_repository_entries
+
+logger = logging.getLogger("REPO INDEX")
+
+INDEX_FILE = "repo_index.json"
+INDEX_VERSION = 2
+
+# Manifest and build files, looked up by exact file name
+MANIFEST_FILES = {
+    "requirements.txt": "Python",
+    "setup.py": "Python",
+    "pyproject.toml": "Python",
+    "Pipfile": "Python",
+    "package.json": "JavaScript/Node.js",
+    "pom.xml": "Java",
+    "build.gradle": "Java",
+    "build.gradle.kts": "Java",
+    "go.mod": "Go",
+    "Gemfile": "Ruby",
+    "composer.json": "PHP",
+    "Cargo.toml": "Rust",
+    "Dockerfile": "Docker",
+}
+
+# Source and project files, looked up by lower-cased extension
+EXTENSION_TYPES = {
+    ".py": "Python",
+    ".js": "JavaScript/Node.js",
+    ".jsx": "JavaScript/Node.js",
+    ".ts": "JavaScript/Node.js",
+    ".tsx": "JavaScript/Node.js",
+    ".java": "Java",
+    ".go": "Go",
+    ".rb": "Ruby",
+    ".cs": "C#/.NET",
+    ".csproj": "C#/.NET",
+    ".sln": "C#/.NET",
+    ".php": "PHP",
+    ".rs": "Rust",
+}
+
+
+def _is_hidden(path: str) -> bool:
+    """Check whether any component of a relative path is a dot-file or dot-directory."""
+    return any(part.startswith(".") for part in path.split("/"))
+
+
+def _index_entry(path: str, size: int, extension: str) -> List[Any]:
+    """Compact index record: [size, extension, manifest project type or None]."""
+    return [size, extension, MANIFEST_FILES.get(path.rsplit("/", 1)[-1])]
+
+
+class RepositoryIndex:
+    """
+    A compact on-disk index of a repository's files, keyed by the HEAD commit.
+
+    Each file is stored as ``path -> [size, extension, manifest]``, with paths
+    relative to ``repo_path``; hidden files and directories are left out. The
+    index is saved inside the repository's git directory, one file per indexed
+    directory, so subdirectories of the same repository are indexed separately.
+    Listing a repository whose HEAD has not moved reads the saved index without
+    walking the tree; when HEAD has moved, only the paths changed between the
+    two commits are re-indexed. A changed .gitignore forces a full walk.
+    Repositories without git are walked on every call.
+    """
+
+    def __init__(self, repo_path: str):
+        """
+        Initialize the index for a repository.
+
+        Args:
+            repo_path: Root directory of the repository (working tree)
+        """
+        self.repo_path = repo_path
+        self.head, self.git_dir, self.prefix = self._git_head()
+        self.entries: Dict[str, List[Any]] = {}
+        # .gitignore path -> [mtime_ns, size] for the files the index was built with
+        self.gitignores: Dict[str, List[int]] = {}
+        self.source = None
+
+    def _git_head(self) -> Tuple[Optional[str], Optional[str], str]:
+        """
+        Get the HEAD commit, the git directory and repo_path relative to the top of
+        the working tree ("" at the top), or (None, None, "") outside a repository.
+        """
+        try:
+            result = subprocess.run(
+                ["git", "-C", self.repo_path, "rev-parse", "HEAD", "--absolute-git-dir", "--show-toplevel"],
+                capture_output=True, text=True, check=False
+            )
+        except OSError:
+            return None, None, ""
+        lines = result.stdout.splitlines()
+        if result.returncode != 0 or len(lines) != 3:
+            return None, None, ""
+        prefix = os.path.relpath(os.path.realpath(self.repo_path), os.path.realpath(lines[2]))
+        return lines[0], lines[1], "" if prefix == "." else prefix.replace(os.sep, "/")
+
+    @property
+    def index_path(self) -> Optional[str]:
+        if not self.git_dir:
+            return None
+        if not self.prefix:
+            return os.path.join(self.git_dir, INDEX_FILE)
+        digest = hashlib.sha1(self.prefix.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.git_dir, f"repo_index-{digest}.json")
+
+    def _gitignore_stat(self, path: str) -> Optional[List[int]]:
+        try:
+            stat = os.stat(os.path.join(self.repo_path, path))
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _gitignores_changed(self, saved: Dict[str, Any]) -> bool:
+        """Check whether a .gitignore the saved index was built with was edited or removed."""
+        return any(self._gitignore_stat(path) != fingerprint
+                   for path, fingerprint in saved.get("gitignores", {}).items())
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        if not self.index_path:
+            return None
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION or data.get("prefix") != self.prefix:
+            return None
+        return data
+
+    def _save(self):
+        if not self.index_path:
+            return
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"version": INDEX_VERSION, "head": self.head, "prefix": self.prefix,
+                           "gitignores": self.gitignores, "entries": self.entries},
+                          f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not save repository index: {str(e)}")
+
+    def _changed_paths(self, old_head: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        List (status, path) changed under repo_path between an indexed commit and HEAD,
+        with paths relative to repo_path, or None if unknown.
+        """
+        # --relative limits the diff to repo_path and makes the paths relative to it
+        result = subprocess.run(
+            ["git", "-C", self.repo_path, "diff", "--name-status", "--no-renames", "--relative", "-z",
+             old_head, self.head],
+            capture_output=True, text=True, check=False
+        )
+        if result.returncode != 0:
+            # e.g. the old commit is gone after a shallow fetch
+            return None
+        fields = result.stdout.split("\0")
+        return list(zip(fields[0::2], fields[1::2]))
+
+    def build(self):
+        """Index the whole working tree in a single walk."""
+        self.entries = {}
+        # The top-level file is tracked even when missing, so adding one is noticed
+        self.gitignores = {".gitignore": self._gitignore_stat(".gitignore")}
+        for entry in iter_repository_entries(self.repo_path):
+            if entry.is_dir:
+                continue
+            if entry.path.rsplit("/", 1)[-1] == ".gitignore":
+                self.gitignores[entry.path] = self._gitignore_stat(entry.path)
+            if not _is_hidden(entry.path):
+                self.entries[entry.path] = _index_entry(entry.path, entry.size, entry.extension)
+        self.source = "full"
+
+    def apply_changes(self, changes: List[Tuple[str, str]]):
+        """Re-index only the given changed paths."""
+        for status, path in changes:
+            if _is_hidden(path):
+                continue
+            full_path = os.path.join(self.repo_path, path)
+            if status.startswith("D") or not os.path.isfile(full_path):
+                self.entries.pop(path, None)
+                continue
+            try:
+                size = os.lstat(full_path).st_size
+            except OSError:
+                self.entries.pop(path, None)
+                continue
+            self.entries[path] = _index_entry(path, size, os.path.splitext(path)[1].lower())
+        self.source = "incremental"
+
+    def load_or_build(self) -> "RepositoryIndex":
+        """
+        Bring the index up to date with HEAD, doing as little work as possible.
+
+        Sets ``source`` to "cache" (HEAD unchanged), "incremental" (only the
+        changed paths were re-indexed) or "full" (the tree was walked).
+        """
+        saved = self._load() if self.head else None
+        if saved is not None and self._gitignores_changed(saved):
+            saved = None
+        if saved is not None and saved.get("head") == self.head:
+            self.entries = saved["entries"]
+            self.gitignores = saved.get("gitignores", {})
+            self.source = "cache"
+            return self
+
+        changes = self._changed_paths(saved["head"]) if saved is not None else None
+        if changes is not None and any(path.rsplit("/", 1)[-1] == ".gitignore" for _, path in changes):
+            # Ignore rules changed: which files are listed may change anywhere
+            changes = None
+        if changes is not None:
+            self.entries = saved["entries"]
+            self.gitignores = saved.get("gitignores", {})
+            self.apply_changes(changes)
+        else:
+            self.build()
+        self._save()
+        return self
+
+    def summary(self, max_files: int = 20) -> Dict[str, Any]:
+        """
+        Summarize the index: counts, file types, detected project types and manifests.
+
+        Args:
+            max_files: Maximum number of file paths to include
+        """
+        file_types: Dict[str, int] = {}
+        directories = set()
+        detected = set()
+        manifests = []
+        total_bytes = 0
+        for path, (size, extension, manifest) in self.entries.items():
+            total_bytes += size
+            if extension:
+                file_types[extension] = file_types.get(extension, 0) + 1
+                project_type = EXTENSION_TYPES.get(extension)
+                if project_type:
+                    detected.add(project_type)
+            if manifest:
+                detected.add(manifest)
+                manifests.append(path)
+            parent = path.rpartition("/")[0]
+            while parent and parent not in directories:
+                directories.add(parent)
+                parent = parent.rpartition("/")[0]
+
+        files = sorted(self.entries)
+        return {
+            "total_files": len(files),
+            "total_directories": len(directories),
+            "total_bytes": total_bytes,
+            "file_types": file_types,
+            "detected_project_types": sorted(detected),
+            "manifests": sorted(manifests),
+            "files": files[:max_files],
+            "truncated_file_list": len(files) > max_files,
+            "head": self.head,
+            "index_source": self.source
+        }
@@ -0,0 +1,188 @@
+import os
+import re
+from collections import namedtuple
+from typing import Any, Dict, Iterator, List, Optional
+
+# A single file or directory found by the walker. ``path`` is relative to the
+# repository root and uses forward slashes.
+RepoEntry = namedtuple("RepoEntry", ["path", "is_dir", "size", "extension"])
+
+# A compiled .gitignore rule. ``base`` is the directory holding the .gitignore
+# (relative to the root, "" for the root itself).
+_IgnoreRule = namedtuple("_IgnoreRule", ["regex", "negate", "dir_only", "anchored", "base"])
+
+ALWAYS_SKIP = frozenset([".git"])
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression matching a whole path.
+
+    ``*`` and ``?`` do not match ``/``; ``**`` matches across directories
+    when it makes up a whole path component (``**/a``, ``a/**``, ``a/**/b``).
+    """
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            # Zero or more leading directories
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == n and (i == 0 or pattern[i - 1] == "/"):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            # A "]" right after "[" (or "[!") is part of the set
+            end = pattern.find("]", i + 3 if pattern.startswith("[!", i) else i + 2)
+            if end == -1:
+                parts.append(re.escape("["))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts) + r"\Z"
+
+
+def _compile_rule(line: str, base: str) -> Optional[_IgnoreRule]:
+    """Compile one gitignore line, or return None for blank lines and comments."""
+    line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    anchored = "/" in line
+    line = line.lstrip("/")
+    if not line:
+        return None
+    return _IgnoreRule(re.compile(_translate(line)), negate, dir_only, anchored, base)
+
+
+def _parse_gitignore(path: str, base: str) -> List[_IgnoreRule]:
+    """Compile the rules of a .gitignore file.
+
+    Supports comments, negation (``!``), directory-only rules (trailing ``/``),
+    rules anchored to the .gitignore directory (containing ``/``) and ``**``.
+    """
+    try:
+        with open(path, "r", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    return [rule for rule in (_compile_rule(line, base) for line in lines) if rule]
+
+
+def _is_ignored(rel_path: str, name: str, is_dir: bool, rules: List[_IgnoreRule]) -> bool:
+    """Apply the rules in order; the last matching rule decides."""
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.anchored:
+            target = rel_path[len(rule.base) + 1:] if rule.base else rel_path
+        else:
+            target = name
+        if rule.regex.match(target):
+            ignored = not rule.negate
+    return ignored
+
+
+def iter_repository_entries(root: str, use_gitignore: bool = True,
+                            extra_ignores: Optional[List[str]] = None) -> Iterator[RepoEntry]:
+    """Walk a repository once with os.scandir, yielding its files and directories.
+
+    The ``.git`` directory is never entered. Because this is a generator,
+    callers can stop early without walking the rest of the tree.
+
+    Args:
+        root: Repository root directory
+        use_gitignore: Honour .gitignore files found while walking
+        extra_ignores: Additional gitignore-style patterns applied from the root
+
+    Yields:
+        RepoEntry for every file and directory that is not ignored
+    """
+    root_rules = [rule for rule in (_compile_rule(pattern, "") for pattern in extra_ignores or []) if rule]
+
+    stack = [(root, "", root_rules)]
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+        if use_gitignore:
+            local_rules = _parse_gitignore(os.path.join(directory, ".gitignore"), rel_dir)
+            if local_rules:
+                rules = rules + local_rules
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name in ALWAYS_SKIP:
+                        continue
+                    rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if rules and _is_ignored(rel_path, name, is_dir, rules):
+                        continue
+
+                    if is_dir:
+                        yield RepoEntry(rel_path, True, 0, "")
+                        stack.append((entry.path, rel_path, rules))
+                    else:
+                        try:
+                            size = entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            size = 0
+                        yield RepoEntry(rel_path, False, size, os.path.splitext(name)[1].lower())
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            continue
+
+
+def collect_repository_stats(root: str, use_gitignore: bool = True,
+                             extra_ignores: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Count files, directories, total bytes and files per extension in one pass.
+
+    Args:
+        root: Repository root directory
+        use_gitignore: Honour .gitignore files found while walking
+        extra_ignores: Additional gitignore-style patterns applied from the root
+
+    Returns:
+        Dictionary with file_count, directory_count, total_bytes and extensions
+    """
+    file_count = 0
+    dir_count = 0
+    total_bytes = 0
+    extensions: Dict[str, int] = {}
+    for entry in iter_repository_entries(root, use_gitignore, extra_ignores):
+        if entry.is_dir:
+            dir_count += 1
+            continue
+        file_count += 1
+        total_bytes += entry.size
+        if entry.extension:
+            extensions[entry.extension] = extensions.get(entry.extension, 0) + 1
+
+    return {
+        "file_count": file_count,
+        "directory_count": dir_count,
+        "total_bytes": total_bytes,
+        "extensions": extensions
+    }
@@ -1,11 +1,90 @@
+import functools
 import re
+import threading
+import time
 import urllib.parse
-from typing import Tuple, Dict, Optional, List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Dict, Optional, List, Union
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
 import subprocess
 import logging
 
+try:
+    from .ProviderRegistry import ProviderRegistry
+    from .ExistenceStore import ExistenceStore
+    from .HostScheduler import HostScheduler
+except ImportError:
+    from ProviderRegistry import ProviderRegistry
+    from ExistenceStore import ExistenceStore
+    from HostScheduler import HostScheduler
+
+# Precompiled patterns shared by all validator instances
+GENERIC_HTTP_PATTERN = re.compile(r'^https?://[^/]+/[^/]+/[^/]+(/.*)?$')
+SSH_STRUCTURE_PATTERN = re.compile(r'^git@([^:]+):([^/]+)/([^/]+)(\.git)?$')
+SSH_EXTRACT_PATTERN = re.compile(r'^git@([^:]+):([^/]+)/([^/\.]+)(\.git)?$')
+GIT_STRUCTURE_PATTERN = re.compile(r'^git://([^/]+)/([^/]+)/([^/]+)(\.git)?$')
+GIT_EXTRACT_PATTERN = re.compile(r'^git://([^/]+)/([^/]+)/([^/\.]+)(\.git)?$')
+
+# Existence answers that can be remembered. Anything else (429/5xx after retries,
+# 401/403, timeouts, DNS, network or auth failures) may change on the next try
+DEFINITIVE_HTTP_STATUSES = frozenset([200, 404])
+GIT_NOT_FOUND_PATTERN = re.compile(r'repository\b.*\bnot found|does not exist', re.IGNORECASE)
+
+
+class _TTLCache:
+    """A small thread-safe LRU cache whose entries expire after a TTL."""
+    
+    def __init__(self, max_size: int, ttl: Optional[float]):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries beyond max_size."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl
+        }
+
 class RepositoryValidator:
     """
     A class for validating and extracting information from Git repository URLs.
@@ -15,12 +94,35 @@ class RepositoryValidator:
     It can also verify repository existence and extract metadata.
     """
     
-    def __init__(self, log_level=logging.INFO):
+    def __init__(self, log_level=logging.INFO, session: Optional[requests.Session] = None,
+                 pool_connections: int = 32, pool_maxsize: int = 16, max_retries: int = 2,
+                 backoff_factor: float = 0.3, timeout: float = 5,
+                 provider_registry: Optional[ProviderRegistry] = None,
+                 providers_config: Optional[str] = None,
+                 cache_size: int = 4096, parse_ttl: Optional[float] = 3600,
+                 existence_ttl: Optional[float] = 300,
+                 existence_store: Optional[Union[ExistenceStore, str]] = None):
         """
         Initialize the repository validator.
         
         Args:
             log_level: The logging level to use
+            session: HTTP session used for existence checks. If not provided, a pooled
+                keep-alive session is created from the settings below
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum number of connections kept alive per host
+            max_retries: Retries for failed connections and 429/5xx responses
+            backoff_factor: Exponential backoff factor between retries
+            timeout: Timeout in seconds for each existence check
+            provider_registry: Registry of known Git hosting providers. Defaults to
+                the built-in providers
+            providers_config: Optional JSON/YAML file with extra providers, e.g.
+                self-hosted GitLab or Gitea instances
+            cache_size: Maximum number of URLs whose results are memoized (0 disables)
+            parse_ttl: Seconds a structural validation result is reused (None: forever)
+            existence_ttl: Seconds an existence check result is reused (None: forever)
+            existence_store: Persistent SQLite store (or path to one) for existence
+                results, so later runs only verify URLs whose results have expired
         """
         # Set up logging
         self.logger = logging.getLogger("repo_validator")
@@ -32,31 +134,121 @@ class RepositoryValidator:
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
         
-        # Known Git hosting providers and their URL patterns
-        self.provider_patterns = {
-            "github.com": r'^https?://github\.com/[^/]+/[^/]+(/.*)?$',
-            "gitlab.com": r'^https?://gitlab\.com/[^/]+/[^/]+(/.*)?$',
-            "bitbucket.org": r'^https?://bitbucket\.org/[^/]+/[^/]+(/.*)?$',
-            "dev.azure.com": r'^https?://dev\.azure\.com/[^/]+/[^/]+(/.*)?$',
-            "source.developers.google.com": r'^https?://source\.developers\.google\.com/p/[^/]+/r/[^/]+(/.*)?$',
-            "codeberg.org": r'^https?://codeberg\.org/[^/]+/[^/]+(/.*)?$',
-            "gitea.com": r'^https?://gitea\.com/[^/]+/[^/]+(/.*)?$',
-            "sourceforge.net": r'^https?://git\.sourceforge\.net/gitroot/[^/]+/[^/]+(/.*)?$',
-        }
+        # Known Git hosting providers, indexed by hostname
+        self.registry = provider_registry if provider_registry is not None else ProviderRegistry()
+        if providers_config:
+            self.registry.load(providers_config)
+        
+        # Memoized results keyed by normalized URL. Parsing is cheap and stable,
+        # existence can change, so each has its own TTL
+        self._parse_cache = _TTLCache(cache_size, parse_ttl)
+        # Registry version the parse cache was filled with; registering a provider invalidates it
+        self._registry_version = self.registry.version
+        self._existence_cache = _TTLCache(cache_size, existence_ttl)
+        
+        self._owns_store = isinstance(existence_store, str)
+        self.existence_store = ExistenceStore(existence_store) if self._owns_store else existence_store
+        
+        # Shared HTTP session so existence checks reuse connections per host
+        self.timeout = timeout
+        self.session = session if session is not None else self._create_session(
+            pool_connections, pool_maxsize, max_retries, backoff_factor
+        )
+
+    # Read-only views of the registry in the shape of the former provider tables,
+    # kept for compatibility. Add providers with self.registry.register() instead.
+
+    @property
+    def provider_patterns(self) -> Dict[str, str]:
+        """URL regex of each known provider, keyed by hostname."""
+        return {provider.hostname: provider.url_pattern.pattern for provider in self.registry}
+
+    @property
+    def provider_map(self) -> Dict[str, str]:
+        """Provider name of each known hostname."""
+        return {provider.hostname: provider.name for provider in self.registry}
+
+    @property
+    def api_supported_providers(self) -> List[str]:
+        """Names of the providers with an API URL."""
+        names = [provider.name for provider in self.registry if "api_url" in provider.templates]
+        return list(dict.fromkeys(names))
+
+    @staticmethod
+    def _create_session(pool_connections: int, pool_maxsize: int, max_retries: int,
+                        backoff_factor: float) -> requests.Session:
+        """Create a keep-alive session with per-host connection pools and a retry policy."""
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["HEAD", "GET"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def connection_stats(self) -> Dict:
+        """
+        Get connection reuse statistics for the HTTP session.
         
-        # Mapping of hostnames to provider names
-        self.provider_map = {
-            "github.com": "GitHub",
-            "gitlab.com": "GitLab",
-            "bitbucket.org": "Bitbucket",
-            "dev.azure.com": "Azure DevOps",
-            "source.developers.google.com": "Google Cloud Source",
-            "codeberg.org": "Codeberg",
-            "gitea.com": "Gitea"
-        }
+        Counts cover the host pools that are currently open; pools evicted
+        beyond ``pool_connections`` are not included.
+        
+        Returns:
+            Dictionary with the number of requests, new connections, reused
+            connections and the reuse ratio, plus a per-host breakdown
+        """
+        stats = {"requests": 0, "connections": 0, "hosts": {}}
+        for adapter in set(self.session.adapters.values()):
+            poolmanager = getattr(adapter, "poolmanager", None)
+            if poolmanager is None:
+                continue
+            for key in list(poolmanager.pools.keys()):
+                pool = poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                host = stats["hosts"].setdefault(pool.host, {"requests": 0, "connections": 0})
+                host["requests"] += pool.num_requests
+                host["connections"] += pool.num_connections
+                stats["requests"] += pool.num_requests
+                stats["connections"] += pool.num_connections
+        stats["reused"] = max(0, stats["requests"] - stats["connections"])
+        stats["reuse_ratio"] = stats["reused"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+    
+    def cache_stats(self) -> Dict:
+        """
+        Get hit/miss statistics of the memoized validation results.
         
-        # Providers that support API access
-        self.api_supported_providers = ["GitHub", "GitLab", "Bitbucket"]
+        Returns:
+            Dictionary with "parse" and "existence" entries, each holding hits,
+            misses, hit_ratio, size, max_size and ttl
+        """
+        return {
+            "parse": self._parse_cache.stats(),
+            "existence": self._existence_cache.stats()
+        }
+    
+    def clear_cache(self):
+        """Drop all memoized validation and existence results."""
+        self._parse_cache.clear()
+        self._existence_cache.clear()
+    
+    def close(self):
+        """Close the HTTP session and its pooled connections."""
+        self.session.close()
+        if self._owns_store:
+            self.existence_store.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def validate_repo_url(self, repo_url: str, verify_existence: bool = False) -> Tuple[bool, Dict]:
         """
@@ -72,20 +264,72 @@ class RepositoryValidator:
         # Normalize the URL first
         normalized_url = repo_url.strip()
         
+        # Structural validation is memoized per normalized URL, for the current providers
+        if self._registry_version != self.registry.version:
+            self._registry_version = self.registry.version
+            self._parse_cache.clear()
+        cached = self._parse_cache.get(normalized_url)
+        if cached is None:
+            cached = self._validate_structure(normalized_url)
+            self._parse_cache.put(normalized_url, cached)
+        is_valid, details = cached[0], self._copy_details(cached[1], repo_url)
+        
+        if not is_valid:
+            return False, details
+        
+        # Verify repository existence if requested
+        if verify_existence:
+            existence = self._existence_cache.get(normalized_url)
+            details["existence_source"] = "memory"
+            if existence is None:
+                existence = self._lookup_existence_store(normalized_url)
+                details["existence_source"] = "store"
+            if existence is None:
+                existence = self._check_existence(normalized_url, details)
+                details["existence_source"] = "network"
+            details["existence_cached"] = details["existence_source"] != "network"
+            details["verification_time"] = existence[2]
+            details["validation_steps"].append({"step": "existence", "passed": existence[0], "message": existence[1]})
+            
+            if not existence[0]:
+                return False, details
+        
+        return True, details
+    
+    @staticmethod
+    def _copy_details(details: Dict, original_url: str) -> Dict:
+        """Copy memoized details so callers can modify them without affecting the cache."""
+        copied = dict(details)
+        copied["original_url"] = original_url
+        copied["validation_steps"] = [dict(step) for step in details["validation_steps"]]
+        copied["warnings"] = list(details["warnings"])
+        return copied
+    
+    def _validate_structure(self, normalized_url: str) -> Tuple[bool, Dict]:
+        """Run the format, structure and provider checks for a normalized URL."""
         # Dictionary to hold validation details
         details = {
-            "original_url": repo_url,
+            "original_url": normalized_url,
             "normalized_url": normalized_url,
             "validation_steps": [],
             "provider": None,
+            "hostname": None,
             "url_type": None,
             "username": None,
             "repo_name": None,
             "warnings": []
         }
         
+        # Parse HTTP(S) URLs once and share the result with every check below
+        parsed = None
+        if normalized_url.startswith(('http://', 'https://')):
+            try:
+                parsed = urllib.parse.urlparse(normalized_url)
+            except ValueError:
+                parsed = None
+        
         # Check for basic URL format first
-        basic_check = self._check_basic_format(normalized_url)
+        basic_check = self._check_basic_format(normalized_url, parsed)
         details["validation_steps"].append({"step": "basic_format", "passed": basic_check[0], "message": basic_check[1]})
         
         if not basic_check[0]:
@@ -94,7 +338,7 @@ class RepositoryValidator:
         # Check URL structure according to protocol type
         if normalized_url.startswith(('http://', 'https://')):
             details["url_type"] = "http"
-            structure_check = self._check_http_url_structure(normalized_url)
+            structure_check = self._check_http_url_structure(normalized_url, parsed)
         elif normalized_url.startswith('git@'):
             details["url_type"] = "ssh"
             structure_check = self._check_ssh_url_structure(normalized_url)
@@ -110,7 +354,7 @@ class RepositoryValidator:
             return False, details
         
         # Extract provider, username, and repository
-        provider_info = self._extract_provider_info(normalized_url, details["url_type"])
+        provider_info = self._extract_provider_info(normalized_url, details["url_type"], parsed)
         
         if not provider_info[0]:
             details["validation_steps"].append({"step": "provider_extraction", "passed": False, "message": provider_info[1]})
@@ -123,14 +367,6 @@ class RepositoryValidator:
         if normalized_url.startswith('http://'):
             details["warnings"].append("Using insecure HTTP protocol instead of HTTPS")
         
-        # Verify repository existence if requested
-        if verify_existence:
-            existence_check = self._verify_repository_existence(normalized_url, details)
-            details["validation_steps"].append({"step": "existence", "passed": existence_check[0], "message": existence_check[1]})
-            
-            if not existence_check[0]:
-                return False, details
-        
         return True, details
     
     def get_repository_info(self, repo_url: str, verify_existence: bool = True) -> Dict:
@@ -162,44 +398,74 @@ class RepositoryValidator:
             "url_type": details["url_type"],
             "clone_url": self._get_preferred_clone_url(details),
             "web_url": self._get_web_url(details),
-            "api_url": self._get_api_url(details) if self._supports_api(details["provider"]) else None,
+            "api_url": self._get_api_url(details) if self._supports_api(details["hostname"]) else None,
             "warnings": details["warnings"]
         }
         
         return result
     
-    def validate_many(self, repo_urls: List[str], verify_existence: bool = False) -> Dict[str, Dict]:
+    def validate_many(self, repo_urls: List[str], verify_existence: bool = False,
+                      max_workers: Optional[int] = None, per_host_limit: int = 4) -> Dict[str, Dict]:
         """
         Validate multiple repository URLs at once.
         
+        When verifying existence the URLs are checked concurrently by a bounded
+        worker pool, with at most ``per_host_limit`` checks in flight against any
+        single host, so one slow or dead host does not hold up the rest.
+        
         Args:
             repo_urls: List of repository URLs to validate
             verify_existence: Whether to verify if the repositories exist
+            max_workers: Maximum number of concurrent checks. Defaults to 16 when
+                verifying existence; 1 validates the URLs sequentially
+            per_host_limit: Maximum number of concurrent checks against one host (at least 1)
             
         Returns:
-            Dictionary mapping each URL to its validation result
+            Dictionary mapping each URL to its validation result, in input order.
+            Verified entries include ``details["verification_time"]`` in seconds.
         """
-        results = {}
-        for url in repo_urls:
-            is_valid, details = self.validate_repo_url(url, verify_existence=verify_existence)
-            results[url] = {
-                "valid": is_valid,
-                "details": details
-            }
+        if max_workers is None:
+            max_workers = 16 if verify_existence else 1
+        
+        if max_workers <= 1 or len(repo_urls) <= 1:
+            results = {}
+            for url in repo_urls:
+                is_valid, details = self.validate_repo_url(url, verify_existence=verify_existence)
+                results[url] = {
+                    "valid": is_valid,
+                    "details": details
+                }
+            return results
+        
+        # Pre-fill so the results keep the input order regardless of completion order
+        results = {url: None for url in repo_urls}
+        scheduler = HostScheduler(results, per_host_limit)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            check = functools.partial(self.validate_repo_url, verify_existence=verify_existence)
+            for url, future in scheduler.run(executor, check, max_workers):
+                try:
+                    is_valid, details = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error validating {url}: {str(e)}")
+                    is_valid, details = False, {"original_url": url, "error": str(e)}
+                results[url] = {
+                    "valid": is_valid,
+                    "details": details
+                }
         return results
     
-    def _check_basic_format(self, url: str) -> Tuple[bool, str]:
+    def _check_basic_format(self, url: str, parsed: Optional[urllib.parse.ParseResult] = None) -> Tuple[bool, str]:
         """Check if the URL has basic valid format."""
         if not url:
             return False, "URL is empty"
         
         valid_prefixes = ('http://', 'https://', 'git@', 'git://')
-        if not any(url.startswith(prefix) for prefix in valid_prefixes):
+        if not url.startswith(valid_prefixes):
             return False, "URL must start with http://, https://, git@, or git://"
         
         if url.startswith(('http://', 'https://')):
             try:
-                result = urllib.parse.urlparse(url)
+                result = parsed if parsed is not None else urllib.parse.urlparse(url)
                 if not all([result.scheme, result.netloc]):
                     return False, "URL is missing scheme or host"
             except Exception as e:
@@ -207,34 +473,30 @@ class RepositoryValidator:
         
         return True, "Basic format is valid"
     
-    def _check_http_url_structure(self, url: str) -> Tuple[bool, str]:
+    def _check_http_url_structure(self, url: str, parsed: Optional[urllib.parse.ParseResult] = None) -> Tuple[bool, str]:
         """Check if HTTP(S) URL has valid structure for a Git repository."""
-        # Generic pattern for other Git hosts
-        generic = r'^https?://[^/]+/[^/]+/[^/]+(/.*)?$'
-        
-        # Check against known patterns first
-        parsed = urllib.parse.urlparse(url)
+        if parsed is None:
+            parsed = urllib.parse.urlparse(url)
         hostname = parsed.netloc.lower()
         
-        if hostname in self.provider_patterns:
-            if re.match(self.provider_patterns[hostname], url):
+        # Check against known patterns first
+        provider = self.registry.get(hostname)
+        if provider is not None:
+            if provider.url_pattern.match(url):
                 return True, f"Valid {hostname} repository URL format"
             else:
                 return False, f"Invalid {hostname} repository URL format"
         
         # Fall back to generic pattern
-        if re.match(generic, url):
+        if GENERIC_HTTP_PATTERN.match(url):
             return True, "Valid generic repository URL format"
         else:
             return False, "URL doesn't match expected repository path format"
     
     def _check_ssh_url_structure(self, url: str) -> Tuple[bool, str]:
         """Check if SSH URL has valid structure for a Git repository."""
-        # Pattern for SSH format - git@domain:user/repo.git
-        ssh_pattern = r'^git@([^:]+):([^/]+)/([^/]+)\.git$'
-        ssh_pattern_no_git = r'^git@([^:]+):([^/]+)/([^/]+)$'
-        
-        if re.match(ssh_pattern, url) or re.match(ssh_pattern_no_git, url):
+        # Pattern for SSH format - git@domain:user/repo(.git)
+        if SSH_STRUCTURE_PATTERN.match(url):
             return True, "Valid SSH repository URL format"
         else:
             return False, "Invalid SSH repository URL format"
@@ -242,74 +504,48 @@ class RepositoryValidator:
     def _check_git_protocol_structure(self, url: str) -> Tuple[bool, str]:
         """Check if Git protocol URL has valid structure."""
         # Pattern for git:// protocol
-        git_pattern = r'^git://([^/]+)/([^/]+)/([^/]+)(\.git)?$'
-        
-        if re.match(git_pattern, url):
+        if GIT_STRUCTURE_PATTERN.match(url):
             return True, "Valid Git protocol URL format"
         else:
             return False, "Invalid Git protocol URL format"
     
-    def _extract_provider_info(self, url: str, url_type: str) -> Tuple[bool, Dict]:
-        """Extract provider, username and repository name from URL."""
+    def _extract_provider_info(self, url: str, url_type: str,
+                               parsed: Optional[urllib.parse.ParseResult] = None) -> Tuple[bool, Dict]:
+        """Extract provider, hostname, username and repository name from URL."""
         info = {
             "provider": None,
+            "hostname": None,
             "username": None,
             "repo_name": None
         }
         
         try:
             if url_type == "http":
-                parsed = urllib.parse.urlparse(url)
+                if parsed is None:
+                    parsed = urllib.parse.urlparse(url)
                 hostname = parsed.netloc.lower()
-                
-                # Handle different providers
                 path_parts = parsed.path.strip('/').split('/')
                 
-                if hostname == "github.com":
-                    info["provider"] = "GitHub"
-                    if len(path_parts) >= 2:
-                        info["username"] = path_parts[0]
-                        # Remove .git extension if present
-                        info["repo_name"] = path_parts[1].replace('.git', '')
-                    
-                elif hostname == "gitlab.com":
-                    info["provider"] = "GitLab"
-                    if len(path_parts) >= 2:
-                        info["username"] = path_parts[0]
-                        info["repo_name"] = path_parts[1].replace('.git', '')
-                    
-                elif hostname == "bitbucket.org":
-                    info["provider"] = "Bitbucket"
-                    if len(path_parts) >= 2:
-                        info["username"] = path_parts[0]
-                        info["repo_name"] = path_parts[1].replace('.git', '')
-                    
-                elif hostname == "dev.azure.com":
-                    info["provider"] = "Azure DevOps"
-                    if len(path_parts) >= 3:
-                        info["username"] = path_parts[0]
-                        info["repo_name"] = path_parts[2].replace('.git', '')
+                # Known providers know where owner and repository sit in the path
+                provider = self.registry.get(hostname)
+                info["hostname"] = hostname
+                info["provider"] = provider.name if provider else hostname
+                if provider is not None:
+                    extracted = provider.extract(path_parts)
+                    if extracted:
+                        info.update(extracted)
+                elif len(path_parts) >= 2:
+                    info["username"] = path_parts[0]
+                    # Remove .git extension if present
+                    info["repo_name"] = path_parts[1].replace('.git', '')
                     
-                else:
-                    info["provider"] = hostname
-                    if len(path_parts) >= 2:
-                        info["username"] = path_parts[0]
-                        info["repo_name"] = path_parts[1].replace('.git', '')
-                    
-            elif url_type == "ssh":
-                # git@github.com:username/repo.git format
-                match = re.match(r'^git@([^:]+):([^/]+)/([^/\.]+)(\.git)?$', url)
-                if match:
-                    hostname, username, repo_name, _ = match.groups()
-                    info["provider"] = self._hostname_to_provider(hostname)
-                    info["username"] = username
-                    info["repo_name"] = repo_name
-                    
-            elif url_type == "git":
-                # git://github.com/username/repo.git format
-                match = re.match(r'^git://([^/]+)/([^/]+)/([^/\.]+)(\.git)?$', url)
+            elif url_type in ("ssh", "git"):
+                # git@github.com:username/repo.git or git://github.com/username/repo.git format
+                pattern = SSH_EXTRACT_PATTERN if url_type == "ssh" else GIT_EXTRACT_PATTERN
+                match = pattern.match(url)
                 if match:
                     hostname, username, repo_name, _ = match.groups()
+                    info["hostname"] = hostname.lower()
                     info["provider"] = self._hostname_to_provider(hostname)
                     info["username"] = username
                     info["repo_name"] = repo_name
@@ -326,10 +562,53 @@ class RepositoryValidator:
     
     def _hostname_to_provider(self, hostname: str) -> str:
         """Convert hostname to provider name."""
-        return self.provider_map.get(hostname, hostname)
+        return self.registry.provider_name(hostname)
+    
+    def _get_provider(self, details: Dict):
+        """Get the registered provider for validated repository details, if any."""
+        return self.registry.get(details.get("hostname"))
+    
+    def _lookup_existence_store(self, url: str) -> Optional[Tuple[bool, str, float]]:
+        """Get a fresh existence result from the persistent store, if one is configured."""
+        if self.existence_store is None:
+            return None
+        record = self.existence_store.get(url)
+        if record is None:
+            return None
+        existence = (record["exists"], record["message"], 0.0)
+        self._existence_cache.put(url, existence)
+        return existence
+    
+    @staticmethod
+    def _is_definitive(url_type: str, exists: bool, message: str, status_code: Optional[int]) -> bool:
+        """Check whether an existence result is a definite answer rather than a transient failure."""
+        if status_code is None:
+            return False
+        if url_type == "http":
+            return status_code in DEFINITIVE_HTTP_STATUSES
+        # git ls-remote exits with 128 for missing repositories as well as for
+        # DNS, network and auth failures, so only an explicit "not found" counts
+        return exists or bool(GIT_NOT_FOUND_PATTERN.search(message))
     
-    def _verify_repository_existence(self, url: str, details: Dict) -> Tuple[bool, str]:
-        """Verify if the repository actually exists."""
+    def _check_existence(self, url: str, details: Dict) -> Tuple[bool, str, float]:
+        """Verify existence over the network, remembering only definitive results."""
+        started = time.perf_counter()
+        exists, message, status_code = self._verify_repository_existence(url, details)
+        existence = (exists, message, time.perf_counter() - started)
+        if self._is_definitive(details["url_type"], exists, message, status_code):
+            self._existence_cache.put(url, existence)
+            if self.existence_store is not None:
+                self.existence_store.record(url, exists, status_code, message)
+        return existence
+    
+    def _verify_repository_existence(self, url: str, details: Dict) -> Tuple[bool, str, Optional[int]]:
+        """
+        Verify if the repository actually exists.
+        
+        Returns:
+            Tuple of (exists, message, status_code). The status code is the HTTP
+            status or the ``git ls-remote`` exit code, and None if the check failed
+        """
         provider = details.get("provider")
         username = details.get("username")
         repo_name = details.get("repo_name")
@@ -337,15 +616,15 @@ class RepositoryValidator:
         if details["url_type"] == "http":
             try:
                 # For public repos, we can check if the URL is accessible
-                response = requests.head(url, allow_redirects=True, timeout=5)
+                response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
                 if response.status_code == 200:
-                    return True, "Repository exists and is accessible"
+                    return True, "Repository exists and is accessible", response.status_code
                 elif response.status_code == 404:
-                    return False, "Repository not found (404)"
+                    return False, "Repository not found (404)", response.status_code
                 else:
-                    return False, f"Repository check failed with status code: {response.status_code}"
+                    return False, f"Repository check failed with status code: {response.status_code}", response.status_code
             except RequestException as e:
-                return False, f"Failed to verify repository: {str(e)}"
+                return False, f"Failed to verify repository: {str(e)}", None
         else:
             # For SSH/Git protocol URLs, we can try a git ls-remote
             try:
@@ -353,73 +632,77 @@ class RepositoryValidator:
                     ["git", "ls-remote", url],
                     capture_output=True,
                     text=True,
-                    timeout=5
+                    timeout=self.timeout
                 )
                 
                 if result.returncode == 0:
-                    return True, "Repository exists and is accessible"
+                    return True, "Repository exists and is accessible", result.returncode
                 else:
-                    return False, f"Repository not accessible: {result.stderr.strip()}"
+                    return False, f"Repository not accessible: {result.stderr.strip()}", result.returncode
             except subprocess.SubprocessError as e:
-                return False, f"Failed to verify repository: {str(e)}"
+                return False, f"Failed to verify repository: {str(e)}", None
     
     def _get_preferred_clone_url(self, details: Dict) -> str:
         """Get the preferred URL for cloning (HTTPS)."""
-        provider = details["provider"].lower()
-        username = details["username"]
-        repo_name = details["repo_name"]
-        
-        if "github" in provider:
-            return f"https://github.com/{username}/{repo_name}.git"
-        elif "gitlab" in provider:
-            return f"https://gitlab.com/{username}/{repo_name}.git"
-        elif "bitbucket" in provider:
-            return f"https://bitbucket.org/{username}/{repo_name}.git"
-        else:
-            # If we can't determine a specific format, return the original URL
-            return details["normalized_url"]
+        provider = self._get_provider(details)
+        if provider is not None:
+            clone_url = provider.build_url("clone_url", details["username"], details["repo_name"])
+            if clone_url:
+                return clone_url
+        # If we can't determine a specific format, return the original URL
+        return details["normalized_url"]
     
     def _get_web_url(self, details: Dict) -> str:
         """Get the web URL for the repository."""
-        provider = details["provider"].lower()
         username = details["username"]
         repo_name = details["repo_name"]
         
-        if "github" in provider:
-            return f"https://github.com/{username}/{repo_name}"
-        elif "gitlab" in provider:
-            return f"https://gitlab.com/{username}/{repo_name}"
-        elif "bitbucket" in provider:
-            return f"https://bitbucket.org/{username}/{repo_name}"
+        provider = self._get_provider(details)
+        if provider is not None:
+            web_url = provider.build_url("web_url", username, repo_name)
+            if web_url:
+                return web_url
+        
+        # Use a generic approach if provider is unknown
+        parts = details["normalized_url"].split("://")
+        if len(parts) > 1 and parts[0] in ["http", "https"]:
+            return details["normalized_url"].rstrip(".git")
+        elif "url_type" in details and details["url_type"] == "ssh":
+            return f"https://{details['hostname']}/{username}/{repo_name}"
         else:
-            # Use a generic approach if provider is unknown
-            parts = details["normalized_url"].split("://")
-            if len(parts) > 1 and parts[0] in ["http", "https"]:
-                return details["normalized_url"].rstrip(".git")
-            elif "url_type" in details and details["url_type"] == "ssh":
-                hostname = details["normalized_url"].split("@")[1].split(":")[0]
-                return f"https://{hostname}/{username}/{repo_name}"
-            else:
-                return None
+            return None
     
     def _get_api_url(self, details: Dict) -> Optional[str]:
         """Get the API URL for the repository."""
-        provider = details["provider"].lower()
-        username = details["username"]
-        repo_name = details["repo_name"]
+        provider = self._get_provider(details)
+        if provider is None:
+            return None
+        return provider.build_url("api_url", details["username"], details["repo_name"])
+    
+    def get_archive_url(self, repo_url: str, ref: Optional[str] = None) -> Optional[str]:
+        """
+        Get the URL of a .tar.gz archive of the repository at a ref.
         
-        if "github" in provider:
-            return f"https://api.github.com/repos/{username}/{repo_name}"
-        elif "gitlab" in provider:
-            return f"https://gitlab.com/api/v4/projects/{username}%2F{repo_name}"
-        elif "bitbucket" in provider:
-            return f"https://api.bitbucket.org/2.0/repositories/{username}/{repo_name}"
-        else:
+        Args:
+            repo_url: The repository URL
+            ref: Branch, tag or commit. Defaults to the remote HEAD
+            
+        Returns:
+            The archive download URL, or None if the URL is invalid or the
+            provider offers no archive downloads
+        """
+        is_valid, details = self.validate_repo_url(repo_url)
+        if not is_valid:
+            return None
+        provider = self._get_provider(details)
+        if provider is None:
             return None
+        return provider.build_url("archive_url", details["username"], details["repo_name"], ref or "HEAD")
     
-    def _supports_api(self, provider: str) -> bool:
-        """Check if we support API for this provider."""
-        return provider in self.api_supported_providers
+    def _supports_api(self, hostname: str) -> bool:
+        """Check if we support API for the provider serving this hostname."""
+        registered = self.registry.get(hostname)
+        return registered is not None and "api_url" in registered.templates
     
     def get_clone_commands(self, repo_url: str, protocol: str = "https") -> Dict:
         """
@@ -442,34 +725,26 @@ class RepositoryValidator:
         
         username = details["username"]
         repo_name = details["repo_name"]
-        provider = details["provider"].lower()
+        hostname = details["hostname"]
+        provider = self._get_provider(details)
         
         result = {"valid": True}
         
         # HTTPS clone command
-        if "github" in provider:
-            result["https"] = f"git clone https://github.com/{username}/{repo_name}.git"
-            result["ssh"] = f"git clone git@github.com:{username}/{repo_name}.git"
-        elif "gitlab" in provider:
-            result["https"] = f"git clone https://gitlab.com/{username}/{repo_name}.git"
-            result["ssh"] = f"git clone git@gitlab.com:{username}/{repo_name}.git"
-        elif "bitbucket" in provider:
-            result["https"] = f"git clone https://bitbucket.org/{username}/{repo_name}.git"
-            result["ssh"] = f"git clone git@bitbucket.org:{username}/{repo_name}.git"
+        if provider is not None and "clone_url" in provider.templates and "ssh_url" in provider.templates:
+            result["https"] = f"git clone {provider.build_url('clone_url', username, repo_name)}"
+            result["ssh"] = f"git clone {provider.build_url('ssh_url', username, repo_name)}"
         else:
             # Generic approach
             if details["url_type"] == "http":
                 result["https"] = f"git clone {details['normalized_url']}"
                 
                 # Try to construct SSH URL
-                parsed = urllib.parse.urlparse(details["normalized_url"])
-                hostname = parsed.netloc
                 result["ssh"] = f"git clone git@{hostname}:{username}/{repo_name}.git"
             elif details["url_type"] == "ssh":
                 result["ssh"] = f"git clone {details['normalized_url']}"
                 
                 # Try to construct HTTPS URL
-                hostname = details["normalized_url"].split("@")[1].split(":")[0]
                 result["https"] = f"git clone https://{hostname}/{username}/{repo_name}.git"
             else:
                 result["https"] = f"git clone {details['normalized_url']}"
@@ -0,0 +1,133 @@
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+NO_CHANGES = "NO_CHANGES"
+CHANGES_REQUESTED = "CHANGES_REQUESTED"
+
+VERDICT_PATTERN = re.compile(r'^\W*VERDICT\W*:\W*(NO_CHANGES|CHANGES_REQUESTED)\b', re.IGNORECASE | re.MULTILINE)
+
+
+def parse_verdict(review_comments: Optional[str]) -> Optional[str]:
+    """
+    Get the verdict from the reviewer's output.
+
+    Returns:
+        NO_CHANGES, CHANGES_REQUESTED, or None if the review has no verdict line
+        (the last verdict line wins)
+    """
+    if not review_comments:
+        return None
+    matches = VERDICT_PATTERN.findall(review_comments)
+    return matches[-1].upper() if matches else None
+
+
+class ReviewGate:
+    """
+    Routes the pipeline on the reviewer's verdict.
+
+    When the review ends with ``VERDICT: NO_CHANGES`` the refactor stage is
+    skipped: its before_agent_callback copies ``generated_code`` into
+    ``refactored_code`` and answers with it instead of calling the model. A
+    review without a verdict is treated as requesting changes. The gate counts
+    skipped and executed refactors and times the model calls of the executed
+    ones, to estimate the wall time saved by the skips. Refactors answered by
+    a model callback installed before the gate (e.g. a StageCache hit) made no
+    model call and are not counted as runs.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.skips = 0
+        self.refactor_seconds = 0.0
+        self._started: Dict[str, float] = {}
+        self._model_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, refactorer: LlmAgent, source_key: str = "generated_code",
+               review_key: str = "review_comments"):
+        """
+        Gate a refactor stage on the review verdict.
+
+        Attach the gate after any model callbacks that can answer instead of
+        the model (such as StageCache.attach), so that it wraps them and only
+        times real model calls.
+
+        Args:
+            refactorer: The refactor stage; its output_key receives the copied code on a skip
+            source_key: State key holding the code to pass through unchanged
+            review_key: State key holding the reviewer's output
+        """
+        output_key = refactorer.output_key
+
+        def before_agent(callback_context: CallbackContext) -> Optional[types.Content]:
+            verdict = parse_verdict(callback_context.state.get(review_key)) or CHANGES_REQUESTED
+            callback_context.state["review_verdict"] = verdict
+            if verdict != NO_CHANGES:
+                return None
+
+            code = callback_context.state.get(source_key) or ""
+            if output_key:
+                callback_context.state[output_key] = code
+            with self._lock:
+                self.skips += 1
+            return types.Content(role="model", parts=[types.Part(text=code)])
+
+        inner_before_model = refactorer.before_model_callback
+        inner_after_model = refactorer.after_model_callback
+
+        def before_model(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+            if inner_before_model is not None:
+                response = inner_before_model(callback_context, llm_request)
+                if response is not None:
+                    # Answered without a model call (e.g. from the stage cache): not timed
+                    return response
+            with self._lock:
+                self._started[callback_context.invocation_id] = time.perf_counter()
+            return None
+
+        def after_model(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+            if not llm_response.partial:
+                with self._lock:
+                    started = self._started.pop(callback_context.invocation_id, None)
+                    if started is not None:
+                        elapsed = time.perf_counter() - started
+                        invocation_id = callback_context.invocation_id
+                        self._model_seconds[invocation_id] = self._model_seconds.get(invocation_id, 0.0) + elapsed
+            if inner_after_model is not None:
+                return inner_after_model(callback_context, llm_response)
+            return None
+
+        def after_agent(callback_context: CallbackContext) -> Optional[types.Content]:
+            with self._lock:
+                self._started.pop(callback_context.invocation_id, None)
+                seconds = self._model_seconds.pop(callback_context.invocation_id, None)
+                if seconds is not None:
+                    self.runs += 1
+                    self.refactor_seconds += seconds
+            return None
+
+        refactorer.before_agent_callback = before_agent
+        refactorer.after_agent_callback = after_agent
+        refactorer.before_model_callback = before_model
+        refactorer.after_model_callback = after_model
+
+    def stats(self) -> Dict[str, Any]:
+        """Skipped and executed refactors, and the estimated wall time saved by skipping."""
+        with self._lock:
+            total = self.runs + self.skips
+            average = self.refactor_seconds / self.runs if self.runs else 0.0
+            return {
+                "refactors_run": self.runs,
+                "refactors_skipped": self.skips,
+                "skip_ratio": self.skips / total if total else 0.0,
+                "average_refactor_seconds": average,
+                "estimated_seconds_saved": average * self.skips
+            }
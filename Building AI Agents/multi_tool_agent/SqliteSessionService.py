@@ -0,0 +1,351 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Dict, Optional
+
+from google.adk.events.event import Event
+from google.adk.sessions.base_session_service import (
+    BaseSessionService,
+    GetSessionConfig,
+    ListEventsResponse,
+    ListSessionsResponse,
+)
+from google.adk.sessions.session import Session
+from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_TTL = 24 * 3600
+DEFAULT_MAX_SESSIONS = 10000
+
+
+def _pack(value: Any, level: int) -> bytes:
+    """Serialize a JSON-compatible value to compact, compressed bytes."""
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), level)
+
+
+def _unpack(data: Optional[bytes]) -> Any:
+    return json.loads(zlib.decompress(data).decode("utf-8")) if data else {}
+
+
+class SqliteSessionService(BaseSessionService):
+    """
+    A durable ADK session service backed by a single SQLite file.
+
+    Sessions are not kept in memory: each one is restored from the database
+    when it is accessed, so a long-running runner stays flat however many
+    sessions it has served. State and events are stored as compressed JSON.
+    Sessions expire ``ttl`` seconds after their last update, and the oldest
+    sessions are evicted once there are more than ``max_sessions``. App and
+    user state (``app:`` / ``user:`` keys) is stored once and merged into
+    every session on access, as InMemorySessionService does.
+
+    The methods are synchronous, like the BaseSessionService interface the
+    runner calls them through. To keep database I/O off the event loop,
+    append_event (called by the runner for every event) only updates the
+    session it is given and queues the write for a background thread; every
+    other method first waits for the queued writes, so reads always see
+    them. The methods are serialized by a lock, so acall_agent runs
+    create_session, get_session and delete_session in worker threads. Only
+    the runner's own get_session at the start of each request still runs on
+    the event loop.
+    """
+
+    # The methods may be called from several threads at once (see acall_agent)
+    thread_safe = True
+
+    def __init__(self, path: str = "pipeline_sessions.db", ttl: Optional[float] = DEFAULT_SESSION_TTL,
+                 max_sessions: Optional[int] = DEFAULT_MAX_SESSIONS, compress_level: int = 6,
+                 evict_every: int = 100, write_behind: bool = True):
+        """
+        Open (and create if needed) the session database.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+            ttl: Seconds after its last update that a session expires (None: never)
+            max_sessions: Maximum number of sessions kept (None: unlimited)
+            compress_level: zlib compression level for stored state and events
+            evict_every: Run expiry and eviction after this many new sessions
+            write_behind: Store events from a background thread instead of in append_event
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.compress_level = compress_level
+        self.evict_every = max(1, evict_every)
+        self.write_behind = write_behind
+        self._created = 0
+        self._lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    app_name TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    state BLOB,
+                    last_update_time REAL NOT NULL,
+                    PRIMARY KEY (app_name, user_id, session_id)
+                );
+                CREATE INDEX IF NOT EXISTS sessions_by_update ON sessions (last_update_time);
+                CREATE TABLE IF NOT EXISTS events (
+                    app_name TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    timestamp REAL NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (app_name, user_id, session_id, seq)
+                );
+                CREATE TABLE IF NOT EXISTS app_states (
+                    app_name TEXT PRIMARY KEY,
+                    state BLOB
+                );
+                CREATE TABLE IF NOT EXISTS user_states (
+                    app_name TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    state BLOB,
+                    PRIMARY KEY (app_name, user_id)
+                );
+                """
+            )
+
+    def _expired(self, last_update_time: float) -> bool:
+        return self.ttl is not None and time.time() - last_update_time > self.ttl
+
+    def _merged_state(self, app_name: str, user_id: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the app and user state (with their prefixes) to a session's own state."""
+        row = self._conn.execute("SELECT state FROM app_states WHERE app_name = ?", (app_name,)).fetchone()
+        for key, value in _unpack(row[0] if row else None).items():
+            state[State.APP_PREFIX + key] = value
+        row = self._conn.execute(
+            "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+        ).fetchone()
+        for key, value in _unpack(row[0] if row else None).items():
+            state[State.USER_PREFIX + key] = value
+        return state
+
+    def _delete(self, app_name: str, user_id: str, session_id: str):
+        key = (app_name, user_id, session_id)
+        self._conn.execute("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+        self._conn.execute("DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+
+    def create_session(self, *, app_name: str, user_id: str, state: Optional[Dict[str, Any]] = None,
+                       session_id: Optional[str] = None) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        self.flush()
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (app_name, user_id, session_id, state, last_update_time) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (app_name, user_id, session_id, _pack(state or {}, self.compress_level), now)
+            )
+            self._conn.execute("DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                               (app_name, user_id, session_id))
+            merged = self._merged_state(app_name, user_id, dict(state or {}))
+            self._created += 1
+            due = self._created % self.evict_every == 0
+        if due:
+            self.evict()
+        return Session(app_name=app_name, user_id=user_id, id=session_id, state=merged,
+                       last_update_time=now)
+
+    def get_session(self, *, app_name: str, user_id: str, session_id: str,
+                    config: Optional[GetSessionConfig] = None) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, last_update_time FROM sessions "
+                "WHERE app_name = ? AND user_id = ? AND session_id = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1]):
+                with self._conn:
+                    self._delete(*key)
+                return None
+
+            where = "app_name = ? AND user_id = ? AND session_id = ?"
+            params = list(key)
+            if config and config.after_timestamp:
+                where += " AND timestamp >= ?"
+                params.append(config.after_timestamp)
+            if config and config.num_recent_events:
+                query = (f"SELECT data FROM (SELECT data, seq FROM events WHERE {where} "
+                         f"ORDER BY seq DESC LIMIT ?) ORDER BY seq")
+                params.append(config.num_recent_events)
+            else:
+                query = f"SELECT data FROM events WHERE {where} ORDER BY seq"
+            events = [Event.model_validate_json(zlib.decompress(data))
+                      for (data,) in self._conn.execute(query, params)]
+            state = self._merged_state(app_name, user_id, _unpack(row[0]))
+        return Session(app_name=app_name, user_id=user_id, id=session_id, state=state,
+                       events=events, last_update_time=row[1])
+
+    def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        self.flush()
+        cutoff = time.time() - self.ttl if self.ttl is not None else float("-inf")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT session_id, last_update_time FROM sessions "
+                "WHERE app_name = ? AND user_id = ? AND last_update_time >= ?",
+                (app_name, user_id, cutoff)
+            ).fetchall()
+        return ListSessionsResponse(sessions=[
+            Session(app_name=app_name, user_id=user_id, id=session_id, state={}, last_update_time=updated)
+            for session_id, updated in rows
+        ])
+
+    def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self.flush()
+        with self._lock, self._conn:
+            self._delete(app_name, user_id, session_id)
+
+    def list_events(self, *, app_name: str, user_id: str, session_id: str) -> ListEventsResponse:
+        session = self.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        return ListEventsResponse(events=session.events if session else [])
+
+    def append_event(self, session: Session, event: Event) -> Event:
+        # Update the session object the runner holds
+        super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+        if event.partial:
+            return event
+
+        if not self.write_behind:
+            self._store_event(session.app_name, session.user_id, session.id, event)
+            return event
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="session-writer", daemon=True)
+                self._writer.start()
+        self._pending.put((session.app_name, session.user_id, session.id, event))
+        return event
+
+    def _write_loop(self):
+        while True:
+            item = self._pending.get()
+            try:
+                if item is None:
+                    return
+                self._store_event(*item)
+            except Exception:
+                logger.exception(f"Failed to store an event of session {item[2]}")
+            finally:
+                self._pending.task_done()
+
+    def _store_event(self, app_name: str, user_id: str, session_id: str, event: Event):
+        """Store an event and apply its state delta to the stored session, app and user state."""
+        key = (app_name, user_id, session_id)
+        delta = event.actions.state_delta if event.actions and event.actions.state_delta else {}
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT state FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?", key
+            ).fetchone()
+            if row is None:
+                return
+
+            state = _unpack(row[0])
+            app_delta, user_delta = {}, {}
+            for name, value in delta.items():
+                if name.startswith(State.APP_PREFIX):
+                    app_delta[name[len(State.APP_PREFIX):]] = value
+                elif name.startswith(State.USER_PREFIX):
+                    user_delta[name[len(State.USER_PREFIX):]] = value
+                elif not name.startswith(State.TEMP_PREFIX):
+                    state[name] = value
+            if app_delta:
+                stored = self._conn.execute(
+                    "SELECT state FROM app_states WHERE app_name = ?", (app_name,)
+                ).fetchone()
+                merged = {**_unpack(stored[0] if stored else None), **app_delta}
+                self._conn.execute("INSERT OR REPLACE INTO app_states (app_name, state) VALUES (?, ?)",
+                                   (app_name, _pack(merged, self.compress_level)))
+            if user_delta:
+                stored = self._conn.execute(
+                    "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+                ).fetchone()
+                merged = {**_unpack(stored[0] if stored else None), **user_delta}
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO user_states (app_name, user_id, state) VALUES (?, ?, ?)",
+                    (app_name, user_id, _pack(merged, self.compress_level))
+                )
+
+            seq = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key
+            ).fetchone()[0]
+            self._conn.execute(
+                "INSERT INTO events (app_name, user_id, session_id, seq, timestamp, data) VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, seq, event.timestamp,
+                 zlib.compress(event.model_dump_json(exclude_none=True).encode("utf-8"), self.compress_level))
+            )
+            self._conn.execute(
+                "UPDATE sessions SET state = ?, last_update_time = ? "
+                "WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (_pack(state, self.compress_level), event.timestamp, *key)
+            )
+
+    def flush(self):
+        """Wait until the events queued by append_event are stored."""
+        if self._writer is not None:
+            self._pending.join()
+
+    def evict(self) -> int:
+        """
+        Delete expired sessions, then the least recently updated ones beyond max_sessions.
+
+        Returns:
+            Number of sessions deleted
+        """
+        deleted = []
+        self.flush()
+        with self._lock, self._conn:
+            if self.ttl is not None:
+                deleted += self._conn.execute(
+                    "SELECT app_name, user_id, session_id FROM sessions WHERE last_update_time < ?",
+                    (time.time() - self.ttl,)
+                ).fetchall()
+            if self.max_sessions is not None:
+                count = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - len(deleted)
+                if count > self.max_sessions:
+                    deleted += self._conn.execute(
+                        "SELECT app_name, user_id, session_id FROM sessions "
+                        "WHERE last_update_time >= ? ORDER BY last_update_time LIMIT ?",
+                        (time.time() - self.ttl if self.ttl is not None else float("-inf"),
+                         count - self.max_sessions)
+                    ).fetchall()
+            for key in deleted:
+                self._delete(*key)
+        return len(deleted)
+
+    def stats(self) -> Dict[str, int]:
+        """Count the stored sessions and events and the size of the database."""
+        self.flush()
+        with self._lock:
+            sessions = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            events = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        return {"sessions": sessions, "events": events, "bytes": page_count * page_size}
+
+    def close(self):
+        """Store the queued events and close the database connection."""
+        if self._writer is not None:
+            self._pending.put(None)
+            self._writer.join()
+            self._writer = None
+        with self._lock:
+            self._conn.close()
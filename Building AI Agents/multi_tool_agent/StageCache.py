@@ -0,0 +1,112 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+
+class StageCache:
+    """
+    Memoizes the model output of pipeline stages.
+
+    Each stage's output is keyed on a hash of the stage's instruction, its
+    model and the session state keys it reads (plus the user's request for
+    stages that read it). When a stage runs again with the same inputs, its
+    before_model_callback returns the cached response and the model call is
+    skipped. Hits and misses are counted per stage.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached stage outputs (least recently used are dropped)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(stage: str, instruction: str, model: str, inputs: Dict[str, Any]) -> str:
+        """Hash a stage's instruction, model and inputs into a cache key."""
+        payload = json.dumps([stage, instruction, model, inputs], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, stage: str, field: str):
+        with self._lock:
+            counts = self._stats.setdefault(stage, {"hits": 0, "misses": 0})
+            counts[field] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: str, content: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def attach(self, agent: LlmAgent, reads: Sequence[str] = (), reads_request: bool = False):
+        """
+        Memoize an agent's model output through its model callbacks.
+
+        Args:
+            agent: The pipeline stage
+            reads: Session state keys the stage reads (e.g. "generated_code")
+            reads_request: Whether the stage reads the user's request itself
+        """
+        model = agent.model if isinstance(agent.model, str) else agent.model.model
+
+        def stage_key(callback_context: CallbackContext) -> str:
+            inputs = {name: callback_context.state.get(name) for name in reads}
+            if reads_request:
+                content = callback_context.user_content
+                inputs["request"] = [part.text for part in content.parts] if content and content.parts else None
+            return self.make_key(agent.name, str(agent.instruction), model, inputs)
+
+        def before_model(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+            cached = self.get(stage_key(callback_context))
+            if cached is None:
+                self._count(agent.name, "misses")
+                return None
+            self._count(agent.name, "hits")
+            return LlmResponse(content=types.Content.model_validate(cached))
+
+        def after_model(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+            content = llm_response.content
+            # Only cache complete text answers, not partial chunks, errors or tool calls
+            if (llm_response.partial or llm_response.error_code or not content or not content.parts
+                    or any(part.function_call for part in content.parts)):
+                return None
+            self.put(stage_key(callback_context), content.model_dump(mode="json", exclude_none=True))
+            return None
+
+        agent.before_model_callback = before_model
+        agent.after_model_callback = after_model
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hits, misses and hit ratio per stage."""
+        with self._lock:
+            return {
+                stage: {**counts, "hit_ratio": counts["hits"] / max(1, counts["hits"] + counts["misses"])}
+                for stage, counts in self._stats.items()
+            }
+
+    def clear(self):
+        """Drop all cached outputs and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
@@ -0,0 +1,179 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+try:
+    from .RepositoryValidator import RepositoryValidator
+except ImportError:
+    from RepositoryValidator import RepositoryValidator
+
+# Validator used by each worker process, created once by the pool initializer
+_worker_validator = None
+
+
+def iter_urls(lines: Iterable[str]) -> Iterator[str]:
+    """Lazily yield URLs from lines of text, skipping blank lines and "#" comments."""
+    for line in lines:
+        url = line.strip()
+        if url and not url.startswith("#"):
+            yield url
+
+
+def compact_result(url: str, is_valid: bool, details: Dict) -> Dict[str, Any]:
+    """
+    Reduce a validation result to a flat record without the validation steps.
+
+    Args:
+        url: The URL as read from the input
+        is_valid: Whether the URL is valid
+        details: Details returned by RepositoryValidator.validate_repo_url
+
+    Returns:
+        Dictionary with url, valid, provider, hostname, username, repo_name,
+        url_type, plus error for invalid URLs and exists for verified ones
+    """
+    record = {
+        "url": url,
+        "valid": is_valid,
+        "provider": details.get("provider"),
+        "hostname": details.get("hostname"),
+        "username": details.get("username"),
+        "repo_name": details.get("repo_name"),
+        "url_type": details.get("url_type")
+    }
+    steps = details.get("validation_steps") or []
+    if not is_valid:
+        record["error"] = steps[-1]["message"] if steps else details.get("error")
+    if "existence_source" in details:
+        record["exists"] = steps[-1]["passed"]
+        record["existence_source"] = details["existence_source"]
+    return record
+
+
+def _init_worker(validator_options: Dict[str, Any]):
+    global _worker_validator
+    _worker_validator = RepositoryValidator(**validator_options)
+
+
+def _validate_batch(urls: List[str]) -> List[Dict[str, Any]]:
+    """Validate a batch of URLs in a worker process (parse-only)."""
+    records = []
+    for url in urls:
+        is_valid, details = _worker_validator.validate_repo_url(url)
+        records.append(compact_result(url, is_valid, details))
+    return records
+
+
+def stream_validate(urls: Iterable[str], verify_existence: bool = False, workers: Optional[int] = None,
+                    batch_size: int = 1000,
+                    validator_options: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Validate URLs from an iterable of any size, yielding compact records in input order.
+
+    Only a bounded number of URLs is held at any time, so memory stays flat
+    however long the input is. Parse-only validation is CPU bound and is spread
+    over worker processes in batches; existence checks are I/O bound and run on
+    a thread pool sharing one pooled validator.
+
+    Args:
+        urls: Repository URLs, consumed lazily
+        verify_existence: Whether to verify that the repositories exist
+        workers: Worker processes (parse-only) or threads (verify). Defaults to
+            the CPU count, or 16 threads when verifying
+        batch_size: URLs per batch sent to a worker process
+        validator_options: Keyword arguments for RepositoryValidator
+
+    Yields:
+        One record per URL (see compact_result)
+    """
+    validator_options = dict(validator_options or {})
+    validator_options.setdefault("log_level", logging.WARNING)
+
+    if verify_existence:
+        workers = workers or 16
+        validator = RepositoryValidator(**validator_options)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for url in urls:
+                pending.append((url, executor.submit(validator.validate_repo_url, url, True)))
+                if len(pending) >= workers * 4:
+                    url, future = pending.popleft()
+                    yield compact_result(url, *future.result())
+            while pending:
+                url, future = pending.popleft()
+                yield compact_result(url, *future.result())
+        validator.close()
+        return
+
+    workers = workers or os.cpu_count() or 1
+    urls = iter(urls)
+    if workers <= 1:
+        _init_worker(validator_options)
+        for url in urls:
+            is_valid, details = _worker_validator.validate_repo_url(url)
+            yield compact_result(url, is_valid, details)
+        return
+
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(validator_options,)) as executor:
+        while True:
+            batch = list(islice(urls, batch_size))
+            if batch:
+                pending.append(executor.submit(_validate_batch, batch))
+            # Keep every worker busy while holding at most two batches per worker
+            if pending and (not batch or len(pending) >= workers * 2):
+                yield from pending.popleft().result()
+            if not batch and not pending:
+                break
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate repository URLs from a file or stdin as JSONL.")
+    parser.add_argument("input", nargs="?", default="-", help="File with one URL per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", help="Write JSONL records to this file instead of stdout")
+    parser.add_argument("--verify", action="store_true", help="Verify that the repositories exist")
+    parser.add_argument("-w", "--workers", type=int, help="Worker processes (or threads with --verify)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="URLs per worker batch")
+    parser.add_argument("--providers-config", help="JSON/YAML file with extra Git providers")
+    parser.add_argument("--existence-store", help="SQLite file persisting existence results")
+    args = parser.parse_args(argv)
+
+    validator_options = {}
+    if args.providers_config:
+        validator_options["providers_config"] = args.providers_config
+    if args.verify and args.existence_store:
+        validator_options["existence_store"] = args.existence_store
+
+    source: TextIO = sys.stdin if args.input == "-" else open(args.input, "r")
+    out: TextIO = open(args.output, "w") if args.output else sys.stdout
+    started = time.perf_counter()
+    total = valid = 0
+    try:
+        records = stream_validate(iter_urls(source), verify_existence=args.verify, workers=args.workers,
+                                  batch_size=args.batch_size, validator_options=validator_options)
+        for record in records:
+            total += 1
+            valid += record["valid"]
+            out.write(json.dumps(record, separators=(",", ":")) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Validated {total} URLs ({valid} valid) in {elapsed:.2f}s "
+          f"({total / elapsed if elapsed else 0:.0f} URLs/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
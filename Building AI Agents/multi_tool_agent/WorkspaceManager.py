@@ -0,0 +1,269 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from .FileSystem import FileLock, directory_size
+except ImportError:
+    from FileSystem import FileLock, directory_size
+
+logger = logging.getLogger("REPO WORKSPACE MANAGER")
+
+DEFAULT_WORKSPACE_ROOT = os.environ.get(
+    "REPO_WORKSPACE_ROOT",
+    os.path.join(tempfile.gettempdir(), "repo_workspaces")
+)
+
+
+class WorkspaceManager:
+    """
+    Owns the scratch directories that repositories are cloned into.
+
+    Every workspace is a directory under ``root`` with a small ``.json`` file
+    recording its last access time and size. When the workspaces exceed
+    ``max_bytes`` or ``max_workspaces``, the least recently used ones are
+    removed by a background thread. A workspace that is pinned (by any process)
+    is never evicted; pins are shared file locks, so several users can pin the
+    same workspace at once. A newly created workspace is also kept for
+    ``grace_period`` seconds, so a clone handed back to its caller is not
+    evicted before the caller had a chance to pin it.
+    """
+
+    def __init__(self, root: str = DEFAULT_WORKSPACE_ROOT, max_bytes: int = 10 * 1024 ** 3,
+                 max_workspaces: int = 50, evict_interval: float = 60, grace_period: float = 600):
+        """
+        Initialize the workspace manager.
+
+        Args:
+            root: Directory holding the workspaces
+            max_bytes: Disk budget for all workspaces together
+            max_workspaces: Maximum number of workspaces to keep
+            evict_interval: Seconds between background eviction runs
+            grace_period: Seconds after its creation during which a workspace is not evicted
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_workspaces = max_workspaces
+        self.evict_interval = evict_interval
+        self.grace_period = grace_period
+        os.makedirs(self.root, exist_ok=True)
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def _meta_path(self, path: str) -> str:
+        return f"{path}.json"
+
+    def _lock_path(self, path: str) -> str:
+        return f"{path}.lock"
+
+    def _read_meta(self, path: str) -> Dict[str, Any]:
+        try:
+            with open(self._meta_path(path), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, path: str, meta: Dict[str, Any]):
+        tmp_path = f"{self._meta_path(path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path(path))
+
+    def owns(self, path: str) -> bool:
+        """Check whether a directory is a workspace of this manager."""
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.root)
+
+    def create(self, prefix: str = "repo_clone_") -> str:
+        """
+        Create a new, empty workspace.
+
+        Args:
+            prefix: Prefix of the workspace directory name
+
+        Returns:
+            Path of the workspace
+        """
+        path = tempfile.mkdtemp(prefix=prefix, dir=self.root)
+        self._write_meta(path, {"created": time.time(), "last_access": time.time(), "bytes": 0})
+        return path
+
+    def touch(self, path: str, measure: bool = False):
+        """
+        Record an access to a workspace.
+
+        Args:
+            path: Path of the workspace
+            measure: Also measure and record the workspace's size
+        """
+        if not os.path.isdir(path):
+            # Evicted or removed: do not leave an orphaned meta file behind
+            return
+        meta = self._read_meta(path)
+        meta["last_access"] = time.time()
+        if measure:
+            meta["bytes"] = directory_size(path)
+        self._write_meta(path, meta)
+
+    @contextmanager
+    def pin(self, path: str) -> Iterator[str]:
+        """
+        Keep a workspace from being evicted while it is in use.
+
+        Usage::
+
+            with manager.pin(result["clone_path"]) as path:
+                ...
+
+        The workspace's access time and size are updated when the pin is released.
+
+        Raises:
+            FileNotFoundError: The workspace no longer exists (e.g. it was evicted)
+        """
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Workspace {path} does not exist")
+        lock = FileLock(self._lock_path(path), shared=True)
+        lock.acquire()
+        if not os.path.isdir(path):
+            # Evicted while waiting for the lock: drop the lock file this pin created
+            lock.release()
+            self.remove(path)
+            raise FileNotFoundError(f"Workspace {path} does not exist")
+        try:
+            self.touch(path)
+            yield path
+        finally:
+            try:
+                if os.path.isdir(path):
+                    self.touch(path, measure=True)
+            finally:
+                lock.release()
+            self.request_eviction()
+
+    def remove(self, path: str) -> bool:
+        """
+        Remove a workspace unless it is pinned.
+
+        Returns:
+            True if the workspace was removed
+        """
+        lock = FileLock(self._lock_path(path), blocking=False)
+        if not lock.acquire():
+            return False
+        try:
+            shutil.rmtree(path, ignore_errors=True)
+            try:
+                os.remove(self._meta_path(path))
+            except OSError:
+                pass
+            # Unlinked while still held, so processes waiting on it retry on a new file
+            lock.unlink()
+        finally:
+            lock.release()
+        return True
+
+    def workspaces(self) -> List[Dict[str, Any]]:
+        """List the workspaces with their size and last access time."""
+        workspaces = []
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                # Hidden directories are staging areas still being filled (see fetch_archive)
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                meta = self._read_meta(entry.path)
+                size = meta.get("bytes")
+                if size is None:
+                    size = directory_size(entry.path)
+                mtime = entry.stat().st_mtime
+                workspaces.append({
+                    "path": entry.path,
+                    "bytes": size,
+                    "created": meta.get("created", mtime),
+                    "last_access": meta.get("last_access", mtime)
+                })
+        return workspaces
+
+    def usage(self) -> Dict[str, Any]:
+        """Report the number of workspaces and the disk space they use."""
+        workspaces = self.workspaces()
+        return {
+            "workspaces": len(workspaces),
+            "bytes": sum(workspace["bytes"] for workspace in workspaces),
+            "max_bytes": self.max_bytes,
+            "max_workspaces": self.max_workspaces
+        }
+
+    def evict(self) -> List[str]:
+        """
+        Remove least recently used workspaces until both limits are met.
+
+        Pinned workspaces and those created within the grace period are skipped.
+
+        Returns:
+            Paths of the evicted workspaces
+        """
+        evicted = []
+        with FileLock(os.path.join(self.root, ".evict.lock")):
+            workspaces = sorted(self.workspaces(), key=lambda workspace: workspace["last_access"])
+            count = len(workspaces)
+            total = sum(workspace["bytes"] for workspace in workspaces)
+            now = time.time()
+            for workspace in workspaces:
+                if count <= self.max_workspaces and total <= self.max_bytes:
+                    break
+                if now - workspace["created"] < self.grace_period:
+                    continue
+                if not self.remove(workspace["path"]):
+                    continue
+                count -= 1
+                total -= workspace["bytes"]
+                evicted.append(workspace["path"])
+                logger.info(f"Evicted workspace {workspace['path']} ({workspace['bytes']} bytes)")
+        return evicted
+
+    def request_eviction(self):
+        """Wake the background eviction thread, starting it if needed."""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._evict_loop, name="workspace-evictor", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def _evict_loop(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.evict_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.evict()
+            except Exception as e:
+                logger.error(f"Workspace eviction failed: {str(e)}")
+
+    def stop(self):
+        """Stop the background eviction thread."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def get_default_workspace_manager() -> WorkspaceManager:
+    """Get the process-wide workspace manager used for clones without a target directory."""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = WorkspaceManager()
+        return _default_manager
@@ -1 +1,36 @@
-from . import OrchestratorAgent
\ No newline at end of file
+"""Repository and code pipeline agents.
+
+Submodules are imported on first attribute access, so importing the package
+(e.g. to use RepositoryValidator) does not load google-adk or build agents.
+"""
+import importlib
+
+__all__ = [
+    "ArchiveFetch",
+    "BulkClone",
+    "CloneRepo",
+    "ExistenceStore",
+    "FileSystem",
+    "GitProgress",
+    "HostScheduler",
+    "MirrorCache",
+    "OrchestratorAgent",
+    "ProviderRegistry",
+    "RepoIndex",
+    "RepoWalker",
+    "RepositoryValidator",
+    "StreamValidator",
+    "WorkspaceManager",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "multi_tool_agent"))
+
+
+@pytest.fixture
+def source_repo(tmp_path):
+    """A small local repository with two commits on main, usable as a clone source."""
+    path = str(tmp_path / "source")
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=path, check=True, capture_output=True)
+
+    os.makedirs(path)
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    for index in range(2):
+        with open(os.path.join(path, f"file{index}.txt"), "w") as f:
+            f.write(f"content {index}\n")
+        git("add", "-A")
+        git("commit", "-q", "-m", f"commit {index}")
+    return path
+
+
+
+@pytest.fixture
+def scripted_llm():
+    """Build a model for the pipeline agents that answers from a script and counts calls per stage."""
+    from google.adk.models.base_llm import BaseLlm
+    from google.adk.models.llm_response import LlmResponse
+    from google.genai import types
+
+    def build(answers):
+        # answers maps a word of each stage's instruction ("Writer", "Reviewer", "Refactorer")
+        # to the text that stage answers with
+        class ScriptedLlm(BaseLlm):
+            calls: dict = {}
+
+            async def generate_content_async(self, llm_request, stream=False):
+                instruction = str(llm_request.config.system_instruction or "")
+                stage = next(word for word in answers if word in instruction)
+                self.calls[stage] = self.calls.get(stage, 0) + 1
+                yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=answers[stage])]))
+
+        return ScriptedLlm(model="scripted", calls={})
+
+    return build
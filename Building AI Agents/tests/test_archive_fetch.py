@@ -0,0 +1,232 @@
+import functools
+import http.server
+import io
+import os
+import tarfile
+import threading
+import zipfile
+
+import pytest
+
+from ArchiveFetch import _strip_member, fetch_archive
+from ProviderRegistry import GitProvider, ProviderRegistry
+from RepositoryValidator import RepositoryValidator
+
+FILES = {"README.md": b"# demo\n", "src/app.py": b"print('hi')\n"}
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Serve tmp_path/served over HTTP on a free local port."""
+    served = tmp_path / "served"
+    served.mkdir()
+    handler = functools.partial(QuietHandler, directory=str(served))
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield served, f"127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def add_file(archive, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    archive.addfile(info, io.BytesIO(data))
+
+
+def add_link(archive, name, target, kind=tarfile.SYMTYPE):
+    info = tarfile.TarInfo(name)
+    info.type = kind
+    info.linkname = target
+    archive.addfile(info)
+
+
+def write_tar(path, extra=None):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, data in FILES.items():
+            add_file(archive, f"repo-main/{name}", data)
+        if extra:
+            extra(archive)
+
+
+def write_zip(path):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in FILES.items():
+            archive.writestr(f"repo-main/{name}", data)
+        archive.writestr("repo-main/../escaped.txt", b"x")
+        archive.writestr("/absolute.txt", b"x")
+
+
+def read_tree(root):
+    tree = {}
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                tree[os.path.relpath(path, root).replace(os.sep, "/")] = f.read()
+    return tree
+
+
+@pytest.mark.parametrize("writer, file_name", [(write_tar, "repo.tar.gz"), (write_zip, "repo.zip")])
+def test_archive_is_extracted_without_top_level_directory(server, tmp_path, writer, file_name):
+    served, host = server
+    writer(str(served / file_name))
+    target = tmp_path / "out"
+
+    result = fetch_archive("https://github.com/org/repo", str(target), archive_url=f"http://{host}/{file_name}")
+
+    assert result["success"], result.get("error")
+    assert result["strategy"] == "archive" and result["file_count"] == len(FILES)
+    assert result["bytes_transferred"] == os.path.getsize(served / file_name)
+    assert read_tree(target) == FILES
+    assert not (tmp_path / "escaped.txt").exists()
+
+
+def test_ref_is_filled_into_the_provider_archive_url(server, tmp_path):
+    served, host = server
+    (served / "org" / "repo" / "archive" / "release").mkdir(parents=True)
+    write_tar(str(served / "org" / "repo" / "archive" / "release" / "v1.2.tar.gz"))
+    registry = ProviderRegistry([GitProvider(
+        name="Local", hostname=host, url_pattern=r"^http://[^/]+/[^/]+/[^/]+$",
+        archive_url="http://{host}/{owner}/{repo}/archive/{ref}.tar.gz"
+    )])
+    validator = RepositoryValidator(provider_registry=registry)
+
+    result = fetch_archive(f"http://{host}/org/repo", str(tmp_path / "out"), ref="release/v1.2",
+                           validator=validator)
+
+    assert result["success"], result.get("error")
+    assert result["archive_url"] == f"http://{host}/org/repo/archive/release/v1.2.tar.gz"
+    assert read_tree(tmp_path / "out") == FILES
+
+
+def test_missing_archive_is_reported(server, tmp_path):
+    _, host = server
+    result = fetch_archive("https://github.com/org/repo", str(tmp_path / "out"),
+                           archive_url=f"http://{host}/missing.tar.gz")
+    assert not result["success"] and "404" in result["error"]
+
+
+def test_unsafe_tar_members_are_skipped(server, tmp_path):
+    served, host = server
+
+    def unsafe(archive):
+        add_file(archive, "repo-main/../../escaped.txt", b"x")
+        add_file(archive, "/etc/absolute.txt", b"x")
+        add_link(archive, "repo-main/passwd", "/etc/passwd")
+        add_link(archive, "repo-main/up", "../../outside")
+        add_link(archive, "repo-main/hard", "/etc/shadow", tarfile.LNKTYPE)
+        add_link(archive, "repo-main/hard-up", "repo-main/../../outside", tarfile.LNKTYPE)
+        add_link(archive, "repo-main/readme-link", "README.md")
+
+    write_tar(str(served / "unsafe.tar.gz"), unsafe)
+    target = tmp_path / "out"
+
+    result = fetch_archive("https://github.com/org/repo", str(target), archive_url=f"http://{host}/unsafe.tar.gz")
+
+    assert result["success"], result.get("error")
+    assert sorted(os.listdir(target)) == ["README.md", "readme-link", "src"]
+    assert os.readlink(target / "readme-link") == "README.md"
+
+
+@pytest.mark.parametrize("name, kind, link", [
+    ("repo-main/../../escaped.txt", tarfile.REGTYPE, ""),
+    ("/abs/escaped.txt", tarfile.REGTYPE, ""),
+    ("repo-main/link", tarfile.SYMTYPE, "/etc/passwd"),
+    ("repo-main/link", tarfile.SYMTYPE, "../../outside"),
+    ("repo-main/link", tarfile.LNKTYPE, "/etc/passwd"),
+    ("repo-main/link", tarfile.LNKTYPE, "repo-main/../../outside"),
+    ("repo-main/dev", tarfile.CHRTYPE, ""),
+    ("repo-main", tarfile.DIRTYPE, ""),
+])
+def test_strip_member_rejects_unsafe_members(tmp_path, name, kind, link):
+    member = tarfile.TarInfo(name)
+    member.type = kind
+    member.linkname = link
+    assert _strip_member(member, str(tmp_path)) is None
+
+
+def test_strip_member_renames_and_drops_special_bits(tmp_path):
+    member = tarfile.TarInfo("repo-main/bin/tool")
+    member.mode = 0o6777
+    member.uid = 1000
+
+    stripped = _strip_member(member, str(tmp_path))
+
+    assert stripped.name == "bin/tool" and stripped.mode == 0o755 and stripped.uid == 0
+
+
+def test_failed_extraction_leaves_no_partial_files(server, tmp_path):
+    served, host = server
+    write_tar(str(served / "repo.tar.gz"))
+    with open(served / "repo.tar.gz", "r+b") as f:
+        f.truncate(os.path.getsize(served / "repo.tar.gz") // 2)
+
+    result = fetch_archive("https://github.com/org/repo", str(tmp_path / "out"),
+                           archive_url=f"http://{host}/repo.tar.gz")
+
+    assert not result["success"]
+    assert sorted(os.listdir(tmp_path)) == ["served"]
+
+
+def test_missing_archive_leaves_empty_target_untouched(server, tmp_path):
+    _, host = server
+    (tmp_path / "out").mkdir()
+
+    result = fetch_archive("https://github.com/org/repo", str(tmp_path / "out"),
+                           archive_url=f"http://{host}/missing.tar.gz")
+
+    assert not result["success"]
+    assert sorted(os.listdir(tmp_path)) == ["out", "served"] and not os.listdir(tmp_path / "out")
+
+
+def test_empty_target_is_replaced(server, tmp_path):
+    served, host = server
+    write_tar(str(served / "repo.tar.gz"))
+    (tmp_path / "out").mkdir()
+
+    result = fetch_archive("https://github.com/org/repo", str(tmp_path / "out"),
+                           archive_url=f"http://{host}/repo.tar.gz")
+
+    assert result["success"], result.get("error")
+    assert read_tree(tmp_path / "out") == FILES
+    assert sorted(os.listdir(tmp_path)) == ["out", "served"]
+
+
+def test_non_empty_target_is_rejected(server, tmp_path):
+    served, host = server
+    write_tar(str(served / "repo.tar.gz"))
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "keep.txt").write_bytes(b"keep")
+
+    result = fetch_archive("https://github.com/org/repo", str(tmp_path / "out"),
+                           archive_url=f"http://{host}/repo.tar.gz")
+
+    assert not result["success"] and "not empty" in result["error"]
+    assert read_tree(tmp_path / "out") == {"keep.txt": b"keep"}
+
+
+def test_owned_validator_is_closed(monkeypatch, tmp_path):
+    import ArchiveFetch
+
+    class StubValidator:
+        closed = False
+
+        def get_archive_url(self, repo_url, ref=None):
+            return None
+
+        def close(self):
+            StubValidator.closed = True
+
+    monkeypatch.setattr(ArchiveFetch, "RepositoryValidator", StubValidator)
+
+    result = fetch_archive("https://example.com/org/repo", str(tmp_path / "out"))
+
+    assert not result["success"] and StubValidator.closed
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,98 @@
+import json
+import os
+
+import BulkClone
+from BulkClone import BulkCloner
+
+
+def fake_clone(outcomes):
+    """A clone_repository stand-in that writes a file and fails or succeeds in turn."""
+    calls = []
+
+    def clone(repo_url, target_dir, **options):
+        calls.append(target_dir)
+        os.makedirs(target_dir, exist_ok=True)
+        with open(os.path.join(target_dir, f"attempt{len(calls)}"), "w") as f:
+            f.write("x")
+        if outcomes.pop(0):
+            return {"success": True, "file_count": 1, "strategy": "full"}
+        return {"success": False, "error": "boom"}
+
+    clone.calls = calls
+    return clone
+
+
+def test_failed_attempts_are_removed_and_retried(tmp_path, monkeypatch):
+    clone = fake_clone([False, True])
+    monkeypatch.setattr(BulkClone, "clone_repository", clone)
+    cloner = BulkCloner(str(tmp_path), retries=1, retry_delay=0)
+
+    result = cloner.clone_one("https://github.com/org/repo", str(tmp_path / "repo"))
+
+    assert result["success"] and result["attempts"] == 2
+    # The partial first attempt was removed before the retry
+    assert os.listdir(tmp_path / "repo") == ["attempt2"]
+
+
+def test_existing_directory_is_kept_and_not_retried(tmp_path, monkeypatch):
+    target = tmp_path / "repo"
+    target.mkdir()
+    (target / "user_data.txt").write_text("keep me")
+    clone = fake_clone([False, True])
+    monkeypatch.setattr(BulkClone, "clone_repository", clone)
+    cloner = BulkCloner(str(tmp_path), retries=3, retry_delay=0)
+
+    result = cloner.clone_one("https://github.com/org/repo", str(target))
+
+    assert not result["success"] and result["attempts"] == 1
+    assert (target / "user_data.txt").read_text() == "keep me"
+
+
+def test_run_yields_one_result_per_unique_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(BulkClone, "clone_repository", fake_clone([True] * 3))
+    urls = ["https://github.com/a/one", "https://gitlab.com/b/two", "https://github.com/a/one",
+            "https://github.com/c/three"]
+
+    results = list(BulkCloner(str(tmp_path), concurrency=2, per_host_limit=1).run(urls))
+
+    assert sorted(r["repo_url"] for r in results) == sorted(set(urls))
+    assert all(r["success"] for r in results)
+
+
+def test_quota_skips_clones_not_started(tmp_path, monkeypatch):
+    def clone(repo_url, target_dir, **options):
+        os.makedirs(target_dir, exist_ok=True)
+        with open(os.path.join(target_dir, "data"), "wb") as f:
+            f.write(b"x" * 100)
+        return {"success": True}
+
+    monkeypatch.setattr(BulkClone, "clone_repository", clone)
+    urls = [f"https://github.com/org/repo{i}" for i in range(5)]
+
+    results = list(BulkCloner(str(tmp_path), concurrency=1, max_bytes=150).run(urls))
+
+    assert [r["success"] for r in results] == [True, True, False, False, False]
+    assert all(r["skipped"] for r in results[2:])
+
+
+def test_cli_rerun_updates_existing_clones(tmp_path, monkeypatch):
+    def clone(repo_url, target_dir, update=False, **options):
+        if os.path.exists(target_dir) and not update:
+            return {"success": False, "error": f"Directory {target_dir} already exists"}
+        os.makedirs(target_dir, exist_ok=True)
+        return {"success": True, "file_count": 0, "strategy": "update" if update else "full"}
+
+    monkeypatch.setattr(BulkClone, "clone_repository", clone)
+    output_dir = str(tmp_path / "repos")
+    results = str(tmp_path / "results.jsonl")
+    argv = ["https://github.com/org/repo", "-d", output_dir, "-o", results]
+    assert BulkClone.main(argv) == 0
+
+    # Without --update the existing clone is reported as failed
+    assert BulkClone.main(argv) == 1
+
+    assert BulkClone.main(argv + ["--update"]) == 0
+    with open(results) as f:
+        result = json.loads(f.read())
+    assert result["success"] and result["attempts"] == 1 and result["strategy"] == "update"
+    assert result["clone_path"] == os.path.join(output_dir, "repo")
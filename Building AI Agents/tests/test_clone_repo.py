@@ -0,0 +1,95 @@
+import inspect
+import os
+import subprocess
+
+import pytest
+
+from CloneRepo import build_clone_command, clone_repository, resolve_clone_strategy, update_repository
+
+
+def test_full_clone_is_the_default():
+    assert inspect.signature(clone_repository).parameters["strategy"].default == "full"
+    command = build_clone_command("https://github.com/org/repo", "out")
+    assert "--depth" not in command and not any(arg.startswith("--filter") for arg in command)
+
+
+@pytest.mark.parametrize("strategy, sparse_paths, resolved", [
+    ("auto", None, "shallow"),
+    ("auto", ["src/"], "sparse"),
+    ("full", ["src/"], "full"),
+])
+def test_resolve_clone_strategy(strategy, sparse_paths, resolved):
+    assert resolve_clone_strategy(strategy, sparse_paths) == resolved
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_clone_strategy("deep")
+
+
+def test_shallow_clone_command():
+    command = build_clone_command("https://github.com/org/repo", "out", "shallow", depth=3, ref="v1")
+    assert command[-5:] == ["--single-branch", "--branch", "v1", "https://github.com/org/repo", "out"]
+    assert command[command.index("--depth") + 1] == "3"
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def commit_file(repo, name, content):
+    with open(os.path.join(repo, name), "w") as f:
+        f.write(content)
+    git("add", "-A", cwd=repo)
+    git("-c", "user.email=test@example.com", "-c", "user.name=Test", "commit", "-q", "-m", name, cwd=repo)
+    return git("rev-parse", "HEAD", cwd=repo)
+
+
+@pytest.fixture
+def checkout(tmp_path, source_repo):
+    path = str(tmp_path / "checkout")
+    git("clone", "-q", f"file://{source_repo}", path, cwd=str(tmp_path))
+    return path
+
+
+def test_update_fast_forwards_the_current_branch(source_repo, checkout):
+    new_commit = commit_file(source_repo, "new.txt", "new")
+
+    result = update_repository(f"file://{source_repo}", checkout)
+
+    assert result["success"] and result["update_method"] == "fast-forward"
+    assert result["new_commit"] == new_commit
+    assert result["changed_files"] == [{"status": "A", "path": "new.txt"}]
+
+
+def test_update_to_another_branch_leaves_the_current_branch_alone(source_repo, checkout):
+    main_commit = git("rev-parse", "HEAD", cwd=checkout)
+    git("checkout", "-q", "-b", "feature", cwd=source_repo)
+    feature_commit = commit_file(source_repo, "feature.txt", "feature")
+    git("checkout", "-q", "main", cwd=source_repo)
+
+    result = update_repository(f"file://{source_repo}", checkout, ref="feature")
+
+    assert result["success"] and result["update_method"] == "checkout"
+    assert git("symbolic-ref", "--short", "HEAD", cwd=checkout) == "feature"
+    assert git("rev-parse", "feature", cwd=checkout) == feature_commit
+    assert git("rev-parse", "main", cwd=checkout) == main_commit
+
+    new_main = commit_file(source_repo, "main.txt", "main")
+    result = update_repository(f"file://{source_repo}", checkout, ref="main")
+
+    assert result["success"] and result["update_method"] == "fast-forward"
+    assert git("symbolic-ref", "--short", "HEAD", cwd=checkout) == "main"
+    assert git("rev-parse", "main", cwd=checkout) == new_main
+    assert git("rev-parse", "feature", cwd=checkout) == feature_commit
+
+
+def test_update_to_a_tag_detaches_head(source_repo, checkout):
+    tagged = git("rev-parse", "HEAD~1", cwd=source_repo)
+    git("tag", "v1", tagged, cwd=source_repo)
+
+    result = update_repository(f"file://{source_repo}", checkout, ref="v1")
+
+    assert result["success"] and result["update_method"] == "checkout"
+    assert git("rev-parse", "HEAD", cwd=checkout) == tagged
+    assert git("rev-parse", "main", cwd=checkout) == git("rev-parse", "main", cwd=source_repo)
@@ -0,0 +1,58 @@
+import time
+
+from ExistenceStore import ExistenceStore
+
+URL = "https://github.com/octo/repo"
+
+
+def age(store, url, seconds):
+    with store._conn:
+        store._conn.execute("UPDATE repository_existence SET checked_at = ? WHERE url = ?",
+                            (time.time() - seconds, url))
+
+
+def test_results_persist_across_reopening(tmp_path):
+    path = str(tmp_path / "existence.db")
+    store = ExistenceStore(path)
+    store.record(URL, True, 200, "Repository exists")
+    store.close()
+
+    reopened = ExistenceStore(path)
+    record = reopened.get(URL)
+    assert (record["exists"], record["status_code"], record["stale"]) == (True, 200, False)
+    assert reopened.get("https://github.com/octo/other") is None
+
+
+def test_positive_and_negative_results_expire_separately():
+    store = ExistenceStore(":memory:", positive_ttl=100, negative_ttl=10)
+    store.record(URL, True, 200, "Repository exists")
+    store.record(URL + "-gone", False, 404, "Repository not found (404)")
+    age(store, URL, 50)
+    age(store, URL + "-gone", 50)
+
+    assert store.get(URL)["exists"]
+    assert store.get(URL + "-gone") is None
+    assert store.get_record(URL + "-gone")["status_code"] == 404
+    assert store.stats() == {"entries": 2, "positive": 1, "negative": 1, "stale": 0, "expired": 1}
+
+
+def test_changed_status_is_stored_stale_until_confirmed():
+    store = ExistenceStore(":memory:")
+    store.record(URL, True, 200, "Repository exists")
+    store.record(URL, False, 404, "Repository not found (404)")
+
+    assert store.get(URL) is None
+    record = store.get_record(URL)
+    assert (record["exists"], record["previous_status_code"], record["stale"]) == (False, 200, True)
+
+    store.record(URL, False, 404, "Repository not found (404)")
+    assert store.get(URL)["status_code"] == 404
+
+
+def test_mark_stale_forces_a_new_check():
+    store = ExistenceStore(":memory:")
+    store.record(URL, True, 200, "Repository exists")
+    store.mark_stale(URL)
+
+    assert store.get(URL) is None
+    assert store.stats()["stale"] == 1
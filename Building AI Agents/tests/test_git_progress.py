@@ -0,0 +1,53 @@
+import sys
+
+from GitProgress import parse_progress_line, run_git_with_progress
+
+
+def python_command(script):
+    return [sys.executable, "-c", "import sys, time\nout = sys.stderr.buffer\n" + script]
+
+
+def test_parse_progress_line():
+    event = parse_progress_line("Receiving objects:  45% (450/1000), 1.50 MiB | 2.00 MiB/s")
+    assert event["phase"] == "Receiving objects" and event["percent"] == 45
+    assert event["objects"] == 450 and event["total_objects"] == 1000
+    assert event["bytes"] == int(1.5 * 1024 ** 2) and event["throughput"] == 2 * 1024 ** 2
+    assert parse_progress_line("remote: Counting objects: 100% (10/10), done.")["remote"]
+    assert parse_progress_line("Cloning into 'repo'...") is None
+
+
+def test_progress_events_are_streamed():
+    events = []
+    script = ("for i in range(0, 101, 50):\n"
+              "    out.write(f'Receiving objects: {i}% ({i}/100)\\r'.encode()); out.flush()\n"
+              "out.write(b'Receiving objects: 100% (100/100), done.\\n')\n")
+
+    result = run_git_with_progress(python_command(script), events.append)
+
+    assert result["returncode"] == 0
+    assert [event["percent"] for event in events] == [0, 50, 100, 100]
+    assert result["output"] == "Receiving objects: 100% (100/100), done."
+
+
+def test_multibyte_characters_split_across_chunks():
+    # "é" is b"\xc3\xa9"; the two bytes arrive in separate reads
+    script = "out.write(b'Cloning into r\\xc3'); out.flush(); time.sleep(0.2)\nout.write(b'\\xa9po\\n')\n"
+
+    result = run_git_with_progress(python_command(script))
+
+    assert result["output"] == "Cloning into r\u00e9po"
+
+
+def test_output_without_percentages_is_not_a_stall():
+    script = ("for i in range(6):\n"
+              "    out.write(f'remote: Enumerating objects: {i * 1000}\\r'.encode()); out.flush(); time.sleep(0.3)\n")
+
+    result = run_git_with_progress(python_command(script), stall_timeout=1)
+
+    assert not result["stalled"] and result["returncode"] == 0
+
+
+def test_silent_command_is_killed_as_stalled():
+    result = run_git_with_progress(python_command("time.sleep(30)"), stall_timeout=0.5)
+
+    assert result["stalled"] and result["returncode"] != 0
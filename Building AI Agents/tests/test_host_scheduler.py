@@ -0,0 +1,59 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from HostScheduler import HostScheduler, get_hostname
+
+
+@pytest.mark.parametrize("url, hostname", [
+    ("https://GitHub.com/org/repo", "github.com"),
+    ("git@gitlab.com:org/repo.git", "gitlab.com"),
+    ("git://example.org/org/repo.git", "example.org"),
+    ("http://127.0.0.1:8000/org/repo", "127.0.0.1:8000"),
+])
+def test_get_hostname(url, hostname):
+    assert get_hostname(url) == hostname
+
+
+def test_per_host_and_total_limits_are_respected():
+    urls = [f"https://a.example/o/r{i}" for i in range(6)] + [f"https://b.example/o/r{i}" for i in range(6)]
+    running, peak = {}, {}
+    lock = threading.Lock()
+
+    def work(url):
+        host = get_hostname(url)
+        with lock:
+            running[host] = running.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), running[host])
+            peak["total"] = max(peak.get("total", 0), sum(v for k, v in running.items() if k != "total"))
+        time.sleep(0.01)
+        with lock:
+            running[host] -= 1
+        return url
+
+    scheduler = HostScheduler(urls, per_host_limit=2)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        done = [url for url, future in scheduler.run(executor, work, max_in_flight=3)]
+
+    assert sorted(done) == sorted(urls)
+    assert peak["a.example"] <= 2 and peak["b.example"] <= 2 and peak["total"] <= 3
+
+
+@pytest.mark.parametrize("per_host_limit", [0, -3])
+def test_non_positive_limit_still_runs_everything(per_host_limit):
+    urls = [f"https://a.example/o/r{i}" for i in range(3)]
+    scheduler = HostScheduler(urls, per_host_limit)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert sorted(url for url, _ in scheduler.run(executor, str.upper, 2)) == urls
+
+
+def test_drained_urls_are_not_started():
+    urls = [f"https://a.example/o/r{i}" for i in range(5)]
+    scheduler = HostScheduler(urls, per_host_limit=1)
+    started = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for url, _ in scheduler.run(executor, started.append, 1):
+            assert scheduler.drain() == urls[1:]
+    assert started == urls[:1]
@@ -0,0 +1,75 @@
+import os
+
+from CloneRepo import _clone_into
+from MirrorCache import MirrorCache
+
+
+def make_cache(tmp_path, **options):
+    return MirrorCache(str(tmp_path / "mirrors"), **options)
+
+
+def test_mirror_is_created_once_and_reused(tmp_path, source_repo):
+    cache = make_cache(tmp_path)
+    url = f"file://{source_repo}"
+
+    first = cache.ensure_mirror(url)
+    second = cache.ensure_mirror(url)
+
+    assert first["success"] and first["created"]
+    assert second["success"] and not second["created"] and not second["fetched"]
+    assert os.path.isdir(os.path.join(first["mirror_path"], "objects"))
+
+
+def test_failed_mirror_clone_leaves_no_partial_directory(tmp_path):
+    cache = make_cache(tmp_path)
+
+    result = cache.ensure_mirror(f"file://{tmp_path}/missing")
+
+    assert not result["success"]
+    assert not [name for name in os.listdir(cache.root) if name.endswith(".partial")]
+
+
+def test_mirror_in_use_is_not_evicted(tmp_path, source_repo):
+    cache = make_cache(tmp_path, max_bytes=0)
+    url = f"file://{source_repo}"
+
+    with cache.using(url) as mirror:
+        assert mirror["success"]
+        assert cache.evict() == []
+        assert os.path.isdir(mirror["mirror_path"])
+    assert cache.evict() == [mirror["mirror_path"]]
+
+
+def test_mirror_evicted_before_use_is_ensured_again(tmp_path, source_repo, monkeypatch):
+    cache = make_cache(tmp_path)
+    url = f"file://{source_repo}"
+    ensure_mirror = cache.ensure_mirror
+    calls = []
+
+    def ensure_then_evict(repo_url):
+        result = ensure_mirror(repo_url)
+        calls.append(result)
+        if len(calls) == 1:
+            # Another process evicts the mirror right after the exclusive lock is released
+            cache.max_bytes = 0
+            assert cache.evict() == [result["mirror_path"]]
+            cache.max_bytes = 10 ** 9
+        return result
+
+    monkeypatch.setattr(cache, "ensure_mirror", ensure_then_evict)
+    with cache.using(url) as mirror:
+        assert mirror["success"] and os.path.isdir(mirror["mirror_path"])
+    assert [call["created"] for call in calls] == [True, True]
+
+
+def test_clone_through_mirror_reports_the_strategy_used(tmp_path, source_repo):
+    cache = make_cache(tmp_path)
+    target = tmp_path / "clone"
+    target.mkdir()
+
+    result = _clone_into(f"file://{source_repo}", str(target), "shallow", 1, None, 1, cache,
+                         None, None, None, None)
+
+    assert result["success"], result.get("error")
+    assert result["strategy"] == "full" and result["mirror"]["created"]
+    assert sorted(os.listdir(target)) == [".git", "file0.txt", "file1.txt"]
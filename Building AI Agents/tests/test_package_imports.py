@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import sys
+
+import multi_tool_agent
+assert "google.adk" not in sys.modules, "import multi_tool_agent"
+multi_tool_agent.RepositoryValidator.RepositoryValidator
+assert "google.adk" not in sys.modules, "multi_tool_agent.RepositoryValidator"
+
+orchestrator = multi_tool_agent.OrchestratorAgent
+assert orchestrator._pipeline is None and orchestrator._runner is None, "import OrchestratorAgent"
+agent = orchestrator.root_agent
+assert "google.adk" in sys.modules
+assert agent is orchestrator._pipeline and agent is orchestrator.code_pipeline_agent
+assert orchestrator._runner is None
+"""
+
+
+def test_package_import_defers_google_adk_and_the_pipeline():
+    result = subprocess.run([sys.executable, "-c", SCRIPT], cwd=PROJECT_DIR, capture_output=True, text=True,
+                            timeout=120)
+    assert result.returncode == 0, result.stderr
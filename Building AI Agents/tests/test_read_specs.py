@@ -0,0 +1,30 @@
+import pytest
+
+from OrchestratorAgent import main, read_specs
+
+
+def write(tmp_path, text):
+    path = tmp_path / "specs.jsonl"
+    path.write_text(text)
+    return str(path)
+
+
+def test_reads_plain_and_json_lines(tmp_path):
+    path = write(tmp_path, 'add two numbers\n\n{"spec": "sort a list"}\n{"query": "reverse a string"}\n')
+
+    assert read_specs(path) == ["add two numbers", "sort a list", "reverse a string"]
+
+
+@pytest.mark.parametrize("line", ['{"id": 3}', '{"spec": ""}', '{"spec": 42}', '{"spec": "x"'])
+def test_bad_json_line_reports_its_line_number(tmp_path, line):
+    path = write(tmp_path, 'add two numbers\n\n' + line + '\n')
+
+    with pytest.raises(ValueError, match=r"specs\.jsonl:3: "):
+        read_specs(path)
+
+
+def test_cli_rejects_bad_batch_file(tmp_path, capsys):
+    path = write(tmp_path, '{"id": 1}\n')
+
+    assert main(["--batch", path]) == 2
+    assert 'specs.jsonl:1: no "spec" or "query" field' in capsys.readouterr().err
@@ -0,0 +1,80 @@
+import os
+import subprocess
+
+import pytest
+
+from RepoIndex import RepositoryIndex
+
+
+def git(*args, cwd=None):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def write(root, path, content="x"):
+    full_path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(content)
+
+
+def commit(root, message="change"):
+    git("add", "-A", cwd=root)
+    git("commit", "-q", "-m", message, cwd=root)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = str(tmp_path / "repo")
+    git("init", "-q", "-b", "main", root)
+    git("config", "user.email", "test@example.com", cwd=root)
+    git("config", "user.name", "Test", cwd=root)
+    write(root, "app/main.py")
+    write(root, "app/requirements.txt")
+    write(root, "app/.env")
+    write(root, "docs/guide.md")
+    write(root, "docs/index.md")
+    write(root, ".github/workflows/ci.yml")
+    commit(root, "initial")
+    return root
+
+
+def test_unchanged_head_is_served_from_cache(repo):
+    assert RepositoryIndex(repo).load_or_build().source == "full"
+    index = RepositoryIndex(repo).load_or_build()
+    assert index.source == "cache"
+    assert sorted(index.entries) == ["app/main.py", "app/requirements.txt", "docs/guide.md", "docs/index.md"]
+
+
+def test_subdirectories_have_separate_indexes(repo):
+    docs = RepositoryIndex(os.path.join(repo, "docs")).load_or_build()
+    app = RepositoryIndex(os.path.join(repo, "app")).load_or_build()
+
+    assert app.source == "full"
+    assert sorted(docs.entries) == ["guide.md", "index.md"]
+    assert sorted(app.entries) == ["main.py", "requirements.txt"]
+
+
+def test_incremental_update_in_subdirectory(repo):
+    app_path = os.path.join(repo, "app")
+    RepositoryIndex(app_path).load_or_build()
+    write(repo, "app/util.py", "y" * 10)
+    write(repo, "docs/new.md")
+    os.remove(os.path.join(repo, "app", "main.py"))
+    commit(repo)
+
+    index = RepositoryIndex(app_path).load_or_build()
+
+    assert index.source == "incremental"
+    assert sorted(index.entries) == ["requirements.txt", "util.py"]
+    assert index.entries["util.py"][0] == 10
+
+
+def test_gitignore_change_forces_full_walk(repo):
+    RepositoryIndex(repo).load_or_build()
+    write(repo, ".gitignore", "docs/\n")
+
+    index = RepositoryIndex(repo).load_or_build()
+
+    assert index.source == "full"
+    assert sorted(index.entries) == ["app/main.py", "app/requirements.txt"]
+    assert RepositoryIndex(repo).load_or_build().source == "cache"
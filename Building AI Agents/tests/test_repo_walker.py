@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from RepoWalker import collect_repository_stats, iter_repository_entries
+
+
+def write(root, path, content="x"):
+    full_path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(content)
+
+
+def files(root, **options):
+    return sorted(entry.path for entry in iter_repository_entries(str(root), **options) if not entry.is_dir)
+
+
+def test_nested_gitignore_applies_below_its_directory(tmp_path):
+    write(tmp_path, ".gitignore", "*.log\n")
+    write(tmp_path, "app/.gitignore", "/build\n*.tmp\n")
+    for path in ("a.log", "a.tmp", "build/out", "app/b.log", "app/b.tmp", "app/build/out", "app/src/build/out"):
+        write(tmp_path, path)
+
+    assert files(tmp_path) == [".gitignore", "a.tmp", "app/.gitignore", "app/src/build/out", "build/out"]
+
+
+def test_negation_reincludes_a_file(tmp_path):
+    write(tmp_path, ".gitignore", "*.log\n!keep.log\n# comment\n")
+    write(tmp_path, "drop.log")
+    write(tmp_path, "keep.log")
+    write(tmp_path, "sub/keep.log")
+
+    assert files(tmp_path) == [".gitignore", "keep.log", "sub/keep.log"]
+
+
+def test_directory_only_pattern_skips_files_of_that_name(tmp_path):
+    write(tmp_path, ".gitignore", "cache/\n")
+    write(tmp_path, "cache/data")
+    write(tmp_path, "src/cache/data")
+    write(tmp_path, "docs/cache")
+
+    assert files(tmp_path) == [".gitignore", "docs/cache"]
+
+
+def test_leading_double_star_matches_at_the_root(tmp_path):
+    write(tmp_path, ".gitignore", "**/generated\n")
+    write(tmp_path, "generated/a.py")
+    write(tmp_path, "src/deep/generated/b.py")
+    write(tmp_path, "src/generated_not.py")
+
+    assert files(tmp_path) == [".gitignore", "src/generated_not.py"]
+
+
+@pytest.mark.parametrize("pattern, ignored", [
+    ("docs/*.md", ["docs/a.md"]),
+    ("docs/**/*.md", ["docs/a.md", "docs/api/b.md", "docs/api/v1/c.md"]),
+    ("docs/**", ["docs/a.md", "docs/api/b.md", "docs/api/v1/c.md"]),
+])
+def test_anchored_star_does_not_cross_directories(tmp_path, pattern, ignored):
+    write(tmp_path, ".gitignore", pattern + "\n")
+    for path in ("docs/a.md", "docs/api/b.md", "docs/api/v1/c.md"):
+        write(tmp_path, path)
+
+    assert set(files(tmp_path)) == {".gitignore", "docs/a.md", "docs/api/b.md", "docs/api/v1/c.md"} - set(ignored)
+
+
+def test_extra_ignores_and_stats(tmp_path):
+    write(tmp_path, ".git/HEAD")
+    write(tmp_path, "a.py", "12345")
+    write(tmp_path, "lib/b.PY", "123")
+    write(tmp_path, "vendor/c.js")
+
+    stats = collect_repository_stats(str(tmp_path), extra_ignores=["vendor/"])
+
+    assert stats == {"file_count": 2, "directory_count": 1, "total_bytes": 8, "extensions": {".py": 2}}
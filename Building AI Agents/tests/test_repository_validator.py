@@ -0,0 +1,242 @@
+import http.server
+import logging
+import subprocess
+import threading
+
+import pytest
+from requests.exceptions import ConnectTimeout
+
+import RepositoryValidator as validator_module
+from ExistenceStore import ExistenceStore
+from ProviderRegistry import GitProvider
+from RepositoryValidator import RepositoryValidator, _TTLCache
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Answers HEAD requests from a list of status codes (or exceptions) in turn."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = 0
+
+    def head(self, url, **kwargs):
+        self.requests += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+    def close(self):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(validator_module.time, "monotonic", clock)
+    return clock
+
+
+def make_validator(session):
+    return RepositoryValidator(log_level=logging.WARNING, session=session,
+                               existence_store=ExistenceStore(":memory:"))
+
+
+@pytest.mark.parametrize("status_code, exists", [(200, True), (404, False)])
+def test_definitive_http_results_are_remembered(status_code, exists):
+    session = FakeSession(status_code)
+    validator = make_validator(session)
+    url = "https://github.com/org/repo"
+
+    assert validator.validate_repo_url(url, verify_existence=True)[0] is exists
+    is_valid, details = validator.validate_repo_url(url, verify_existence=True)
+
+    assert is_valid is exists and details["existence_source"] == "memory"
+    assert session.requests == 1
+    assert validator.existence_store.get(url)["status_code"] == status_code
+
+
+@pytest.mark.parametrize("outcome", [429, 503, 403, ConnectTimeout("timed out")])
+def test_transient_http_failures_are_not_remembered(outcome):
+    session = FakeSession(outcome, 200)
+    validator = make_validator(session)
+    url = "https://github.com/org/repo"
+
+    assert not validator.validate_repo_url(url, verify_existence=True)[0]
+    assert validator.existence_store.get_record(url) is None
+    is_valid, details = validator.validate_repo_url(url, verify_existence=True)
+
+    assert is_valid and details["existence_source"] == "network"
+    assert session.requests == 2
+
+
+@pytest.mark.parametrize("stderr, remembered", [
+    ("ERROR: Repository not found.\nfatal: Could not read from remote repository.", True),
+    ("ssh: Could not resolve hostname github.com: Name or service not known", False),
+    ("git@github.com: Permission denied (publickey).", False),
+])
+def test_git_failures_are_remembered_only_when_not_found(monkeypatch, stderr, remembered):
+    monkeypatch.setattr(validator_module.subprocess, "run",
+                        lambda *args, **kwargs: subprocess.CompletedProcess(args, 128, "", stderr))
+    validator = make_validator(FakeSession())
+    url = "git@github.com:org/repo.git"
+
+    assert not validator.validate_repo_url(url, verify_existence=True)[0]
+    assert (validator.existence_store.get_record(url) is not None) is remembered
+
+
+@pytest.mark.parametrize("per_host_limit", [0, -1, 2])
+def test_validate_many_keeps_input_order(per_host_limit):
+    urls = [f"https://github.com/org/repo{i}" for i in range(5)] + ["git@gitlab.com:org/tool.git", "not a url"]
+    validator = RepositoryValidator(log_level=logging.WARNING)
+
+    results = validator.validate_many(urls, max_workers=4, per_host_limit=per_host_limit)
+
+    assert list(results) == urls
+    assert [result["valid"] for result in results.values()] == [True] * 6 + [False]
+
+
+def test_registering_a_provider_invalidates_parsed_urls():
+    validator = make_validator(FakeSession())
+    url = "https://git.corp.example/team/service.git"
+    assert validator.validate_repo_url(url)[1]["provider"] == "git.corp.example"
+
+    validator.registry.register(GitProvider("Corp GitLab", "git.corp.example", kind="gitlab"))
+
+    assert validator.validate_repo_url(url)[1]["provider"] == "Corp GitLab"
+
+
+def test_api_url_follows_the_hostname_not_the_display_name():
+    validator = make_validator(FakeSession())
+    # Same display name as the built-in gitea.com entry, which has no API template
+    validator.registry.register(GitProvider("Gitea", "git.corp.example", kind="gitea"))
+
+    info = validator.get_repository_info("https://git.corp.example/team/service", verify_existence=False)
+    assert info["provider"] == "Gitea"
+    assert info["api_url"] == "https://git.corp.example/api/v1/repos/team/service"
+    info = validator.get_repository_info("https://gitea.com/team/service", verify_existence=False)
+    assert info["api_url"] is None
+
+
+def test_former_provider_tables_are_derived_from_the_registry():
+    validator = make_validator(FakeSession())
+    validator.registry.register(GitProvider("Corp GitLab", "git.corp.example", kind="gitlab"))
+
+    assert validator.provider_map["github.com"] == "GitHub"
+    assert validator.provider_map["git.corp.example"] == "Corp GitLab"
+    assert validator.provider_patterns["gitlab.com"] == r'^https?://gitlab\.com/[^/]+/[^/]+(/.*)?$'
+    assert validator.api_supported_providers == ["GitHub", "GitLab", "Bitbucket", "Corp GitLab"]
+
+
+def test_default_session_uses_pooled_adapter_with_retries():
+    validator = RepositoryValidator(log_level=logging.WARNING, pool_connections=8, pool_maxsize=4,
+                                    max_retries=3, backoff_factor=0.5)
+    adapter = validator.session.get_adapter("https://github.com")
+
+    assert validator.session.get_adapter("http://example.com") is adapter
+    assert adapter._pool_connections == 8 and adapter._pool_maxsize == 4
+    retry = adapter.max_retries
+    assert retry.total == 3 and retry.backoff_factor == 0.5
+    assert set(retry.status_forcelist) == {429, 500, 502, 503, 504}
+    assert retry.allowed_methods == frozenset(["HEAD", "GET"]) and not retry.raise_on_status
+    validator.close()
+
+
+class KeepAliveHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.send_response(200 if self.path.endswith("/repo") else 404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_connection_stats_count_reused_connections():
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    validator = RepositoryValidator(log_level=logging.WARNING)
+    try:
+        assert validator.connection_stats() == {"requests": 0, "connections": 0, "hosts": {},
+                                                "reused": 0, "reuse_ratio": 0.0}
+        outcomes = [validator._verify_repository_existence(f"{base}/org/{name}", {"url_type": "http"})[0]
+                    for name in ("repo", "repo", "missing", "repo")]
+        stats = validator.connection_stats()
+    finally:
+        validator.close()
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert outcomes == [True, True, False, True]
+    assert stats["requests"] == 4 and stats["connections"] == 1
+    assert stats["reused"] == 3 and stats["reuse_ratio"] == 0.75
+    assert stats["hosts"] == {"127.0.0.1": {"requests": 4, "connections": 1}}
+
+
+def test_cache_entries_expire_after_the_ttl(clock):
+    cache = _TTLCache(max_size=10, ttl=5)
+    cache.put("a", 1)
+
+    clock.now += 5
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_without_ttl_evicts_the_least_recently_used_entry(clock):
+    cache = _TTLCache(max_size=2, ttl=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    clock.now += 10 ** 6
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats() == {"hits": 3, "misses": 1, "hit_ratio": 0.75, "size": 2, "max_size": 2, "ttl": None}
+
+
+def test_zero_size_cache_stores_nothing(clock):
+    cache = _TTLCache(max_size=0, ttl=None)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["hit_ratio"] == 0.0
+
+
+def test_parse_and_existence_results_expire_separately(clock):
+    session = FakeSession(200, 200)
+    validator = RepositoryValidator(log_level=logging.WARNING, session=session, parse_ttl=3600, existence_ttl=60)
+    url = "https://github.com/org/repo"
+
+    assert validator.validate_repo_url(url, verify_existence=True)[1]["existence_source"] == "network"
+    clock.now += 30
+    assert validator.validate_repo_url(url, verify_existence=True)[1]["existence_source"] == "memory"
+    clock.now += 31
+    assert validator.validate_repo_url(url, verify_existence=True)[1]["existence_source"] == "network"
+
+    stats = validator.cache_stats()
+    assert session.requests == 2
+    assert (stats["parse"]["hits"], stats["parse"]["misses"]) == (2, 1)
+    assert (stats["existence"]["hits"], stats["existence"]["misses"]) == (1, 2)
+    assert stats["existence"]["hit_ratio"] == pytest.approx(1 / 3)
+
+    validator.clear_cache()
+    assert validator.cache_stats()["parse"]["size"] == validator.cache_stats()["existence"]["size"] == 0
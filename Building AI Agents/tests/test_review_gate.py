@@ -0,0 +1,67 @@
+import asyncio
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from OrchestratorAgent import acall_agent, build_pipeline
+from ReviewGate import CHANGES_REQUESTED, NO_CHANGES, ReviewGate, parse_verdict
+from StageCache import StageCache
+
+
+def test_parse_verdict_without_verdict():
+    assert parse_verdict(None) is None
+    assert parse_verdict("") is None
+    assert parse_verdict("Looks fine overall, but rename x.") is None
+    assert parse_verdict("The verdict is up to you: NO_CHANGES") is None
+
+
+def test_parse_verdict_last_line_wins():
+    review = "VERDICT: CHANGES_REQUESTED\nOn second thought...\nVERDICT: NO_CHANGES\n"
+    assert parse_verdict(review) == NO_CHANGES
+    review = "VERDICT: NO_CHANGES\n- fix the off-by-one\n**Verdict:** CHANGES_REQUESTED"
+    assert parse_verdict(review) == CHANGES_REQUESTED
+
+
+def test_parse_verdict_ignores_case():
+    assert parse_verdict("verdict: no_changes") == NO_CHANGES
+    assert parse_verdict("  Verdict : Changes_Requested.") == CHANGES_REQUESTED
+
+
+def run_pipeline(llm, queries, stage_cache=None, review_gate=None):
+    pipeline = build_pipeline(llm, stage_cache=stage_cache, review_gate=review_gate)
+    runner = Runner(agent=pipeline, app_name="test", session_service=InMemorySessionService())
+
+    async def run():
+        return [await acall_agent(query, runner=runner) for query in queries]
+
+    return asyncio.run(run())
+
+
+def test_clean_review_skips_refactor(scripted_llm):
+    llm = scripted_llm({"Writer": "print('hi')", "Reviewer": "Fine.\nVERDICT: NO_CHANGES",
+                        "Refactorer": "print('refactored')"})
+    gate = ReviewGate()
+
+    result, = run_pipeline(llm, ["say hi"], review_gate=gate)
+
+    assert result["success"]
+    assert result["refactored_code"] == "print('hi')"
+    assert result["review_verdict"] == NO_CHANGES
+    assert "Refactorer" not in llm.calls
+    assert gate.stats()["refactors_skipped"] == 1
+    assert gate.stats()["refactors_run"] == 0
+
+
+def test_cached_refactors_are_not_counted_as_runs(scripted_llm):
+    llm = scripted_llm({"Writer": "print('hi')", "Reviewer": "Rename it.\nVERDICT: CHANGES_REQUESTED",
+                        "Refactorer": "print('refactored')"})
+    gate = ReviewGate()
+
+    results = run_pipeline(llm, ["say hi", "say hi"], stage_cache=StageCache(), review_gate=gate)
+
+    assert [result["refactored_code"] for result in results] == ["print('refactored')"] * 2
+    assert llm.calls["Refactorer"] == 1
+    stats = gate.stats()
+    assert stats["refactors_run"] == 1
+    assert stats["refactors_skipped"] == 0
+    assert stats["average_refactor_seconds"] == gate.refactor_seconds
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.adk.runners import Runner
+
+from OrchestratorAgent import USER_ID, acall_agent, build_pipeline
+from SqliteSessionService import SqliteSessionService
+
+
+def test_sessions_survive_reopening(tmp_path, scripted_llm):
+    path = str(tmp_path / "sessions.db")
+    llm = scripted_llm({"Writer": "print('hi')", "Reviewer": "VERDICT: CHANGES_REQUESTED",
+                        "Refactorer": "print('hello')"})
+    service = SqliteSessionService(path)
+    runner = Runner(agent=build_pipeline(llm), app_name="test", session_service=service)
+
+    result = asyncio.run(acall_agent("say hi", runner=runner, keep_session=True))
+    service.close()
+
+    reopened = SqliteSessionService(path)
+    session = reopened.get_session(app_name="test", user_id=USER_ID, session_id=result["session_id"])
+    assert session.state["generated_code"] == "print('hi')"
+    assert session.state["refactored_code"] == "print('hello')"
+    assert [event.author for event in session.events][-3:] == [
+        "CodeWriterAgent", "CodeReviewerAgent", "CodeRefactorerAgent"]
+    assert reopened.stats()["sessions"] == 1
+
+
+def test_app_and_user_state_are_shared():
+    service = SqliteSessionService(":memory:")
+    session = service.create_session(app_name="app", user_id="u", session_id="a")
+    delta = {"app:theme": "dark", "user:name": "sam", "temp:scratch": 1, "own": True}
+    service.append_event(session, Event(author="test", invocation_id="i", actions=EventActions(state_delta=delta)))
+
+    same_user = service.create_session(app_name="app", user_id="u", session_id="b", state={"x": 1})
+    other_user = service.create_session(app_name="app", user_id="v", session_id="c")
+
+    assert same_user.state == {"x": 1, "app:theme": "dark", "user:name": "sam"}
+    assert other_user.state == {"app:theme": "dark"}
+    stored = service.get_session(app_name="app", user_id="u", session_id="a")
+    assert stored.state == {"own": True, "app:theme": "dark", "user:name": "sam"}
+    assert len(stored.events) == 1
+    assert service.get_session(app_name="app", user_id="u", session_id="missing") is None
+
+
+def test_expired_sessions_are_dropped():
+    service = SqliteSessionService(":memory:", ttl=60)
+    service.create_session(app_name="app", user_id="u", session_id="old")
+    service.create_session(app_name="app", user_id="u", session_id="new")
+    service._conn.execute("UPDATE sessions SET last_update_time = ? WHERE session_id = 'old'",
+                          (time.time() - 120,))
+
+    assert [session.id for session in service.list_sessions(app_name="app", user_id="u").sessions] == ["new"]
+    assert service.get_session(app_name="app", user_id="u", session_id="old") is None
+    assert service.stats()["sessions"] == 1
+
+
+def test_oldest_sessions_are_evicted_beyond_the_limit():
+    service = SqliteSessionService(":memory:", ttl=None, max_sessions=3, evict_every=1000)
+    for index in range(5):
+        service.create_session(app_name="app", user_id="u", session_id=f"s{index}")
+        service._conn.execute("UPDATE sessions SET last_update_time = ? WHERE session_id = ?",
+                              (1000.0 + index, f"s{index}"))
+
+    assert service.evict() == 2
+    remaining = service.list_sessions(app_name="app", user_id="u").sessions
+    assert sorted(session.id for session in remaining) == ["s2", "s3", "s4"]
+
+
+def test_eviction_runs_once_per_evict_every_sessions():
+    service = SqliteSessionService(":memory:", ttl=None, max_sessions=None, evict_every=10)
+    runs = []
+    service.evict = lambda: runs.append(1) or 0
+
+    threads = [threading.Thread(target=lambda offset=offset: [
+        service.create_session(app_name="app", user_id="u", session_id=f"{offset}-{index}") for index in range(25)
+    ]) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service._created == 100
+    assert len(runs) == 10
+
+
+def test_session_calls_do_not_block_the_event_loop(tmp_path, scripted_llm):
+    class SlowService(SqliteSessionService):
+        def create_session(self, **kwargs):
+            time.sleep(0.3)
+            return super().create_session(**kwargs)
+
+    llm = scripted_llm({"Writer": "print('hi')", "Reviewer": "VERDICT: APPROVED", "Refactorer": "unused"})
+    runner = Runner(agent=build_pipeline(llm), app_name="test",
+                    session_service=SlowService(str(tmp_path / "sessions.db")))
+
+    async def main():
+        gaps = []
+        task = asyncio.create_task(acall_agent("say hi", runner=runner))
+        last = time.perf_counter()
+        while not task.done():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+        return await task, gaps
+
+    result, gaps = asyncio.run(main())
+
+    assert result["success"], result.get("error")
+    assert max(gaps) < 0.2
+
+
+def test_events_are_written_behind(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    service = SqliteSessionService(path)
+    store_event = service._store_event
+    service._store_event = lambda *args: time.sleep(0.05) or store_event(*args)
+    session = service.create_session(app_name="app", user_id="u", session_id="s")
+
+    started = time.perf_counter()
+    for index in range(3):
+        service.append_event(session, Event(author="test", invocation_id="i",
+                                            actions=EventActions(state_delta={"n": index})))
+    assert time.perf_counter() - started < 0.05
+    assert session.state["n"] == 2
+
+    stored = service.get_session(app_name="app", user_id="u", session_id="s")
+    assert len(stored.events) == 3 and stored.state["n"] == 2
+
+    service.append_event(session, Event(author="test", invocation_id="i"))
+    service.close()
+    reopened = SqliteSessionService(path)
+    assert len(reopened.get_session(app_name="app", user_id="u", session_id="s").events) == 4
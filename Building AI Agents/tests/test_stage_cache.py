@@ -0,0 +1,63 @@
+import asyncio
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from OrchestratorAgent import acall_agent, build_pipeline
+from StageCache import StageCache
+
+ANSWERS = {"Writer": "def add(a, b): return a + b", "Reviewer": "VERDICT: CHANGES_REQUESTED\nAdd types.",
+           "Refactorer": "def add(a: int, b: int) -> int: return a + b"}
+
+
+def run_pipeline(llm, cache, queries):
+    runner = Runner(agent=build_pipeline(llm, stage_cache=cache), app_name="test",
+                    session_service=InMemorySessionService())
+
+    async def run():
+        return [await acall_agent(query, runner=runner) for query in queries]
+
+    return asyncio.run(run())
+
+
+def test_repeated_request_is_served_from_the_cache(scripted_llm):
+    llm = scripted_llm(ANSWERS)
+    cache = StageCache()
+
+    first, second = run_pipeline(llm, cache, ["add two numbers", "add two numbers"])
+
+    assert first["refactored_code"] == second["refactored_code"] == ANSWERS["Refactorer"]
+    assert second["generated_code"] == ANSWERS["Writer"]
+    assert llm.calls == {"Writer": 1, "Reviewer": 1, "Refactorer": 1}
+    assert {stage: (counts["hits"], counts["misses"]) for stage, counts in cache.stats().items()} == {
+        "CodeWriterAgent": (1, 1), "CodeReviewerAgent": (1, 1), "CodeRefactorerAgent": (1, 1)}
+
+
+def test_changed_request_misses_every_stage_that_reads_it(scripted_llm):
+    llm = scripted_llm(ANSWERS)
+    cache = StageCache()
+
+    run_pipeline(llm, cache, ["add two numbers", "add three numbers"])
+
+    # The writer sees a new request; the later stages read the writer's (unchanged) output
+    assert llm.calls == {"Writer": 2, "Reviewer": 1, "Refactorer": 1}
+
+
+def test_least_recently_used_entries_are_dropped():
+    cache = StageCache(max_entries=2)
+    cache.put("a", {"parts": [{"text": "a"}]})
+    cache.put("b", {"parts": [{"text": "b"}]})
+    assert cache.get("a") is not None
+    cache.put("c", {"parts": [{"text": "c"}]})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_key_depends_on_every_input():
+    key = StageCache.make_key("Writer", "instruction", "model", {"request": ["x"]})
+
+    assert key == StageCache.make_key("Writer", "instruction", "model", {"request": ["x"]})
+    assert key != StageCache.make_key("Writer", "instruction", "model", {"request": ["y"]})
+    assert key != StageCache.make_key("Writer", "other instruction", "model", {"request": ["x"]})
+    assert key != StageCache.make_key("Writer", "instruction", "other", {"request": ["x"]})
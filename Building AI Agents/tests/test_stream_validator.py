@@ -0,0 +1,91 @@
+import json
+import random
+import threading
+import time
+
+import StreamValidator as stream_module
+from StreamValidator import compact_result, iter_urls, main, stream_validate
+
+URLS = [f"https://github.com/org{index}/repo{index}" for index in range(25)] + [
+    "not a url", "git@gitlab.com:group/project.git", "ftp://example.com/a/b"]
+
+
+def test_records_are_compact_and_in_input_order():
+    records = list(stream_validate(URLS, workers=1))
+
+    assert [record["url"] for record in records] == URLS
+    assert records[0] == {"url": URLS[0], "valid": True, "provider": "GitHub", "hostname": "github.com",
+                          "username": "org0", "repo_name": "repo0", "url_type": "http"}
+    invalid = records[URLS.index("not a url")]
+    assert not invalid["valid"] and invalid["error"]
+    assert "validation_steps" not in invalid
+
+
+def test_process_pool_keeps_input_order():
+    sequential = list(stream_validate(URLS, workers=1))
+
+    records = list(stream_validate(iter(URLS), workers=2, batch_size=3))
+
+    assert records == sequential
+
+
+class StubValidator:
+    """Answers validate_repo_url with a fake existence check that finishes in random order."""
+
+    instances = []
+
+    def __init__(self, **options):
+        self.options = options
+        self.closed = False
+        self.threads = set()
+        StubValidator.instances.append(self)
+
+    def validate_repo_url(self, url, verify_existence=False):
+        assert verify_existence
+        self.threads.add(threading.get_ident())
+        time.sleep(random.random() / 200)
+        exists = not url.endswith("3")
+        return True, {"provider": "GitHub", "hostname": "github.com", "username": "org", "repo_name": url[-5:],
+                      "url_type": "http", "existence_source": "network",
+                      "validation_steps": [{"step": "existence", "passed": exists, "message": ""}]}
+
+    def close(self):
+        self.closed = True
+
+
+def test_verify_path_runs_on_threads_in_input_order(monkeypatch):
+    StubValidator.instances = []
+    monkeypatch.setattr(stream_module, "RepositoryValidator", StubValidator)
+    urls = URLS[:25]
+
+    records = list(stream_validate(urls, verify_existence=True, workers=4))
+
+    assert [record["url"] for record in records] == urls
+    assert [record["exists"] for record in records] == [not url.endswith("3") for url in urls]
+    assert {record["existence_source"] for record in records} == {"network"}
+    validator, = StubValidator.instances
+    assert validator.closed
+    assert len(validator.threads) > 1
+
+
+def test_malformed_lines_become_error_records(tmp_path, capsys):
+    source = tmp_path / "urls.txt"
+    source.write_text("# comment\n\nhttps://github.com/octo/repo\n   \n{\"url\": \"x\"}\nhttps://\n\x00bad\n")
+    output = tmp_path / "out.jsonl"
+
+    assert main([str(source), "-o", str(output), "-w", "1"]) == 0
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["url"] for record in records] == ["https://github.com/octo/repo", '{"url": "x"}',
+                                                     "https://", "\x00bad"]
+    assert [record["valid"] for record in records] == [True, False, False, False]
+    assert all(record["error"] for record in records[1:])
+    assert "Validated 4 URLs (1 valid)" in capsys.readouterr().err
+
+
+def test_iter_urls_skips_blanks_and_comments():
+    assert list(iter_urls([" a \n", "\n", "# b\n", "c"])) == ["a", "c"]
+
+
+def test_compact_result_falls_back_to_error_field():
+    assert compact_result("x", False, {"error": "boom"})["error"] == "boom"
@@ -0,0 +1,141 @@
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from FileSystem import FileLock
+from WorkspaceManager import WorkspaceManager
+
+
+def fill(path, size):
+    with open(os.path.join(path, "data.bin"), "wb") as f:
+        f.write(b"x" * size)
+
+
+def make_manager(tmp_path, **options):
+    options.setdefault("max_bytes", 1000)
+    options.setdefault("grace_period", 0)
+    manager = WorkspaceManager(str(tmp_path / "workspaces"), **options)
+    # Evict explicitly in the tests instead of from the background thread
+    manager.request_eviction = lambda: None
+    return manager
+
+
+def age(manager, path, seconds):
+    meta = manager._read_meta(path)
+    meta["created"] -= seconds
+    meta["last_access"] -= seconds
+    manager._write_meta(path, meta)
+
+
+def test_least_recently_used_workspace_is_evicted(tmp_path):
+    manager = make_manager(tmp_path)
+    old, new = manager.create(), manager.create()
+    for path in (old, new):
+        with manager.pin(path):
+            fill(path, 600)
+    age(manager, old, 60)
+
+    assert manager.evict() == [old]
+    assert not os.path.exists(old) and os.path.exists(new)
+
+
+def test_pinned_workspace_is_not_evicted(tmp_path):
+    manager = make_manager(tmp_path, max_workspaces=0)
+    path = manager.create()
+    with manager.pin(path):
+        assert manager.evict() == []
+    assert manager.evict() == [path]
+
+
+def test_new_workspace_is_kept_for_the_grace_period(tmp_path):
+    manager = make_manager(tmp_path, grace_period=300)
+    path = manager.create()
+    with manager.pin(path):
+        # Larger than the whole budget, as a big clone would be
+        fill(path, 5000)
+
+    assert manager.evict() == []
+    age(manager, path, 301)
+    assert manager.evict() == [path]
+
+
+def test_released_pin_updates_size_and_access_time(tmp_path):
+    manager = make_manager(tmp_path)
+    path = manager.create()
+    before = time.time()
+    with manager.pin(path):
+        fill(path, 123)
+
+    workspace, = manager.workspaces()
+    assert workspace["bytes"] == 123 and workspace["last_access"] >= before
+
+
+def test_hidden_staging_directories_are_not_workspaces(tmp_path):
+    manager = make_manager(tmp_path, max_workspaces=0)
+    staging = os.path.join(manager.root, ".repo_clone_x.partial")
+    os.mkdir(staging)
+
+    assert manager.workspaces() == [] and manager.evict() == []
+    assert os.path.isdir(staging)
+
+
+def test_pinning_a_removed_workspace_leaves_no_files(tmp_path):
+    manager = make_manager(tmp_path)
+    path = manager.create()
+    assert manager.remove(path)
+
+    with pytest.raises(FileNotFoundError):
+        with manager.pin(path):
+            pass
+    manager.touch(path)
+
+    assert os.listdir(manager.root) == []
+
+
+def test_waiting_pin_notices_a_workspace_removed_meanwhile(tmp_path):
+    manager = make_manager(tmp_path)
+    path = manager.create()
+    lock = FileLock(manager._lock_path(path))
+    lock.acquire()
+    outcome = []
+
+    def pin():
+        try:
+            with manager.pin(path):
+                outcome.append("pinned")
+        except FileNotFoundError:
+            outcome.append("gone")
+
+    thread = threading.Thread(target=pin)
+    thread.start()
+    time.sleep(0.1)
+    # What remove() does while holding the exclusive lock
+    shutil.rmtree(path)
+    os.remove(manager._meta_path(path))
+    lock.unlink()
+    lock.release()
+    thread.join(5)
+
+    assert outcome == ["gone"]
+    assert os.listdir(manager.root) == []
+
+
+def test_lock_waiter_moves_to_the_new_lock_file(tmp_path):
+    path = str(tmp_path / "x.lock")
+    holder = FileLock(path)
+    holder.acquire()
+    waiter = FileLock(path)
+    thread = threading.Thread(target=waiter.acquire)
+    thread.start()
+    time.sleep(0.1)
+    holder.unlink()
+    holder.release()
+    thread.join(5)
+
+    # The waiter holds the lock on the file now at the path, so it excludes newcomers
+    assert os.path.samestat(os.fstat(waiter._file.fileno()), os.stat(path))
+    assert not FileLock(path, blocking=False).acquire()
+    waiter.release()
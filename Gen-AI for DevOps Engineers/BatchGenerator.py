@@ -0,0 +1,122 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ollama
+from DockerfileGenerator import DockerfileGenerator
+from utils import hosted_llm
+from utils.dockerfile_cache import normalize_language
+
+# Characters that cannot appear in an output file suffix ("c#" is already normalized to "csharp")
+FILENAME_SAFE = {"c++": "cpp"}
+
+
+class BatchDockerfileGenerator:
+    """A class to generate Dockerfiles for several programming languages concurrently."""
+
+    def __init__(self, model_type='local', concurrency=4, hosted_model='gemini-1.5-pro', generator=None):
+        """Initialize the batch generator.
+
+        Args:
+            model_type (str): 'local' to use Ollama or 'online' to use the hosted model.
+            concurrency (int): Maximum number of generations running at the same time.
+            hosted_model (str): The hosted model to use when model_type is 'online'.
+            generator (DockerfileGenerator): Generator used for the local backend. Its cache
+                settings are also applied to the hosted backend.
+        """
+        self.model_type = model_type
+        self.concurrency = max(1, concurrency)
+        self.hosted_model = hosted_model
+        self.generator = generator if generator is not None else DockerfileGenerator()
+
+    @staticmethod
+    def unique_languages(languages):
+        """Drop languages that are aliases of one already in the list (e.g. 'golang' after 'go')."""
+        seen = set()
+        unique = []
+        for language in languages:
+            normalized = normalize_language(language)
+            if normalized not in seen:
+                seen.add(normalized)
+                unique.append(language)
+        return unique
+
+    @staticmethod
+    def output_path(output, language):
+        """Return the per-language output path, e.g. 'Dockerfile.python' or 'Dockerfile.cpp'."""
+        normalized = normalize_language(language)
+        return f"{output}.{FILENAME_SAFE.get(normalized, normalized)}"
+
+    def run(self, languages, output="Dockerfile"):
+        """Generate a Dockerfile for every language and save each one to its own file.
+
+        Args:
+            languages (list): The programming languages to generate Dockerfiles for.
+            output (str): Base output path. The language is appended as a suffix.
+
+        Returns:
+            list: One result dict per language, in input order, with the keys
+                'language', 'output', 'success', 'latency' (seconds) and 'error'.
+        """
+        languages = self.unique_languages(languages)
+        if self.model_type == 'local':
+            return asyncio.run(self._run_local(languages, output))
+        return self._run_hosted(languages, output)
+
+    async def _run_local(self, languages, output):
+        """Generate with the async Ollama client, at most ``concurrency`` requests at a time."""
+        client = ollama.AsyncClient()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        checked = False
+
+        def check_ollama():
+            # One health check for the whole batch, and none if every language is cached
+            nonlocal checked
+            if not checked:
+                self.generator._check_ollama()
+                checked = True
+
+        async def generate_one(language):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    content = await self.generator.agenerate(language, client, on_miss=check_ollama)
+                    return self._save(language, content, output, start)
+                except Exception as e:
+                    return self._result(language, output, start, error=str(e))
+
+        return await asyncio.gather(*(generate_one(language) for language in languages))
+
+    def _run_hosted(self, languages, output):
+        """Generate with the hosted model using a pool of worker threads."""
+        def generate_one(language):
+            start = time.perf_counter()
+            try:
+                content = hosted_llm.generate_dockerfile(
+                    language=language,
+                    model_type=self.hosted_model,
+                    use_cache=self.generator.use_cache,
+                    refresh=self.generator.refresh,
+                    cache=self.generator.cache
+                )
+                return self._save(language, content, output, start)
+            except Exception as e:
+                return self._result(language, output, start, error=str(e))
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return list(executor.map(generate_one, languages))
+
+    def _save(self, language, content, output, start):
+        path = self.output_path(output, language)
+        if not self.generator.save_to_file(content, path):
+            return self._result(language, output, start, error=f"Could not write {path}")
+        return self._result(language, output, start)
+
+    def _result(self, language, output, start, error=None):
+        return {
+            "language": language,
+            "output": self.output_path(output, language),
+            "success": error is None,
+            "latency": time.perf_counter() - start,
+            "error": error,
+        }
@@ -1,6 +1,9 @@
+import os
 import sys
+import time
 import ollama
-from OllamaChecker import OllamaChecker
+from OllamaChecker import get_shared_checker
+from utils import dockerfile_cache
 
 PROMPT = """
         ONLY Generate an ideal Dockerfile for {language} with best practices. Do not provide any description
@@ -18,17 +21,24 @@ PROMPT = """
 class DockerfileGenerator:
     """A class to generate Dockerfiles for different programming languages using Ollama."""
 
-    def __init__(self, model='gemma3:latest', language ='python',prompt_template=PROMPT ):
+    def __init__(self, model='gemma3:latest', language ='python',prompt_template=PROMPT, cache=None, use_cache=True, refresh=False):
         """Initialize the DockerfileGenerator with a specified model.
         
         Args:
             model (str): The Ollama model to use for generation. Default is 'llama3.1:8b'.
             language (str): The programming language for which to generate a Dockerfile. Default is 'python'.
+            cache (DockerfileCache): The cache to use. Defaults to the shared on-disk cache.
+            use_cache (bool): If False, never read from or write to the cache.
+            refresh (bool): If True, ignore cached entries but store the newly generated Dockerfile.
             
         """
         self.language = language
         self.model = model
         self.prompt_template = prompt_template
+        self.cache = cache if cache is not None else dockerfile_cache.get_default_cache()
+        self.use_cache = use_cache
+        self.refresh = refresh
+        self.last_stream_stats = None
     
     def set_prompt_template(self, template):
         """Set a custom prompt template for Dockerfile generation.
@@ -40,6 +50,44 @@ class DockerfileGenerator:
     
 
 
+    def _check_ollama(self):
+        """Exit with a helpful message if Ollama is not installed or its API is unreachable.
+        
+        The health state is shared across the process and only probed again once
+        it has failed or its TTL has expired.
+        """
+        ollama_checker = get_shared_checker()
+        # Check if Ollama is installed and running
+        if ollama_checker.refresh():
+            return
+        if not ollama_checker.installation_status:
+            print("Ollama is not installed. Please install it first.")
+        elif not ollama_checker.process_status:
+            print("Ollama process is not running. Please start it first.")
+        else:
+            print("Ollama service is not running. Please ensure it is started.")
+        sys.exit(1)
+
+    def _build_messages(self, language):
+        """Build the chat messages sent to Ollama for the specified language."""
+        language = dockerfile_cache.normalize_language(language)
+        return [{'role': 'user', 'content': self.prompt_template.format(language=language)}]
+
+    def _cached(self, language):
+        """Return the cached Dockerfile for the language, or None if it must be generated."""
+        if not self.use_cache or self.refresh:
+            return None
+        return self.cache.get("ollama", self.model, language, self.prompt_template)
+
+    def _store(self, language, content):
+        """Store a generated Dockerfile in the cache unless caching is disabled."""
+        if not self.use_cache:
+            return
+        try:
+            self.cache.put("ollama", self.model, language, self.prompt_template, content)
+        except OSError as e:
+            print(f"Warning: could not write Dockerfile cache: {str(e)}")
+
     def generate(self, language):
         """Generate a Dockerfile for the specified language using Ollama.
         
@@ -55,69 +103,171 @@ class DockerfileGenerator:
             ValueError: If the generated content is not a valid Dockerfile.
             Exception: For any other errors.
         """
-        ollama_checker = OllamaChecker()
         try:
+            cached = self._cached(language)
+            if cached is not None:
+                return cached
+
+            self._check_ollama()
+            # print("Ollama is installed and running. Proceeding with Dockerfile generation...")
+            response = ollama.chat(
+                model=self.model,
+                messages=self._build_messages(language)
+            )
 
-            # Check if Ollama is installed and running
-            if not ollama_checker.check_installed():
-                print("Ollama is not installed. Please install it first.")
-                sys.exit(1)
-            elif not ollama_checker.check_process_running():
-                print("Ollama process is not running. Please start it first.")
-                sys.exit(1)
-            elif not ollama_checker.check_service_running():
-                print("Ollama service is not running. Please ensure it is started.")
-                sys.exit(1)
-            else:
-                # print("Ollama is installed and running. Proceeding with Dockerfile generation...")
-                response = ollama.chat(
-                    model=self.model,
-                    messages=[{'role': 'user', 'content': self.prompt_template.format(language=language)}]
-                )
-
-                dockerfile_content = response['message']['content']
-
-                if not dockerfile_content or "FROM" not in dockerfile_content:
-                    raise ValueError("Generated content does not appear to be a valid Dockerfile")                
-                return dockerfile_content              
+            dockerfile_content = response['message']['content']
+
+            if not dockerfile_content or "FROM" not in dockerfile_content:
+                raise ValueError("Generated content does not appear to be a valid Dockerfile")                
+            self._store(language, dockerfile_content)
+            return dockerfile_content              
          
         except Exception as e:
             print(f"Error generating Dockerfile: {str(e)}")
             sys.exit(1)
+
+    async def agenerate(self, language, client=None, on_miss=None):
+        """Generate a Dockerfile for the specified language using the async Ollama client.
+        
+        Unlike ``generate`` this neither checks the Ollama installation nor exits the
+        process on failure, so many languages can be generated concurrently. Callers
+        are expected to run ``_check_ollama`` once before the first cache miss.
+        
+        Args:
+            language (str): The programming language for which to generate a Dockerfile.
+            client (ollama.AsyncClient): Client to reuse across calls. A new one is created if omitted.
+            on_miss (callable): Called before Ollama is queried when the cache has no entry.
+            
+        Returns:
+            str: The generated Dockerfile content.
+            
+        Raises:
+            ValueError: If the generated content is not a valid Dockerfile.
+        """
+        cached = self._cached(language)
+        if cached is not None:
+            return cached
+
+        if on_miss is not None:
+            on_miss()
+        if client is None:
+            client = ollama.AsyncClient()
+        response = await client.chat(
+            model=self.model,
+            messages=self._build_messages(language)
+        )
+
+        dockerfile_content = response['message']['content']
+        if not dockerfile_content or "FROM" not in dockerfile_content:
+            raise ValueError("Generated content does not appear to be a valid Dockerfile")
+        self._store(language, dockerfile_content)
+        return dockerfile_content
+
+    def generate_stream(self, language):
+        """Generate a Dockerfile for the specified language, yielding chunks as Ollama produces them.
+        
+        Timing information for the run is kept in ``self.last_stream_stats``:
+        ``time_to_first_token`` and ``total_time`` (seconds) and ``chunks``.
+        
+        Args:
+            language (str): The programming language for which to generate a Dockerfile.
+            
+        Yields:
+            str: The next piece of Dockerfile content.
+            
+        Raises:
+            ValueError: If the generated content is not a valid Dockerfile.
+        """
+        stats = {"time_to_first_token": None, "total_time": None, "chunks": 0}
+        self.last_stream_stats = stats
+        start = time.perf_counter()
+
+        cached = self._cached(language)
+        if cached is not None:
+            stats["time_to_first_token"] = stats["total_time"] = time.perf_counter() - start
+            stats["chunks"] = 1
+            yield cached
+            return
+
+        self._check_ollama()
+
+        stream = ollama.chat(
+            model=self.model,
+            messages=self._build_messages(language),
+            stream=True
+        )
+
+        # Only the last few characters are kept so "FROM" split across chunks is still found
+        tail = ""
+        found_from = False
+        pieces = []
+        for chunk in stream:
+            piece = chunk['message']['content']
+            if not piece:
+                continue
+            if stats["time_to_first_token"] is None:
+                stats["time_to_first_token"] = time.perf_counter() - start
+            stats["chunks"] += 1
+            if not found_from:
+                window = tail + piece
+                found_from = "FROM" in window
+                tail = window[-3:]
+            pieces.append(piece)
+            yield piece
+
+        stats["total_time"] = time.perf_counter() - start
+        if not found_from:
+            raise ValueError("Generated content does not appear to be a valid Dockerfile")
+        self._store(language, "".join(pieces))
     
     def save_to_file(self, content, filepath="Dockerfile"):
         """Save the generated Dockerfile content to a file.
         
         Args:
-            content (str): The Dockerfile content to save.
+            content (str | Iterable[str]): The Dockerfile content to save, either as a
+                string or as a stream of chunks (e.g. from ``generate_stream``). Chunks
+                are written and flushed to a temporary file as they arrive, which only
+                replaces filepath once the stream has finished and passed validation.
             filepath (str): The filepath to save the Dockerfile to. Default is "Dockerfile".
             
         Returns:
-            bool: True if the file was saved successfully, False otherwise.
+            bool: True if the file was saved successfully, False otherwise. An existing
+                file at filepath is left untouched on failure.
         """
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
         try:
-            with open(filepath, 'w') as f:
-                f.write(content)
+            with open(tmp_path, 'w') as f:
+                if isinstance(content, str):
+                    f.write(content)
+                else:
+                    for chunk in content:
+                        f.write(chunk)
+                        f.flush()
+            os.replace(tmp_path, filepath)
             print(f"Dockerfile saved to {filepath}")
             return True
         except Exception as e:
             print(f"Error saving Dockerfile: {str(e)}")
             return False
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
     
-    def generate_and_save(self, filepath="Dockerfile"):
+    def generate_and_save(self, filepath="Dockerfile", stream=False):
         """Generate a Dockerfile for the specified language and save it to a file.
         
         Args:
-            language (str): The programming language for which to generate a Dockerfile.
             filepath (str): The filepath to save the Dockerfile to. Default is "Dockerfile".
+            stream (bool): If True, write the Dockerfile to disk while it is being generated.
             
         Returns:
             bool: True if the Dockerfile was generated and saved successfully, False otherwise.
         """
         try:
+            if stream:
+                return self.save_to_file(self.generate_stream(self.language), filepath)
             content = self.generate(self.language)
             return self.save_to_file(content, filepath)
         except Exception as e:
             print(f"Error generating and saving Dockerfile: {str(e)}")
             return False
-
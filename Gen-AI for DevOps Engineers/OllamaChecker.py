@@ -1,14 +1,31 @@
 import os
 import subprocess
 import platform
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from termcolor import colored
 
+# Seconds a successful health check is trusted before probing again
+DEFAULT_TTL = float(os.environ.get("OLLAMA_CHECK_TTL", 30))
+
 class OllamaChecker:
     """A class to check if Ollama is installed and running on the system."""
     
-    def __init__(self):
-        """Initialize the OllamaChecker instance."""
+    def __init__(self, ttl=DEFAULT_TTL, fast=True):
+        """Initialize the OllamaChecker instance.
+        
+        Args:
+            ttl (float): Seconds the result of ``check_all`` is reused by ``refresh``.
+            fast (bool): Probe without spawning subprocesses where possible (PATH lookup
+                instead of ``which`` and ``/proc`` instead of ``ps aux`` on Linux).
+        """
         self.system = platform.system()
+        self.ttl = ttl
+        self.fast = fast
+        self.last_checked = None
+        self._lock = threading.Lock()
         self.installation_status = None
         self.installation_details = None
         self.process_status = None
@@ -46,10 +63,14 @@ class OllamaChecker:
                 
             elif self.system in ["Linux", "Darwin"]:  # Linux or macOS
                 # Check if ollama is in PATH
-                result = subprocess.run(['which', 'ollama'], capture_output=True, text=True)
-                if result.returncode == 0:
+                if self.fast:
+                    found = shutil.which('ollama')
+                else:
+                    result = subprocess.run(['which', 'ollama'], capture_output=True, text=True)
+                    found = result.stdout.strip() if result.returncode == 0 else None
+                if found:
                     self.installation_status = True
-                    self.installation_details = f"Ollama appears to be installed at: {result.stdout.strip()}"
+                    self.installation_details = f"Ollama appears to be installed at: {found}"
                     return self.installation_status, self.installation_details
                 
                 # Check common installation directories
@@ -91,6 +112,12 @@ class OllamaChecker:
                 self.process_status = "ollama.exe" in result.stdout
                 self.process_details = result.stdout.strip()
                 
+            elif self.system == "Linux" and self.fast and os.path.isdir('/proc'):
+                # Read process names straight from /proc instead of forking ps
+                pid = self._find_process_in_proc('ollama')
+                self.process_status = pid is not None
+                self.process_details = f"Process found (pid {pid})" if pid is not None else "Process not found"
+                
             elif self.system in ["Linux", "Darwin"]:
                 # Using ps on Linux/macOS
                 result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
@@ -107,6 +134,22 @@ class OllamaChecker:
             
         return self.process_status, self.process_details
 
+    @staticmethod
+    def _find_process_in_proc(name, proc_root='/proc'):
+        """Return the pid of a process whose name is exactly ``name``, or None."""
+        with os.scandir(proc_root) as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(os.path.join(entry.path, 'comm')) as f:
+                        if f.read().strip() == name:
+                            return int(entry.name)
+                except OSError:
+                    # The process exited or is not readable
+                    continue
+        return None
+
     def check_service_running(self):
         """Check if Ollama service is running by attempting to connect to its API."""
         try:
@@ -133,11 +176,21 @@ class OllamaChecker:
             
         return self.service_status, self.service_details
     
-    def check_all(self):
-        """Perform all checks and return a dictionary with results."""
-        self.check_installed()
-        self.check_process_running()
-        self.check_service_running()
+    def check_all(self, parallel=True):
+        """Perform all checks and return a dictionary with results.
+        
+        Args:
+            parallel (bool): Run the installation, process and service probes concurrently.
+        """
+        probes = [self.check_installed, self.check_process_running, self.check_service_running]
+        if parallel:
+            with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+                for future in [executor.submit(probe) for probe in probes]:
+                    future.result()
+        else:
+            for probe in probes:
+                probe()
+        self.last_checked = time.monotonic()
         
         results = {
             "installation": {
@@ -157,6 +210,38 @@ class OllamaChecker:
         
         return results
     
+    def staleness(self):
+        """Return the number of seconds since the last full check, or None if never checked."""
+        if self.last_checked is None:
+            return None
+        return time.monotonic() - self.last_checked
+
+    def needs_refresh(self):
+        """Return True if the cached state is missing, failed or older than the TTL.
+        
+        Only a state in which the API was reachable is reused; any failure is probed
+        again on the next call.
+        """
+        if self.last_checked is None:
+            return True
+        if not (self.installation_status and self.service_status):
+            return True
+        return self.staleness() > self.ttl
+
+    def refresh(self, force=False):
+        """Re-run all checks only when needed and report whether Ollama can serve requests.
+        
+        Args:
+            force (bool): If True, probe again even if the cached state is still fresh.
+            
+        Returns:
+            bool: True if Ollama is installed and its API is reachable.
+        """
+        with self._lock:
+            if force or self.needs_refresh():
+                self.check_all()
+            return bool(self.installation_status and self.service_status)
+
     def is_operational(self):
         """Determine if Ollama is fully operational based on all checks."""
         if self.installation_status is None:
@@ -196,4 +281,20 @@ class OllamaChecker:
             print("OVERALL: Ollama does not appear to be installed on this system.")
 
 
-#   
\ No newline at end of file
+_shared_checker = None
+_shared_checker_lock = threading.Lock()
+
+
+def get_shared_checker(ttl=None):
+    """Return the process-wide OllamaChecker so callers share one cached health state.
+    
+    Args:
+        ttl (float): If given, update the TTL of the shared checker.
+    """
+    global _shared_checker
+    with _shared_checker_lock:
+        if _shared_checker is None:
+            _shared_checker = OllamaChecker(ttl=DEFAULT_TTL if ttl is None else ttl)
+        elif ttl is not None:
+            _shared_checker.ttl = ttl
+    return _shared_checker
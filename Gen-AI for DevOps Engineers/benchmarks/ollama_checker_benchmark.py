@@ -0,0 +1,44 @@
+"""
+Compare the subprocess-based Ollama probes with the fast, parallel probe path.
+
+Usage:
+    python benchmarks/ollama_checker_benchmark.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from OllamaChecker import OllamaChecker
+
+
+def time_probe(label, probe, iterations):
+    """Run a probe repeatedly and print the mean wall time in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        probe()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+    print(f"{label:<40} {elapsed_ms:>8.2f} ms")
+    return elapsed_ms
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    legacy = OllamaChecker(fast=False)
+    fast = OllamaChecker(fast=True)
+
+    print(f"Ollama probe benchmark ({iterations} iterations, mean per call)")
+    print("-" * 50)
+    time_probe("check_installed (which)", legacy.check_installed, iterations)
+    time_probe("check_installed (PATH scan)", fast.check_installed, iterations)
+    time_probe("check_process_running (ps aux)", legacy.check_process_running, iterations)
+    time_probe("check_process_running (/proc)", fast.check_process_running, iterations)
+    old = time_probe("check_all (subprocess, sequential)", lambda: legacy.check_all(parallel=False), iterations)
+    new = time_probe("check_all (fast, parallel)", fast.check_all, iterations)
+    print("-" * 50)
+    print(f"Speed-up: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,9 @@ from pyfiglet import figlet_format
 import sys
 
 from DockerfileGenerator import DockerfileGenerator
+from BatchGenerator import BatchDockerfileGenerator
 from utils import progress_bar,hosted_llm 
+from utils.dockerfile_cache import DockerfileCache
 
 
 SUPPORTED_LANGUAGES = [
@@ -20,27 +22,70 @@ MODEL_TYPES = ['local', 'online']
 @click.command()
 @click.option('--language', '-l',
     type=click.Choice(SUPPORTED_LANGUAGES, case_sensitive=False),
-    prompt='Select a programming language',
-    help='Programming language for your Dockerfile',
-    default='python'
+    multiple=True,
+    help='Programming language for your Dockerfile. Repeat to generate several concurrently'
+)
+@click.option('--all', 'all_languages',
+    is_flag=True,
+    default=False,
+    help='Generate a Dockerfile for every supported language'
 )
 @click.option('--output', '-o',
     default='Dockerfile',
-    help='Output file path (defaults to the current directory Dockerfile)'   
+    help='Output file path (defaults to the current directory Dockerfile). '
+         'With several languages the language is appended, e.g. Dockerfile.python'
 )
 @click.option('--model-type', '-t',
     type=click.Choice(MODEL_TYPES, case_sensitive=False),
     prompt='Choose model type',
     default='local',
     help='Select whether to use a local or online model')
-def generate_dockerfile(language, output, model_type):
+@click.option('--stream', '-s',
+    is_flag=True,
+    default=False,
+    help='Stream the Dockerfile to the terminal and output file as it is generated '
+         '(single language with the local model only)')
+@click.option('--no-cache',
+    is_flag=True,
+    default=False,
+    help='Always call the model and do not store the result in the Dockerfile cache')
+@click.option('--refresh',
+    is_flag=True,
+    default=False,
+    help='Ignore cached Dockerfiles but store the newly generated one')
+@click.option('--cache-ttl',
+    type=float,
+    default=None,
+    help='Treat cached Dockerfiles older than this many seconds as stale')
+@click.option('--concurrency', '-c',
+    type=click.IntRange(min=1),
+    default=4,
+    help='Maximum number of Dockerfiles generated at the same time with several languages')
+def generate_dockerfile(language, all_languages, output, model_type, stream, no_cache, refresh, cache_ttl, concurrency):
     """
     Generates a Dockerfile for the specified programming language using Ollama.    
     Args:
-        language (str): The programming language for which to generate the Dockerfile.    
+        language (tuple): The programming languages for which to generate the Dockerfile.    
     Returns:
         str: The generated Dockerfile content.
     """  
+    languages = list(SUPPORTED_LANGUAGES) if all_languages else list(language)
+    if not languages:
+        languages = [click.prompt('Select a programming language',
+                                  type=click.Choice(SUPPORTED_LANGUAGES, case_sensitive=False),
+                                  default='python')]
+
+    if stream and (len(languages) > 1 or model_type != 'local'):
+        print(Fore.YELLOW + "⚠️  --stream only works for a single language with the local model; "
+                            "generating without streaming.")
+        stream = False
+
+    cache = DockerfileCache(ttl=cache_ttl)
+
+    if len(languages) > 1:
+        generate_batch(languages, output, model_type, cache, no_cache, refresh, concurrency)
+        return
+    language = languages[0]
  
     print()
     print(Fore.GREEN + "All Configuration files are ok ✅:")
@@ -53,10 +98,18 @@ def generate_dockerfile(language, output, model_type):
     if model_type == 'local':
         try:
             
-            dockerfile_gen = DockerfileGenerator(language=language)
+            dockerfile_gen = DockerfileGenerator(language=language, cache=cache,
+                                                 use_cache=not no_cache, refresh=refresh)
             print(Fore.YELLOW + "Using Local model")
-            progress_bar.styled_progress_bar()
-            dockerfile_gen.generate_and_save()
+            if stream:
+                chunks = echo_stream(dockerfile_gen.generate_stream(language))
+                if dockerfile_gen.save_to_file(chunks, output):
+                    stats = dockerfile_gen.last_stream_stats
+                    print(Fore.CYAN + f"⏱️  Time to first token: {stats['time_to_first_token']:.2f}s | "
+                          f"Total time: {stats['total_time']:.2f}s")
+            else:
+                progress_bar.styled_progress_bar()
+                dockerfile_gen.generate_and_save(output)
         except ImportError:
             print(Fore.RED + "Ollama package is not installed. Please install it using 'pip install ollama'.")
             sys.exit(1)
@@ -68,7 +121,8 @@ def generate_dockerfile(language, output, model_type):
         try:
             print(Fore.YELLOW + "Using online model. Ensure you have an internet connection.")
             progress_bar.styled_progress_bar()
-            hosted_llm.generate_dockerfile(language=language, model_type='gemini-1.5-pro')
+            hosted_llm.generate_dockerfile(language=language, model_type='gemini-1.5-pro',
+                                           use_cache=not no_cache, refresh=refresh, cache=cache)
             print(Fore.GREEN + "Dockerfile generated successfully using online model!")
         except ImportError:
             print(Fore.RED + "Ollama package is not installed. Please install it using 'pip install ollama'.")
@@ -79,6 +133,61 @@ def generate_dockerfile(language, output, model_type):
     else:
         print(Fore.RED + "Invalid model type selected. Please choose 'local' or 'online'.")
         sys.exit(1)
+
+    if not no_cache:
+        print_cache_stats(cache)
+
+
+def generate_batch(languages, output, model_type, cache, no_cache, refresh, concurrency):
+    """Generate Dockerfiles for several languages concurrently and print a summary."""
+    languages = BatchDockerfileGenerator.unique_languages(languages)
+
+    print()
+    print(Fore.GREEN + "All Configuration files are ok ✅:")
+    print(f"   📝 Languages: {', '.join(language.title() for language in languages)}")
+    print(f"   🤖 Model Type: {model_type.title()}")
+    print(f"   📁 Output: {output}.<language>")
+    print(f"   🔀 Concurrency: {concurrency}")
+    print()
+
+    dockerfile_gen = DockerfileGenerator(cache=cache, use_cache=not no_cache, refresh=refresh)
+    batch = BatchDockerfileGenerator(model_type=model_type, concurrency=concurrency, generator=dockerfile_gen)
+    results = batch.run(languages, output)
+
+    failures = [result for result in results if not result["success"]]
+    print()
+    print(Fore.CYAN + "Batch Summary:")
+    print("-" * 60)
+    for result in results:
+        status = Fore.GREEN + "OK    " if result["success"] else Fore.RED + "FAILED"
+        print(f"{status}{Fore.RESET} {result['language']:<12} {result['latency']:>7.2f}s  {result['output']}")
+        if result["error"]:
+            print(Fore.RED + f"       {result['error']}")
+    print("-" * 60)
+    print(f"{len(results) - len(failures)} succeeded, {len(failures)} failed")
+
+    if not no_cache:
+        print_cache_stats(cache)
+    if failures:
+        sys.exit(1)
+
+
+def print_cache_stats(cache):
+    """Print the Dockerfile cache counters."""
+    stats = cache.stats()
+    print(Fore.CYAN + f"🗄️  Cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+          f"{stats['entries']} entries ({stats['bytes']} bytes)")
+
+
+def echo_stream(chunks):
+    """Print each streamed chunk to the terminal as it arrives and pass it on."""
+    print()
+    for chunk in chunks:
+        print(chunk, end='', flush=True)
+        yield chunk
+    print()
+
+
 def main():
     greeting()  
     try:
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+import dockerfile_generator
+from BatchGenerator import BatchDockerfileGenerator
+from DockerfileGenerator import DockerfileGenerator
+from utils.dockerfile_cache import DockerfileCache
+
+
+class StubGenerator:
+    """Stands in for DockerfileGenerator: answers from a dict, failing for languages not in it."""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.use_cache = False
+        self.refresh = False
+        self.cache = None
+        self.checks = 0
+
+    def _check_ollama(self):
+        self.checks += 1
+
+    async def agenerate(self, language, client=None, on_miss=None):
+        on_miss()
+        if language not in self.answers:
+            raise ValueError("Generated content does not appear to be a valid Dockerfile")
+        return self.answers[language]
+
+    def save_to_file(self, content, filepath):
+        with open(filepath, "w") as f:
+            f.write(content)
+        return True
+
+
+@pytest.mark.parametrize("language, suffix", [
+    ("python", "python"), ("Golang", "go"), ("c++", "cpp"), ("C#", "csharp"), ("js", "javascript"),
+])
+def test_output_path_uses_normalized_language(language, suffix):
+    assert BatchDockerfileGenerator.output_path("out/Dockerfile", language) == f"out/Dockerfile.{suffix}"
+
+
+def test_batch_saves_each_language_in_input_order(tmp_path):
+    generator = StubGenerator({"python": "FROM python:3.12\n", "go": "FROM golang:1.22\n"})
+    batch = BatchDockerfileGenerator(concurrency=2, generator=generator)
+    output = str(tmp_path / "Dockerfile")
+
+    results = batch.run(["python", "ruby", "go", "golang"], output)
+
+    assert [(result["language"], result["success"]) for result in results] == [
+        ("python", True), ("ruby", False), ("go", True)]
+    assert results[1]["error"] == "Generated content does not appear to be a valid Dockerfile"
+    assert results[2]["output"] == output + ".go"
+    assert sorted(os.listdir(tmp_path)) == ["Dockerfile.go", "Dockerfile.python"]
+    assert generator.checks == 1
+
+
+def test_fully_cached_batch_never_checks_ollama(tmp_path):
+    cache = DockerfileCache(str(tmp_path / "cache"))
+    generator = DockerfileGenerator(cache=cache)
+    for language in ("python", "go"):
+        cache.put("ollama", generator.model, language, generator.prompt_template, f"FROM {language}\n")
+
+    def ollama_down():
+        raise SystemExit(1)
+
+    generator._check_ollama = ollama_down
+    results = BatchDockerfileGenerator(generator=generator).run(["python", "go"], str(tmp_path / "Dockerfile"))
+
+    assert all(result["success"] for result in results)
+    assert (tmp_path / "Dockerfile.go").read_text() == "FROM go\n"
+
+
+def test_summary_reports_failures(tmp_path, monkeypatch, capsys):
+    generator = StubGenerator({"python": "FROM python:3.12\n"})
+    monkeypatch.setattr(dockerfile_generator, "DockerfileGenerator", lambda **kwargs: generator)
+
+    with pytest.raises(SystemExit):
+        dockerfile_generator.generate_batch(["python", "ruby"], str(tmp_path / "Dockerfile"), "local",
+                                            cache=None, no_cache=True, refresh=False, concurrency=2)
+
+    out = capsys.readouterr().out
+    assert "1 succeeded, 1 failed" in out
+    assert "Dockerfile.python" in out and "Dockerfile.ruby" in out
+    assert "Generated content does not appear to be a valid Dockerfile" in out
+
+
+def test_summary_without_failures_does_not_exit(tmp_path, monkeypatch, capsys):
+    generator = StubGenerator({"python": "FROM python:3.12\n", "java": "FROM eclipse-temurin:21\n"})
+    monkeypatch.setattr(dockerfile_generator, "DockerfileGenerator", lambda **kwargs: generator)
+
+    dockerfile_generator.generate_batch(["python", "java"], str(tmp_path / "Dockerfile"), "local",
+                                        cache=None, no_cache=True, refresh=False, concurrency=2)
+
+    assert "2 succeeded, 0 failed" in capsys.readouterr().out
@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from utils import dockerfile_cache
+from utils.dockerfile_cache import DockerfileCache
+
+TEMPLATE = "Write a Dockerfile for {language}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(dockerfile_cache.time, "time", clock)
+    return clock
+
+
+def entry_path(cache, language):
+    return cache._path(cache.make_key("ollama", "llama3", language, TEMPLATE))
+
+
+def put(cache, language, content="FROM scratch"):
+    cache.put("ollama", "llama3", language, TEMPLATE, content)
+
+
+def get(cache, language):
+    return cache.get("ollama", "llama3", language, TEMPLATE)
+
+
+def count_scans(cache):
+    scans = []
+    entries = cache._entries
+    cache._entries = lambda: scans.append(1) or entries()
+    return scans
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = DockerfileCache(str(tmp_path), ttl=60)
+    put(cache, "python")
+
+    clock.now += 60
+    assert get(cache, "python") == "FROM scratch"
+    clock.now += 1
+    assert get(cache, "python") is None
+    assert not os.path.exists(entry_path(cache, "python"))
+
+
+def test_least_recently_used_entry_is_evicted_by_mtime(tmp_path):
+    cache = DockerfileCache(str(tmp_path), max_entries=2)
+    put(cache, "python")
+    put(cache, "go")
+    os.utime(entry_path(cache, "python"), (100, 100))
+    os.utime(entry_path(cache, "go"), (200, 200))
+    # A hit makes python the most recently used entry
+    assert get(cache, "python") == "FROM scratch"
+
+    put(cache, "rust")
+
+    assert get(cache, "go") is None
+    assert get(cache, "python") == get(cache, "rust") == "FROM scratch"
+
+
+def test_entries_beyond_max_bytes_are_evicted(tmp_path):
+    cache = DockerfileCache(str(tmp_path), max_bytes=1000)
+    put(cache, "python", "x" * 600)
+    os.utime(entry_path(cache, "python"), (100, 100))
+    put(cache, "go", "y" * 600)
+
+    assert get(cache, "python") is None and get(cache, "go") == "y" * 600
+
+
+def test_hits_and_misses_are_counted(tmp_path):
+    cache = DockerfileCache(str(tmp_path))
+    assert get(cache, "python") is None
+    put(cache, "python")
+    assert get(cache, "python") == get(cache, "Python") == "FROM scratch"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"], stats["entries"]) == (2, 1, 2 / 3, 1)
+    assert stats["bytes"] == os.path.getsize(entry_path(cache, "python"))
+
+
+def test_puts_scan_the_directory_only_when_over_the_limit_or_due(tmp_path):
+    cache = DockerfileCache(str(tmp_path), max_entries=100, evict_every=10)
+    scans = count_scans(cache)
+    for index in range(20):
+        put(cache, f"lang{index}")
+    # The first put, then every 10th
+    assert len(scans) == 3
+
+    cache = DockerfileCache(str(tmp_path / "small"), max_entries=3, evict_every=1000)
+    scans = count_scans(cache)
+    for index in range(5):
+        put(cache, f"lang{index}")
+    put(cache, "lang4")
+    # The first put, then the two that went over the limit; rewriting an entry adds none
+    assert len(scans) == 3
+    assert cache.stats()["entries"] == 3
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+import DockerfileGenerator as generator_module
+from DockerfileGenerator import DockerfileGenerator
+from utils.dockerfile_cache import DockerfileCache
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    gen = DockerfileGenerator(cache=DockerfileCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(gen, "_check_ollama", lambda: None)
+    return gen
+
+
+def fake_stream(monkeypatch, pieces):
+    calls = []
+
+    def chat(model, messages, stream=False):
+        calls.append(messages)
+        return iter({"message": {"content": piece}} for piece in pieces)
+
+    monkeypatch.setattr(generator_module.ollama, "chat", chat)
+    return calls
+
+
+def test_streamed_dockerfile_is_saved_and_cached(generator, monkeypatch, tmp_path):
+    calls = fake_stream(monkeypatch, ["FR", "OM python:3.12\n", "", "CMD [\"python\"]\n"])
+    path = str(tmp_path / "Dockerfile")
+
+    assert generator.save_to_file(generator.generate_stream("python"), path)
+    with open(path) as f:
+        assert f.read() == "FROM python:3.12\nCMD [\"python\"]\n"
+    assert generator.last_stream_stats["chunks"] == 3
+
+    assert "".join(generator.generate_stream("python")) == "FROM python:3.12\nCMD [\"python\"]\n"
+    assert len(calls) == 1
+
+
+def test_invalid_stream_leaves_existing_file_untouched(generator, monkeypatch, tmp_path):
+    fake_stream(monkeypatch, ["Sorry, ", "I cannot help with that."])
+    path = tmp_path / "Dockerfile"
+    path.write_text("FROM scratch\n")
+
+    assert not generator.save_to_file(generator.generate_stream("python"), str(path))
+
+    assert path.read_text() == "FROM scratch\n"
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_invalid_stream_creates_no_file(generator, monkeypatch, tmp_path):
+    fake_stream(monkeypatch, ["not a dockerfile"])
+    path = tmp_path / "Dockerfile"
+
+    assert not generator.save_to_file(generator.generate_stream("python"), str(path))
+    assert not path.exists()
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_language_aliases_share_prompt_and_cache(generator, monkeypatch):
+    calls = fake_stream(monkeypatch, ["FROM golang:1.22\n"])
+
+    assert "".join(generator.generate_stream("Golang")) == "FROM golang:1.22\n"
+    assert "".join(generator.generate_stream("go")) == "FROM golang:1.22\n"
+
+    assert len(calls) == 1
+    assert "Dockerfile for go with" in calls[0][0]["content"]
@@ -0,0 +1,148 @@
+import pytest
+import requests
+
+import OllamaChecker as checker_module
+from OllamaChecker import OllamaChecker
+
+
+def make_proc(tmp_path, processes):
+    root = tmp_path / "proc"
+    root.mkdir()
+    (root / "self").mkdir()
+    for pid, name in processes.items():
+        (root / str(pid)).mkdir()
+        (root / str(pid) / "comm").write_text(name + "\n")
+    return str(root)
+
+
+def test_process_name_must_match_exactly(tmp_path):
+    root = make_proc(tmp_path, {1: "systemd", 40: "ollama-runner", 42: "ollama"})
+
+    assert OllamaChecker._find_process_in_proc("ollama", root) == 42
+
+
+def test_process_not_found(tmp_path):
+    root = make_proc(tmp_path, {1: "systemd", 40: "ollama-runner", 41: "my-ollama"})
+    # A pid directory without a readable comm file is skipped
+    (tmp_path / "proc" / "77").mkdir()
+
+    assert OllamaChecker._find_process_in_proc("ollama", root) is None
+
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {"version": "0.1.0"}
+
+
+def test_parallel_check_all_matches_sequential_checks(tmp_path, monkeypatch):
+    root = make_proc(tmp_path, {42: "ollama"})
+    find = OllamaChecker._find_process_in_proc
+    monkeypatch.setattr(OllamaChecker, "_find_process_in_proc", staticmethod(lambda name: find(name, root)))
+    monkeypatch.setattr(checker_module.shutil, "which", lambda name: "/usr/bin/ollama")
+    monkeypatch.setattr(requests, "get", lambda url, timeout: FakeResponse())
+
+    results = []
+    for parallel in (True, False):
+        checker = OllamaChecker()
+        checker.system = "Linux"
+        results.append(checker.check_all(parallel=parallel))
+
+    assert results[0] == results[1]
+    assert results[0]["process"] == {"status": True, "details": "Process found (pid 42)"}
+    assert results[0]["service"]["status"] is True
+    assert results[0]["overall"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def make_stub_checker(monkeypatch, ttl=30, installed=True, process=True, service=True):
+    """A checker whose probes only count calls and report the given states."""
+    clock = FakeClock()
+    monkeypatch.setattr(checker_module, "time", clock)
+    checker = OllamaChecker(ttl=ttl)
+    checker.probes = 0
+    checker.states = {"installation": installed, "process": process, "service": service}
+
+    def probe(kind):
+        def run():
+            if kind == "installation":
+                checker.probes += 1
+            setattr(checker, f"{kind}_status", checker.states[kind])
+            setattr(checker, f"{kind}_details", kind)
+            return checker.states[kind], kind
+        return run
+
+    checker.check_installed = probe("installation")
+    checker.check_process_running = probe("process")
+    checker.check_service_running = probe("service")
+    return checker, clock
+
+
+def test_staleness_follows_the_clock(monkeypatch):
+    checker, clock = make_stub_checker(monkeypatch)
+    assert checker.staleness() is None
+    assert checker.needs_refresh()
+
+    checker.check_all()
+    clock.now += 12.5
+
+    assert checker.staleness() == 12.5
+    assert not checker.needs_refresh()
+
+
+def test_refresh_reuses_a_healthy_state_until_the_ttl_expires(monkeypatch):
+    checker, clock = make_stub_checker(monkeypatch, ttl=30)
+
+    assert checker.refresh()
+    clock.now += 29
+    assert checker.refresh()
+    assert checker.probes == 1
+
+    clock.now += 2
+    assert checker.needs_refresh()
+    assert checker.refresh()
+    assert checker.probes == 2
+
+
+def test_forced_refresh_probes_again(monkeypatch):
+    checker, clock = make_stub_checker(monkeypatch)
+    checker.refresh()
+    checker.states["service"] = False
+
+    assert checker.refresh()
+    assert not checker.refresh(force=True)
+    assert checker.probes == 2
+
+
+def test_unreachable_api_is_not_ready_and_probed_again(monkeypatch):
+    checker, clock = make_stub_checker(monkeypatch, process=True, service=False)
+
+    assert not checker.refresh()
+    assert checker.needs_refresh()
+    checker.states["service"] = True
+    assert checker.refresh()
+    assert checker.probes == 2
+
+
+def test_generation_requires_a_reachable_api(monkeypatch, capsys):
+    import DockerfileGenerator as generator_module
+    from DockerfileGenerator import DockerfileGenerator
+
+    checker, clock = make_stub_checker(monkeypatch, process=True, service=False)
+    monkeypatch.setattr(generator_module, "get_shared_checker", lambda: checker)
+    generator = DockerfileGenerator(use_cache=False)
+
+    with pytest.raises(SystemExit):
+        generator._check_ollama()
+    assert "service is not running" in capsys.readouterr().out
+
+    checker.states["service"] = True
+    generator._check_ollama()
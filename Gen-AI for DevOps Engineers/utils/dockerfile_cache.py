@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "DOCKERFILE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "dockerfile_generator")
+)
+
+# Different spellings of the same language share a cache entry
+LANGUAGE_ALIASES = {
+    "golang": "go",
+    "c#": "csharp",
+    "js": "javascript",
+    "ts": "typescript",
+    "cpp": "c++",
+}
+
+
+def normalize_language(language):
+    """
+    Normalize a programming language name for use in a cache key.
+
+    Args:
+        language (str): The programming language name.
+
+    Returns:
+        str: The lower-cased language with aliases resolved (e.g. 'golang' -> 'go').
+    """
+    language = language.strip().lower()
+    return LANGUAGE_ALIASES.get(language, language)
+
+
+class DockerfileCache:
+    """A persistent, content-addressed cache of generated Dockerfiles.
+
+    Entries are keyed by (backend, model, normalized language, hash of the prompt
+    template) and stored as one JSON file per key. The file modification time is
+    used as the last access time for LRU eviction.
+
+    The number and size of the entries are tracked in memory, so a put only
+    scans the cache directory when it goes over a limit, or every
+    ``evict_every`` writes to pick up entries written by other processes.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=256, max_bytes=10 * 1024 * 1024, ttl=None,
+                 evict_every=64):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding the cache entries.
+            max_entries (int): Maximum number of entries kept before evicting the least recently used.
+            max_bytes (int): Maximum total size of the entries on disk.
+            ttl (float): Optional time-to-live in seconds. Older entries are treated as misses.
+            evict_every (int): Rescan the cache directory after this many writes even if under the limits.
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evict_every = max(1, evict_every)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # [entries, bytes] on disk as of the last scan plus our own writes; None until the first scan
+        self._usage = None
+        self._puts = 0
+
+    @staticmethod
+    def make_key(backend, model, language, prompt_template):
+        """Build the cache key for a generation request.
+
+        Args:
+            backend (str): The LLM backend (e.g. 'ollama' or 'gemini').
+            model (str): The model name.
+            language (str): The programming language.
+            prompt_template (str): The prompt template with {language} placeholder.
+
+        Returns:
+            str: A hex digest identifying the request.
+        """
+        prompt_hash = hashlib.sha256(prompt_template.encode("utf-8")).hexdigest()
+        raw = "\0".join([backend, model, normalize_language(language), prompt_hash])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, backend, model, language, prompt_template):
+        """Look up a cached Dockerfile.
+
+        Returns:
+            str: The cached Dockerfile content, or None on a miss or expired entry.
+        """
+        path = self._path(self.make_key(backend, model, language, prompt_template))
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count(hit=False)
+            return None
+
+        if self.ttl is not None and time.time() - entry.get("created_at", 0) > self.ttl:
+            self._remove(path)
+            self._count(hit=False)
+            return None
+
+        # Touch the entry so it becomes the most recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(hit=True)
+        return entry["content"]
+
+    def put(self, backend, model, language, prompt_template, content):
+        """Store a generated Dockerfile and evict old entries if the cache is over budget."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key = self.make_key(backend, model, language, prompt_template)
+        entry = {
+            "backend": backend,
+            "model": model,
+            "language": normalize_language(language),
+            "created_at": time.time(),
+            "content": content,
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = None
+        # Atomic rename so concurrent readers never see a partial entry
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+
+        with self._lock:
+            self._puts += 1
+            due = self._usage is None or self._puts % self.evict_every == 0
+            if not due:
+                if old_size is None:
+                    self._usage[0] += 1
+                self._usage[1] += size - (old_size or 0)
+                due = self._usage[0] > self.max_entries or self._usage[1] > self.max_bytes
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits its size limits."""
+        entries = self._entries()
+        total_bytes = sum(size for _, _, size in entries)
+        # Oldest access first
+        entries.sort(key=lambda entry: entry[1])
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            path, _, size = entries.pop(0)
+            self._remove(path)
+            total_bytes -= size
+        with self._lock:
+            self._usage = [len(entries), total_bytes]
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        for path, _, _ in self._entries():
+            self._remove(path)
+        with self._lock:
+            self._usage = [0, 0]
+
+    def stats(self):
+        """Return hit/miss counters and the current size of the cache."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(size for _, _, size in entries),
+        }
+
+    def _entries(self):
+        """List (path, last access time, size) for every entry on disk."""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        st = entry.stat()
+                        entries.append((entry.path, st.st_mtime, st.st_size))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    """Return the process-wide cache shared by the local and hosted generators."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DockerfileCache()
+    return _default_cache
@@ -1,23 +1,46 @@
-import google.generativeai as genai
 import os
 
 from dotenv import load_dotenv
 
+from utils import dockerfile_cache
+
 load_dotenv()
 
-def generate_dockerfile(language="python", model_type="gemini-1.5-pro"):
+PROMPT = """
+    Generate an ideal Dockerfile for {language} with best practices. Just share the dockerfile without any explanation between two lines to make copying dockerfile easy.
+    Include:
+    - Base image
+    - Installing dependencies
+    - Setting working directory
+    - Adding source code
+    - Running the application
+    """
+
+def generate_dockerfile(language="python", model_type="gemini-1.5-pro", use_cache=True, refresh=False, cache=None):
     """
     Generate a Dockerfile for the specified programming language using a hosted LLM.
 
     Args:
         language (str): The programming language for which to generate the Dockerfile.
         model_type (str): The type of model to use ('local' or 'online').
-        output (str): The output directory where the Dockerfile will be saved.
+        use_cache (bool): If False, never read from or write to the cache.
+        refresh (bool): If True, ignore cached entries but store the newly generated Dockerfile.
+        cache (DockerfileCache): The cache to use. Defaults to the shared on-disk cache.
 
     Returns:
         str: The generated Dockerfile content.
     """
+    if cache is None:
+        cache = dockerfile_cache.get_default_cache()
+
+    if use_cache and not refresh:
+        cached = cache.get("gemini", model_type, language, PROMPT)
+        if cached is not None:
+            return cached
     
+    # Only the online backend needs the Google SDK, so it is imported on first use
+    import google.generativeai as genai
+
     # Set up the Google Generative AI API key
    
     
@@ -25,14 +48,11 @@ def generate_dockerfile(language="python", model_type="gemini-1.5-pro"):
     genai.configure(api_key=os.getenv("API_KEY"))
     model = genai.GenerativeModel(model_name=model_type)
 
-    PROMPT = """
-    Generate an ideal Dockerfile for {language} with best practices. Just share the dockerfile without any explanation between two lines to make copying dockerfile easy.
-    Include:
-    - Base image
-    - Installing dependencies
-    - Setting working directory
-    - Adding source code
-    - Running the application
-    """
-    response = model.generate_content(PROMPT.format(language=language))
+    # Prompt with the same normalized name the cache is keyed on, so aliases get the same Dockerfile
+    response = model.generate_content(PROMPT.format(language=dockerfile_cache.normalize_language(language)))
+    if use_cache:
+        try:
+            cache.put("gemini", model_type, language, PROMPT, response.text)
+        except OSError as e:
+            print(f"Warning: could not write Dockerfile cache: {str(e)}")
     return response.text
\ No newline at end of file